@@ -2,11 +2,15 @@ import dearpygui.dearpygui as dpg
 
 SOCKETIO_SERVER = "http://127.0.0.1:5000"
 STATUS_QUEUE_SIZE = 50
-MONITOR_QUEUE_SIZE = 100
+MONITOR_SCRATCH_MIN_BYTES = 64 * 1024   # reuse a float32 conversion buffer above this size
 MAX_PLOT_HISTORY = 200
 DEFAULT_PLOT_WIDTH = 780
 DEFAULT_PLOT_HEIGHT = 400
-MAX_QUEUE_ITEMS_PER_FRAME = 5
+MAX_IMAGE_PIXELS = DEFAULT_PLOT_WIDTH * DEFAULT_PLOT_HEIGHT   # larger images are strided down
+INFO_RANGE_MAX_SAMPLES = 1_000_000   # larger arrays: monitor "Range" from a strided subsample
+INFO_RANGE_SUBSAMPLE = 65_536        # ... of roughly this many elements
+PANEL_REFRESH_DELAY_FRAMES = 3   # click → property-panel refresh debounce (~50 ms)
+MAX_CACHED_PANELS = 32   # node property forms kept alive (hidden) in the panel
 
 # Note: FONT_SIZE, LAYOUT_HORIZONTAL_SPACING and LAYOUT_VERTICAL_SPACING have
 # been moved to render_scale.py so they can be varied at runtime via the
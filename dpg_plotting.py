@@ -4,7 +4,124 @@ import dearpygui.dearpygui as dpg
 import time
 from matplotlib import cm
 import traceback
-from constants import MAX_PLOT_HISTORY, DEFAULT_PLOT_WIDTH, DEFAULT_PLOT_HEIGHT
+from types import MappingProxyType
+from constants import (
+    MAX_PLOT_HISTORY, DEFAULT_PLOT_WIDTH, DEFAULT_PLOT_HEIGHT, INFO_RANGE_MAX_SAMPLES,
+    INFO_RANGE_SUBSAMPLE, MAX_IMAGE_PIXELS,
+)
+
+
+_LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def _to_2d_preview(data_3d: np.ndarray) -> np.ndarray:
+    """Collapse an (H, W, C) array to (H, W) for display.
+
+    One channel is returned as a view; RGB(A) uses a single luminance-weighted
+    matmul instead of a mean over a sliced temporary.
+    """
+    channels = data_3d.shape[2]
+    if channels == 1:
+        return data_3d[:, :, 0]
+    if channels >= 3:
+        return data_3d[:, :, :3] @ _LUMA_WEIGHTS
+    return np.mean(data_3d, axis=2)
+
+
+def _display_stride(h: int, w: int) -> int:
+    """Smallest integer stride that brings an h x w image under MAX_IMAGE_PIXELS."""
+    if h * w <= MAX_IMAGE_PIXELS:
+        return 1
+    return int((h * w / MAX_IMAGE_PIXELS) ** 0.5) + 1
+
+
+def decode_float32(data_value, dtype=None) -> np.ndarray:
+    """Convert a Socket.IO ``data`` value (bytes, list or number) to float32.
+
+    * ``bytes`` / ``bytearray`` / ``memoryview`` — raw little-endian samples of
+      *dtype* (default ``float32``), wrapped with ``np.frombuffer`` without
+      per-element Python work (zero-copy for float32).
+    * flat list of numbers — ``np.fromiter`` with a known count (one
+      preallocation, no intermediate object array).
+    * nested list — ``np.array`` as before.
+    """
+    if isinstance(data_value, (bytes, bytearray, memoryview)):
+        arr = np.frombuffer(data_value, dtype=np.dtype(dtype or np.float32).newbyteorder("<"))
+        return arr.astype(np.float32, copy=False)
+    if isinstance(data_value, list):
+        if data_value and not isinstance(data_value[0], (list, tuple)):
+            return np.fromiter(data_value, dtype=np.float32, count=len(data_value))
+        return np.array(data_value, dtype=np.float32)
+    return np.array([float(data_value)], dtype=np.float32)
+
+
+EMPTY_DATA_INFO = "Type:    —\nShape:   —\nRange:   —\nUpdated: never"
+
+# Monitor status -> (status-line text, colour), shared by the in-process and
+# subprocess monitor windows and formatted once at import
+_STATUS_DEFAULT_COLOR = (200, 200, 200)
+STATUS_DISPLAY = MappingProxyType({
+    status: (f"Status:  {label}", color)
+    for status, label, color in (
+        ("connected",    "+ Connected",     (0, 255, 0)),
+        ("subscribed",   "> Subscribed",    (100, 255, 100)),
+        ("receiving",    "<> Receiving",    (0, 200, 255)),
+        ("disconnected", "- Disconnected",  (255, 80, 80)),
+        ("error",        "! Error",         (255, 80, 80)),
+        ("retrying",     "~ Retrying …",    (255, 180, 0)),
+    )
+})
+
+
+def status_display(status: str) -> tuple:
+    """Return ``(text, colour)`` for the status line of a monitor in *status*."""
+    display = STATUS_DISPLAY.get(status)
+    if display is None:
+        display = (f"Status:  {status.capitalize()}", _STATUS_DEFAULT_COLOR)
+    return display
+
+
+def format_data_info(arr, update_count: int, value_range: tuple | None = None) -> str:
+    """Build the monitor info block (type, shape, range, last update).
+
+    *value_range* is an already computed exact ``(min, max)`` of *arr*
+    (see ``DPGPlotter.known_range``); when given, no reduction is run.
+    Otherwise arrays larger than ``INFO_RANGE_MAX_SAMPLES`` get their range
+    from a strided subsample of about ``INFO_RANGE_SUBSAMPLE`` elements (shown
+    with a leading ``~``); the label only needs 4 significant digits, and the
+    two reductions then touch ~64k elements instead of the whole frame.
+    """
+    if isinstance(arr, np.ndarray):
+        dtype_str = f"ndarray ({arr.dtype})"
+    else:
+        dtype_str = type(arr).__name__
+    shape_str = str(arr.shape) if hasattr(arr, "shape") else "scalar"
+
+    if value_range is not None:
+        range_str = f"[{value_range[0]:.4g}, {value_range[1]:.4g}]"
+    elif (
+        isinstance(arr, np.ndarray)
+        and arr.size > 0
+        and np.issubdtype(arr.dtype, np.number)
+    ):
+        approx = ""
+        sample = arr
+        if arr.size > INFO_RANGE_MAX_SAMPLES:
+            sample = arr.reshape(-1)[:: arr.size // INFO_RANGE_SUBSAMPLE]
+            approx = "~"
+        range_str = f"{approx}[{sample.min():.4g}, {sample.max():.4g}]"
+    elif isinstance(arr, float):
+        range_str = f"[{arr:.4g}, {arr:.4g}]"
+    else:
+        range_str = "N/A"
+
+    ts = time.strftime("%H:%M:%S")
+    return (
+        f"Type:    {dtype_str}\n"
+        f"Shape:   {shape_str}\n"
+        f"Range:   {range_str}\n"
+        f"Updated: {ts}  (#{update_count})"
+    )
 
 
 class InteractiveImageViewer:
@@ -58,6 +175,8 @@ class InteractiveImageViewer:
         self.img_width  = 0
         self.img_height = 0
         self.current_data = None
+        self.data_range: tuple | None = None   # (min, max) of current_data
+        self._norm_scratch: np.ndarray | None = None   # reused [0, 1] buffer
 
         # Legacy compat attributes — values kept for info display only;
         # actual zoom/pan is handled by the DPG plot widget.
@@ -181,7 +300,13 @@ class InteractiveImageViewer:
             dmin = float(data_2d.min())
             dmax = float(data_2d.max())
             if dmax > dmin:
-                normalized = (data_2d - dmin) / (dmax - dmin)
+                # Normalize in place into a buffer kept across frames of the
+                # same shape instead of allocating two temporaries per frame
+                normalized = self._norm_scratch
+                if normalized is None or normalized.shape != data_2d.shape:
+                    normalized = self._norm_scratch = np.empty(data_2d.shape, dtype=np.float32)
+                np.subtract(data_2d, dmin, out=normalized, casting="unsafe")
+                normalized *= 1.0 / (dmax - dmin)
             else:
                 normalized = np.zeros_like(data_2d, dtype=np.float32)
 
@@ -213,6 +338,7 @@ class InteractiveImageViewer:
                 dpg.set_value(self.texture_tag, pixel_data)
 
             self.current_data = data_2d
+            self.data_range   = (dmin, dmax)
             self._update_info_text(dmin, dmax)
             return True
 
@@ -362,7 +488,8 @@ class DPGPlotter:
         v_len = len(vector)
         # Initialize or update the 2D history buffer
         if self.vector_history_buffer is None or self.vector_history_buffer.shape[1] != v_len:
-            self.vector_history_buffer = vector.reshape(1, -1)
+            # Copy: *vector* may be a monitor's reusable conversion buffer
+            self.vector_history_buffer = vector.reshape(1, -1).copy()
         else:
             self.vector_history_buffer = np.vstack([self.vector_history_buffer, vector])
             if len(self.vector_history_buffer) > self.max_history:
@@ -469,10 +596,7 @@ class DPGPlotter:
         try:
             if data_2d.ndim != 2:
                 if data_2d.ndim == 3:
-                    if data_2d.shape[2] == 1:
-                        data_2d = data_2d[:, :, 0]
-                    else:
-                        data_2d = np.mean(data_2d[:, :, :3], axis=2)
+                    data_2d = _to_2d_preview(data_2d)
                 else:
                     print(f"[DPGPlotter] Cannot convert shape {data_2d.shape} to 2D")
                     return False
@@ -538,11 +662,21 @@ class DPGPlotter:
           * Native scroll-wheel zoom and drag-to-pan (no custom event handling needed)
           * equal_aspects=True for pixel-accurate aspect-ratio preservation
           * fit_axis_data() for an unlocked initial view (zoom/pan work immediately)
+
+        Images above ``MAX_IMAGE_PIXELS`` (the default plot area) are strided
+        down first: the plot cannot show more pixels than that, and the
+        colormap + texture upload cost scales with the pixel count.
         """
         try:
             if data_2d is None:
                 return False
 
+            s = _display_stride(*data_2d.shape[:2])
+            if s > 1:
+                # A strided view is enough: normalization copies it into
+                # the viewer's contiguous scratch buffer
+                data_2d = data_2d[::s, ::s]
+
             if self.current_mode != 'image':
                 self._clear_previous()
                 self._cleanup_image_resources()
@@ -568,6 +702,21 @@ class DPGPlotter:
             traceback.print_exc()
             return False
 
+    def known_range(self, arr) -> tuple | None:
+        """Return the exact ``(min, max)`` of *arr* if the last plot computed it.
+
+        The image viewer reduces every frame it normalizes; when *arr* is
+        that frame (same shape, not strided or channel-reduced), the info
+        label can reuse the result instead of scanning the array again.
+        """
+        if (
+            self.current_mode == 'image'
+            and self.image_viewer is not None
+            and getattr(arr, "shape", None) == self.current_shape
+        ):
+            return self.image_viewer.data_range
+        return None
+
     def update_existing_plot(self, data_array):
         """Update existing plot without recreating everything."""
         try:
@@ -582,10 +731,10 @@ class DPGPlotter:
             elif data_array.ndim == 2:
                 return self.plot_2d_image_clean(data_array)
             elif data_array.ndim == 3:
-                if data_array.shape[2] == 1:
-                    data_2d = data_array[:, :, 0]
-                else:
-                    data_2d = np.mean(data_array[:, :, :3], axis=2)
+                # Stride before reducing channels so the luminance pass only
+                # touches the pixels that will actually be displayed
+                s = _display_stride(*data_array.shape[:2])
+                data_2d = _to_2d_preview(data_array[::s, ::s])
                 return self.plot_2d_image_clean(data_2d)
             else:
                 print(f"[DPGPlotter.update_existing_plot] Unsupported shape: {data_array.shape}")
@@ -1,5 +1,7 @@
 import dearpygui.dearpygui as dpg
-from collections import deque
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+import numpy as np
 import render_scale
 
 
@@ -99,14 +101,79 @@ def create_proc_node_theme():
     )
 
 
+# (color, thickness) → shared link theme; themes are built once and reused
+_LINK_THEME_CACHE: dict[tuple, int] = {}
+
+# (link_id, theme) pairs deferred while inside bulk_link_theming(); None otherwise
+_pending_link_themes: list | None = None
+
+
+def get_link_theme(color, thickness: float = 1.0) -> int:
+    """Return the shared link theme for *color*/*thickness*, creating it on first use."""
+    key = (tuple(color), float(thickness))
+    link_theme = _LINK_THEME_CACHE.get(key)
+    if link_theme is None or not dpg.does_item_exist(link_theme):
+        with dpg.theme() as link_theme:
+            with dpg.theme_component(dpg.mvNodeLink):
+                dpg.add_theme_color(dpg.mvNodeCol_Link, color, category=dpg.mvThemeCat_Nodes)
+                dpg.add_theme_style(dpg.mvNodeStyleVar_LinkThickness, thickness,
+                                    category=dpg.mvThemeCat_Nodes)
+        _LINK_THEME_CACHE[key] = link_theme
+    return link_theme
+
+
 def apply_link_style(link_id: int, color: list, thickness: float = 1.0) -> None:
     """Apply a colour/thickness theme to a node link."""
-    with dpg.theme() as link_theme:
-        with dpg.theme_component(dpg.mvNodeLink):
-            dpg.add_theme_color(dpg.mvNodeCol_Link, color, category=dpg.mvThemeCat_Nodes)
-            dpg.add_theme_style(dpg.mvNodeStyleVar_LinkThickness, thickness,
-                                category=dpg.mvThemeCat_Nodes)
-    dpg.bind_item_theme(link_id, link_theme)
+    link_theme = get_link_theme(color, thickness)
+    if _pending_link_themes is not None:
+        _pending_link_themes.append((link_id, link_theme))
+    else:
+        dpg.bind_item_theme(link_id, link_theme)
+
+
+@contextmanager
+def bulk_link_theming():
+    """Defer every apply_link_style() bind inside the block and issue them in one batch.
+
+    Used when wiring up a whole scene (file load / import) so theme binding
+    happens in a single pass after all links exist.  Nested use is a no-op.
+    """
+    global _pending_link_themes
+    if _pending_link_themes is not None:
+        yield
+        return
+
+    _pending_link_themes = []
+    try:
+        yield
+    finally:
+        pending, _pending_link_themes = _pending_link_themes, None
+        for link_id, link_theme in pending:
+            if dpg.does_item_exist(link_id):
+                dpg.bind_item_theme(link_id, link_theme)
+
+
+# frame number -> {callback: None} still to run on that frame.  DPG keeps a
+# single set_frame_callback() per frame number, so every deferred callback
+# goes through schedule_frame_callback() and shares one DPG registration.
+_frame_callbacks: dict[int, dict] = {}
+
+
+def _run_frame_callbacks(sender, app_data, user_data):
+    for callback in _frame_callbacks.pop(user_data, ()):
+        callback()
+
+
+def schedule_frame_callback(frame: int, callback) -> None:
+    """Run *callback()* on DPG frame *frame*, alongside anything else due then.
+
+    Scheduling the same callable twice for one frame runs it once.
+    """
+    pending = _frame_callbacks.get(frame)
+    if pending is None:
+        pending = _frame_callbacks[frame] = {}
+        dpg.set_frame_callback(frame, _run_frame_callbacks, user_data=frame)
+    pending[callback] = None
 
 
 def set_zebra_theme():
@@ -131,59 +198,36 @@ def auto_layout_nodes(graph, uuid_to_dpg, debug=False):
     nodes = list(graph.nodes.keys())
 
     # --- Build clean connection list (skip feedback / reference edges) ---
-    clean_connections = []
-    for conn in graph.connections:
-        src, src_attr, dst, dst_attr = conn
-
-        if dst_attr.endswith("_ref") or dst_attr == "layer_list" or "params" in dst_attr.lower():
-            if debug:
-                print(f"[AUTO_LAYOUT] Skipping reference: {src}.{src_attr} -> {dst}.{dst_attr}")
-            continue
-
-        conn_props = graph.connection_properties.get(conn, {})
-        if conn_props.get('delay', 0) == -1:
-            if debug:
-                print(f"[AUTO_LAYOUT] Skipping feedback: {src}.{src_attr} -> {dst}.{dst_attr}")
-            continue
-
-        if ":-" in str(src_attr):
-            if debug:
-                print(f"[AUTO_LAYOUT] Skipping feedback pattern: {src}.{src_attr} -> {dst}.{dst_attr}")
-            continue
-
-        clean_connections.append((src, dst))
+    clean_connections = graph.layout_edges()
 
     if debug:
         print(f"[AUTO_LAYOUT] Using {len(clean_connections)} connections for layout")
 
     # --- Topological sort → assign depth levels ---
-    adj       = {n: [] for n in nodes}
-    in_degree = {n: 0  for n in nodes}
+    # Single pass over the edges builds the adjacency and in-degree maps,
+    # then a Kahn BFS assigns each node its longest-path depth in O(N + E).
+    children_of = defaultdict(list)
+    in_degree   = Counter()
 
     for src, dst in clean_connections:
-        if src in adj and dst in adj:
-            adj[src].append(dst)
+        if src in graph.nodes and dst in graph.nodes:
+            children_of[src].append(dst)
             in_degree[dst] += 1
 
-    queue = deque([n for n in nodes if in_degree[n] == 0])
+    queue = deque(n for n in nodes if in_degree[n] == 0)
     if not queue and nodes:
         queue.append(nodes[0])
 
-    levels = {}
-    level  = 0
+    levels = {n: 0 for n in queue}
     while queue:
-        next_queue = deque()
-        for _ in range(len(queue)):
-            node = queue.popleft()
-            # Only set level if not already set (first-visit wins → shallowest level)
-            if node not in levels:
-                levels[node] = level
-            for neighbor in adj[node]:
-                in_degree[neighbor] -= 1
-                if in_degree[neighbor] == 0:
-                    next_queue.append(neighbor)
-        queue  = next_queue
-        level += 1
+        node       = queue.popleft()
+        next_level = levels[node] + 1
+        for child in children_of[node]:
+            if next_level > levels.get(child, -1):
+                levels[child] = next_level
+            in_degree[child] -= 1
+            if in_degree[child] == 0:
+                queue.append(child)
 
     for node in nodes:
         if node not in levels:
@@ -201,9 +245,12 @@ def auto_layout_nodes(graph, uuid_to_dpg, debug=False):
     fallback_w = render_scale.layout_horizontal_spacing()
     fallback_h = render_scale.layout_vertical_spacing()
 
+    # One registry snapshot instead of a does_item_exist() probe per node
+    all_items = frozenset(dpg.get_all_items())
+
     for node_id in nodes:
         dpg_id = uuid_to_dpg.get(node_id)
-        if dpg_id and dpg.does_item_exist(dpg_id):
+        if dpg_id in all_items:
             try:
                 w, h = dpg.get_item_rect_size(dpg_id)
                 # Guard against zero sizes (node not yet rendered)
@@ -223,37 +270,33 @@ def auto_layout_nodes(graph, uuid_to_dpg, debug=False):
     # --- Compute column x-positions based on the widest node per column ---
     sorted_levels = sorted(level_groups.keys())
 
-    col_x: dict[int, float] = {}   # level → left-edge x
-    cursor_x = base_x
-    for lvl in sorted_levels:
-        col_x[lvl] = cursor_x
-        max_w = max(node_sizes[n][0] for n in level_groups[lvl])
-        cursor_x += max_w + pad_x
+    col_w = np.array([max(node_sizes[n][0] for n in level_groups[lvl]) for lvl in sorted_levels])
+    col_x = base_x + np.concatenate(([0.0], np.cumsum(col_w + pad_x)[:-1]))   # left edges
 
     # --- Position each node, stacking vertically with actual heights ---
     positioned = 0
-    for lvl in sorted_levels:
-        nodes_in_level = level_groups[lvl]
-        x        = col_x[lvl]
-        cursor_y = base_y
-
-        for node_id in nodes_in_level:
+    for lvl, x in zip(sorted_levels, col_x.tolist(), strict=True):
+        placeable = []
+        for node_id in level_groups[lvl]:
             dpg_id = uuid_to_dpg.get(node_id)
-            if not dpg_id or not dpg.does_item_exist(dpg_id):
-                if debug:
-                    print(f"[AUTO_LAYOUT] Skipping {node_id}: no valid DPG ID")
-                continue
+            if dpg_id in all_items:
+                placeable.append((node_id, dpg_id))
+            elif debug:
+                print(f"[AUTO_LAYOUT] Skipping {node_id}: no valid DPG ID")
+        if not placeable:
+            continue
 
-            w, h = node_sizes[node_id]
-            node_name = graph.nodes[node_id].get('name', node_id[:4])
+        # Top edge of each node = base_y + running sum of the heights above it
+        heights = np.array([node_sizes[n][1] for n, _ in placeable])
+        ys = base_y + np.concatenate(([0.0], np.cumsum(heights + pad_y)[:-1]))
 
+        for (node_id, dpg_id), y in zip(placeable, ys.tolist(), strict=True):
             if debug:
-                print(f"[AUTO_LAYOUT] [{lvl}] {node_name} → ({x:.0f}, {cursor_y:.0f})  size=({w:.0f}x{h:.0f})")
-
-            dpg.set_item_pos(dpg_id, [x, cursor_y])
-            cursor_y += h + pad_y
-            positioned += 1
+                w, h = node_sizes[node_id]
+                node_name = graph.nodes[node_id].get('name', node_id[:4])
+                print(f"[AUTO_LAYOUT] [{lvl}] {node_name} → ({x:.0f}, {y:.0f})  size=({w:.0f}x{h:.0f})")
+            dpg.set_item_pos(dpg_id, [x, y])
+        positioned += len(placeable)
 
     if debug:
         print(f"[AUTO_LAYOUT] Done. Positioned {positioned}/{len(nodes)} nodes across {len(sorted_levels)} columns")
-
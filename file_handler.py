@@ -1,7 +1,8 @@
 import yaml
 import os
 import dearpygui.dearpygui as dpg
-from dpg_utils import auto_layout_nodes
+from dpg_utils import auto_layout_nodes, bulk_link_theming, schedule_frame_callback
+from graph_manager import filename_key
 import uuid
 import traceback
 from collections import OrderedDict
@@ -75,11 +76,18 @@ class FileHandler:
         for node_uuid in self.nm.graph.nodes:
             self.nm._refresh_node_theme(node_uuid)
 
+    def _post_load_refresh(self):
+        """Single frame callback for the post-load theme and panel refresh."""
+        self.refresh_all_themes()
+        self.update_ui_values()
+
     def update_ui_values(self):
-        for u_id, node_data in self.nm.graph.nodes.items():
-            if u_id in self.nm.uuid_to_dpg and 'values' in node_data:
-                if self.nm._last_selected_uuid == u_id:
-                    self.nm.update_property_panel(u_id, "property_panel")
+        u_id = self.nm._last_selected_uuid
+        node_data = self.nm.graph.nodes.get(u_id)
+        if node_data and u_id in self.nm.uuid_to_dpg and 'values' in node_data:
+            # Loaded values are not part of the form signature
+            self.nm.property_panel.mark_dirty(u_id)
+            self.nm.update_property_panel(u_id, "property_panel")
 
     # ── YAML loading helpers ──────────────────────────────────────────────────
 
@@ -123,7 +131,7 @@ class FileHandler:
             self.nm.graph.add_node(u, node_type)
             node_data = self.nm.graph.nodes[u]
             node_data['name'] = node_name
-            node_data['outputs_extra'] = []
+            node_data['outputs_extra'] = {}
             node_data['suffixes'] = set()
             node_data['values'] = {}
 
@@ -225,6 +233,10 @@ class FileHandler:
                 if not (key.endswith("_ref") or key == "layer_list"):
                     continue
                 refs = val if isinstance(val, list) else [val]
+                dst_values = self.nm.graph.nodes[dst_u].setdefault('values', {})
+                is_list_ref = key in ('source_dict_ref', 'layer_list')
+                # dict as an insertion-ordered set: O(1) duplicate checks
+                listed = dict.fromkeys(dst_values.get(key, ())) if is_list_ref else None
                 for r_name in refs:
                     if not isinstance(r_name, str):
                         continue
@@ -233,28 +245,25 @@ class FileHandler:
                             name_to_uuid[r_name], "ref",
                             dst_u, key, 0, None
                         ))
-                        dst_node_data = self.nm.graph.nodes[dst_u]
-                        dst_node_data.setdefault('values', {})
-                        if key in ('source_dict_ref', 'layer_list'):
-                            dst_node_data['values'].setdefault(key, [])
-                            if r_name not in dst_node_data['values'][key]:
-                                dst_node_data['values'][key].append(r_name)
+                        if is_list_ref:
+                            listed[r_name] = None
                         else:
-                            dst_node_data['values'][key] = r_name
+                            dst_values[key] = r_name
+                if listed:
+                    dst_values[key] = list(listed)
 
-        for src_u, src_a, dst_u, dst_a, delay, filename in connections_to_create:
-            self.nm.manual_link(src_u, src_a, dst_u, dst_a, delay=delay)
-            if filename and dst_a == "input_list":
-                self.nm.graph.nodes[dst_u].setdefault('filename_map', {})
-                conn_key = f"{src_u}.{src_a}"
-                self.nm.graph.nodes[dst_u]['filename_map'][conn_key] = filename
+        with bulk_link_theming():
+            for src_u, src_a, dst_u, dst_a, delay, filename in connections_to_create:
+                self.nm.manual_link(src_u, src_a, dst_u, dst_a, delay=delay)
+                if filename and dst_a == "input_list":
+                    conn_key = filename_key(src_u, src_a)
+                    self.nm.graph.nodes[dst_u].setdefault('filename_map', {})[conn_key] = filename
 
     # ── Finalize ──────────────────────────────────────────────────────────────
 
     def _finalize_load(self, perform_auto_layout=True, operation_name="LOAD"):
-        current_frame = dpg.get_frame_count()
-        dpg.set_frame_callback(current_frame + 3, self.refresh_all_themes)
-        dpg.set_frame_callback(current_frame + 3, self.update_ui_values)
+        # Both refreshes share one tick
+        schedule_frame_callback(dpg.get_frame_count() + 3, self._post_load_refresh)
 
         def verify_nodes(attempt=1, max_attempts=5):
             missing = [nid for nid in self.nm.graph.nodes
@@ -262,7 +271,7 @@ class FileHandler:
             if missing and attempt < max_attempts:
                 print(f"[{operation_name}] Attempt {attempt}: "
                       f"{len(missing)} nodes missing DPG IDs, retrying…")
-                dpg.set_frame_callback(
+                schedule_frame_callback(
                     dpg.get_frame_count() + 5,
                     lambda: verify_nodes(attempt + 1, max_attempts))
                 return
@@ -280,8 +289,8 @@ class FileHandler:
                 print(f"[{operation_name}] {len(self.nm.graph.nodes)} nodes "
                       f"loaded with saved positions")
 
-        dpg.set_frame_callback(dpg.get_frame_count() + 10,
-                               lambda: verify_nodes(1, 5))
+        schedule_frame_callback(dpg.get_frame_count() + 10,
+                                lambda: verify_nodes(1, 5))
 
     # ── Internal load from dict ───────────────────────────────────────────────
 
@@ -293,9 +302,7 @@ class FileHandler:
         Used by both load_simulation() and load_from_yaml_dict().
         """
         self.nm.clear_all()
-        self.nm.graph.nodes.clear()
-        self.nm.graph.connections.clear()
-        self.nm.graph.connection_properties.clear()
+        self.nm.graph.clear()
 
         name_to_uuid = self._populate_graph_from_yaml(yaml_data)
         self._create_ui_nodes(yaml_data, name_to_uuid)
@@ -372,28 +379,25 @@ class FileHandler:
             if 'gui_pos' in node_data:
                 node_dict['gui_pos'] = node_data['gui_pos']
 
-            # Outputs
-            all_outputs = []
+            # Outputs (dict used as an insertion-ordered set)
+            all_outputs = {}
             for out in template.get('outputs', []):
                 if isinstance(out, str):
                     if "name" in out and "+" in out and "'" in out:
                         continue
                     if ":" in out:
                         continue
-                    if out not in all_outputs:
-                        all_outputs.append(out)
+                    all_outputs[out] = None
             for out in node_data.get('outputs_extra', []):
-                if isinstance(out, str) and out not in all_outputs:
-                    all_outputs.append(out)
+                if isinstance(out, str):
+                    all_outputs[out] = None
             if node_type == "AtmoPropagation":
-                for (src_u, src_at, dst_u, dst_at) in self.nm.graph.connections:
-                    if dst_u == u_id and dst_at == "source_dict_ref":
+                for (src_u, src_at, _, dst_at) in self.nm.graph.connections_to(u_id):
+                    if dst_at == "source_dict_ref":
                         src_name = self.nm.graph.nodes[src_u].get('name', "unknown")
-                        out_name = f"out_{src_name}_ef"
-                        if out_name not in all_outputs:
-                            all_outputs.append(out_name)
+                        all_outputs[f"out_{src_name}_ef"] = None
             if all_outputs:
-                node_dict['outputs'] = all_outputs
+                node_dict['outputs'] = list(all_outputs)
 
             # Parameters
             current_values = node_data.get('values', {})
@@ -452,9 +456,7 @@ class FileHandler:
             input_connections = {}
             ref_connections = {}
 
-            for (src_u, src_at, dst_u, dst_at) in self.nm.graph.connections:
-                if dst_u != u_id:
-                    continue
+            for (src_u, src_at, dst_u, dst_at) in self.nm.graph.connections_to(u_id):
                 connection_str = self.nm.get_connection_for_yaml(
                     src_u, src_at, dst_u, dst_at)
 
@@ -468,20 +470,17 @@ class FileHandler:
                     is_ref = True
 
                 if is_ref:
-                    ref_connections.setdefault(dst_at, [])
-                    if connection_str not in ref_connections[dst_at]:
-                        ref_connections[dst_at].append(connection_str)
+                    ref_connections.setdefault(dst_at, {})[connection_str] = None
                 else:
                     if dst_at == "input_list":
-                        filename = "data"
-                        if 'filename_map' in node_data:
-                            conn_key = f"{src_u}.{src_at}"
-                            filename = node_data['filename_map'].get(
-                                conn_key, "data")
+                        filename = node_data.get('filename_map', {}).get(
+                            filename_key(src_u, src_at), "data")
                         connection_str = f"{filename}-{connection_str}"
-                    input_connections.setdefault(dst_at, [])
-                    if connection_str not in input_connections[dst_at]:
-                        input_connections[dst_at].append(connection_str)
+                    input_connections.setdefault(dst_at, {})[connection_str] = None
+
+            # Per-destination source sets -> ordered lists for YAML
+            input_connections = {k: list(v) for k, v in input_connections.items()}
+            ref_connections = {k: list(v) for k, v in ref_connections.items()}
 
             if input_connections:
                 node_dict['inputs'] = OrderedDict()
@@ -1,9 +1,63 @@
+import re
+import sys
+from collections import defaultdict
+from types import MappingProxyType
+
+# Destination attributes that never constrain the layout: *_ref inputs,
+# layer_list and anything params-like (only "params" is case-insensitive).
+_LAYOUT_SKIP_DST = re.compile(r"_ref\Z|^layer_list\Z|(?i:params)")
+
+# Shared read-only stand-in for a template without inputs/parameters.
+_EMPTY = MappingProxyType({})
+
+
+def filename_key(src_uuid, src_attr):
+    """Key of the source output *src_attr* of *src_uuid* in a node's filename_map."""
+    return f"{src_uuid}.{src_attr}"
+
+
 class GraphManager:
     def __init__(self, templates):
         self.templates = templates
         self.nodes = {}  # {node_id: node_data}
-        self.connections = []  # List of tuples (output_node, output_attr, input_node, input_attr)
+        # Connections are tuples (output_node, output_attr, input_node, input_attr).
+        # _conns keeps insertion order (dict used as an ordered set); _out/_in
+        # index the same tuples by endpoint so per-node work is O(degree).
+        self._conns = {}
+        self._out = defaultdict(dict)  # {output_node: {conn: None}}
+        self._in = defaultdict(dict)   # {input_node: {conn: None}}
         self.connection_properties = {}  # NEW: Store properties for connections
+        self._by_type = defaultdict(dict)  # {node_type: {node_id: None}} column index
+
+    @property
+    def connections(self):
+        """Read-only, insertion-ordered view of all connection tuples."""
+        return self._conns.keys()
+
+    def nodes_of_type(self, node_type):
+        """Ids of all nodes of *node_type*, in creation order, without scanning the graph."""
+        return self._by_type.get(node_type, {}).keys()
+
+    def connections_from(self, node_id):
+        """Connections whose output side is *node_id*."""
+        return self._out.get(node_id, {}).keys()
+
+    def connections_to(self, node_id):
+        """Connections whose input side is *node_id*."""
+        return self._in.get(node_id, {}).keys()
+
+    def clear_connections(self):
+        """Remove every connection and its properties."""
+        self._conns.clear()
+        self._out.clear()
+        self._in.clear()
+        self.connection_properties.clear()
+
+    def clear(self):
+        """Remove all nodes and connections."""
+        self.nodes.clear()
+        self._by_type.clear()
+        self.clear_connections()
     
     def add_node(self, node_uuid, node_type):
         # --- ROBUSTNESS FIX ---
@@ -11,48 +65,57 @@ class GraphManager:
             print(f"Warning: Unknown node type '{node_type}'. Using generic fallback.")
             # Create a dummy template so the editor doesn't crash
             self.templates[node_type] = {
-                "inputs": {},      # No inputs known yet
-                "outputs": [],     # No outputs known yet
-                "parameters": {},  # No parameters known yet
-                "name": node_type  # Default name
+                "inputs": _EMPTY,      # No inputs known yet
+                "outputs": (),         # No outputs known yet
+                "parameters": _EMPTY,  # No parameters known yet
+                "name": node_type      # Default name
             }
         # ----------------------
 
         template = self.templates[node_type]
-        
-        # Deep copy the template structure for the new instance
+
+        # Template inputs/outputs/parameters are frozen at load (MappingProxyType
+        # / tuple), so the node shares them instead of copying; only "values"
+        # is per-instance.
+        # Optional per-node maps (filename_map, outputs_extra, suffixes) are
+        # created on first write by their owners rather than preallocated.
+        defaults = template.get("_defaults")
+        if defaults is None:
+            defaults = {
+                p: m["default"]
+                for p, m in template.get("parameters", {}).items()
+                if "default" in m
+            }
         self.nodes[node_uuid] = {
             "type": node_type,
             "name": template.get("name", node_type),
-            "inputs": template.get("inputs", {}).copy(),
-            "outputs": list(template.get("outputs", [])),
-            "parameters": template.get("parameters", {}).copy(),
-            "values": {},  # Stores the actual user-set values
-            "filename_map": {}  # Store filenames for DataStore connections
-        }        
-
-        # Initialize default values
-        for param, meta in self.nodes[node_uuid]["parameters"].items():
-            if "default" in meta:
-                self.nodes[node_uuid]["values"][param] = meta["default"]
+            "inputs": template.get("inputs", _EMPTY),
+            "outputs": template.get("outputs", ()),
+            "parameters": template.get("parameters", _EMPTY),
+            "values": dict(defaults),  # Stores the actual user-set values
+        }
+        self._by_type[node_type][node_uuid] = None
 
     def remove_node(self, node_id):
         """Delete a node and its connections."""
-        if node_id in self.nodes:
-            del self.nodes[node_id]
+        node = self.nodes.pop(node_id, None)
+        if node is not None:
+            self._by_type[node["type"]].pop(node_id, None)
         # Also remove any connection properties for connections involving this node
-        connections_to_remove = []
-        for conn in self.connections:
-            if conn[0] == node_id or conn[2] == node_id:
-                connections_to_remove.append(conn)
-        
+        connections_to_remove = list(self.connections_from(node_id)) + list(self.connections_to(node_id))
         for conn in connections_to_remove:
             self.remove_connection(*conn)
+        self._out.pop(node_id, None)
+        self._in.pop(node_id, None)
 
     def add_connection(self, output_node, output_attr, input_node, input_attr, properties=None):
         """Create a connection between an output and an input."""
-        conn = (output_node, output_attr, input_node, input_attr)
-        self.connections.append(conn)
+        # Attribute names repeat across many nodes; interning them shares one
+        # string object per name and makes tuple comparisons pointer checks.
+        conn = (output_node, sys.intern(output_attr), input_node, sys.intern(input_attr))
+        self._conns[conn] = None
+        self._out[output_node][conn] = None
+        self._in[input_node][conn] = None
         
         # Initialize properties if provided
         if properties is not None:
@@ -65,20 +128,19 @@ class GraphManager:
     def remove_connection(self, output_node, output_attr, input_node, input_attr):
         """Remove a connection."""
         conn = (output_node, output_attr, input_node, input_attr)
-        if conn in self.connections:
-            self.connections.remove(conn)
+        if conn in self._conns:
+            del self._conns[conn]
+            self._out[output_node].pop(conn, None)
+            self._in[input_node].pop(conn, None)
         # Also remove any properties
-        if conn in self.connection_properties:
-            del self.connection_properties[conn]
+        self.connection_properties.pop(conn, None)
 
     
     def update_connection_properties(self, output_node, output_attr, input_node, input_attr, properties):
         """Update properties for a specific connection."""
         conn = (output_node, output_attr, input_node, input_attr)
-        if conn in self.connections:
-            if conn not in self.connection_properties:
-                self.connection_properties[conn] = {}
-            self.connection_properties[conn].update(properties)
+        if conn in self._conns:
+            self.connection_properties.setdefault(conn, {}).update(properties)
             return True
         return False
 
@@ -86,4 +148,22 @@ class GraphManager:
         """Get properties for a specific connection."""
         conn = (output_node, output_attr, input_node, input_attr)
         return self.connection_properties.get(conn, {"delay": 0})
-    
\ No newline at end of file
+    
+
+    def layout_edges(self):
+        """Return the (src, dst) node pairs that constrain the left-to-right layout.
+
+        Reference links, ``layer_list``/params links and feedback links (delay -1
+        or a ``:-`` output suffix) are skipped so they cannot create cycles.
+        """
+        skip_dst = _LAYOUT_SKIP_DST.search
+        props = self.connection_properties
+        edges = []
+        for conn in self.connections:
+            src, src_attr, dst, dst_attr = conn
+            if skip_dst(dst_attr) or ":-" in str(src_attr):
+                continue
+            if props.get(conn, {}).get('delay', 0) == -1:
+                continue
+            edges.append((src, dst))
+        return edges
@@ -16,15 +16,16 @@ Data flow (probe-based in-process mode)
 2. ``MonitorProbeObj.trigger()`` extracts a CPU float32 numpy array and
    calls ``MonitorBus.push(topic, payload)``.
 3. ``MonitorBus`` calls ``InProcessMonitor._on_data(payload)`` on the
-   simulation thread; ``_on_data`` enqueues the payload in a thread-safe
-   ``Queue``.
+   simulation thread; ``_on_data`` overwrites the monitor's lock-free
+   ``Mailbox`` slot with the payload.
 4. ``MonitorManager`` calls ``render_frame()`` on every DPG frame (main
-   thread) via a recurring frame-callback.  ``render_frame()`` drains the
-   queue and updates the ``DPGPlotter``.
+   thread) via a recurring frame-callback.  ``render_frame()`` takes the
+   newest mailbox payload (older ones were overwritten) and updates the
+   ``DPGPlotter``.
 
 Thread safety
 -------------
-Only ``_on_data`` (enqueue) is called from the simulation thread.
+Only ``_on_data`` (mailbox push) is called from the simulation thread.
 All DPG operations happen exclusively in ``render_frame()`` (main thread).
 """
 
@@ -32,14 +33,20 @@ from __future__ import annotations
 
 import time
 import traceback
-from queue import Empty, Queue
 from typing import TYPE_CHECKING
 
 import dearpygui.dearpygui as dpg
 import numpy as np
 
-from constants import MAX_QUEUE_ITEMS_PER_FRAME, MONITOR_QUEUE_SIZE
-from dpg_plotting import DPGPlotter
+from constants import MONITOR_SCRATCH_MIN_BYTES
+from dpg_plotting import (
+    EMPTY_DATA_INFO,
+    DPGPlotter,
+    decode_float32,
+    format_data_info,
+    status_display,
+)
+from monitor_mailbox import Mailbox
 
 if TYPE_CHECKING:
     from simulation_backend import MonitorProbeObj
@@ -74,7 +81,10 @@ class InProcessMonitor:
         self.server_output_name  = server_output_name
 
         self._bus = monitor_bus
-        self._data_queue: Queue = Queue(maxsize=MONITOR_QUEUE_SIZE)
+        self._mailbox: Mailbox = Mailbox()
+        # Reused float32 target for casting large non-float32 probe arrays,
+        # so a steady stream of same-shape frames does not allocate per frame
+        self._scratch: np.ndarray | None = None
 
         # Reference to the MonitorProbeObj that feeds this monitor.
         # Set by MonitorManager after probe injection; may be None if the
@@ -87,10 +97,9 @@ class InProcessMonitor:
         self._plot_grp_tag = f"ipm_plot_{monitor_id}"
         self._pholder_tag  = f"ipm_ph_{monitor_id}"
         self._output_tag   = f"ipm_output_{monitor_id}"
-        self._type_tag     = f"ipm_type_{monitor_id}"
-        self._shp_tag      = f"ipm_shp_{monitor_id}"
-        self._rng_tag      = f"ipm_rng_{monitor_id}"
-        self._time_tag     = f"ipm_time_{monitor_id}"
+        self._info_tag     = f"ipm_info_{monitor_id}"
+        self._status_tag   = f"ipm_status_{monitor_id}"
+        self._shown_status: str | None = None   # last status written to the label
 
         self._plotter: DPGPlotter | None = None
         self.is_open        = False
@@ -108,13 +117,8 @@ class InProcessMonitor:
     # ------------------------------------------------------------------
 
     def _on_data(self, raw_data) -> None:
-        """Enqueue *raw_data* from the producer thread."""
-        if self._data_queue.full():
-            try:
-                self._data_queue.get_nowait()   # drop oldest
-            except Empty:
-                pass
-        self._data_queue.put(raw_data)
+        """Hand *raw_data* to the main thread, replacing any unplotted frame."""
+        self._mailbox.push(raw_data)
 
     # ------------------------------------------------------------------
     # DPG window lifecycle (main thread only)
@@ -148,7 +152,7 @@ class InProcessMonitor:
             dpg.add_text(
                 "Status:  Waiting for data …",
                 color=[255, 200, 0],
-                tag=f"ipm_status_{self.monitor_id}",
+                tag=self._status_tag,
             )
             dpg.add_separator()
             dpg.add_text(
@@ -158,11 +162,9 @@ class InProcessMonitor:
             )
             dpg.add_group(tag=self._plot_grp_tag)
             dpg.add_separator()
-            dpg.add_text("Type:    —", color=[200, 200, 200], tag=self._type_tag)
-            dpg.add_text("Shape:   —", color=[200, 200, 200], tag=self._shp_tag)
-            dpg.add_text("Range:   —", color=[200, 200, 200], tag=self._rng_tag)
-            dpg.add_text("Updated: never", color=[200, 200, 200], tag=self._time_tag)
+            dpg.add_text(EMPTY_DATA_INFO, color=[200, 200, 200], tag=self._info_tag)
 
+        self._shown_status = None
         self.is_open = True
 
     def _on_dpg_close(self) -> None:
@@ -193,6 +195,8 @@ class InProcessMonitor:
         except Exception as exc:
             print(f"[IPMonitor] unsubscribe failed for '{old}': {exc}")
         self.server_output_name = new_server_output_name
+        # A pending frame belongs to the old output; drop it
+        self._mailbox.clear()
         # Clear the probe reference — caller must attach a new probe
         self._probe = None
         try:
@@ -210,7 +214,7 @@ class InProcessMonitor:
     # ------------------------------------------------------------------
 
     def render_frame(self) -> bool:
-        """Drain the queue and update the plot.
+        """Plot the newest mailbox payload, if the update interval has elapsed.
 
         Returns
         -------
@@ -218,29 +222,27 @@ class InProcessMonitor:
             ``True`` if the window is still open and should continue to be
             ticked, ``False`` if the window has been closed.
         """
-        # print(f"[RENDER-DBG] render_frame called, is_open={self.is_open}, win_exists={dpg.does_item_exist(self._win_tag)}, qsize={self._data_queue.qsize()}")  # TEMP
-        if not self.is_open or not dpg.does_item_exist(self._win_tag):
+        if not self.is_open:
             return False
-
         now = time.time()
-        for _ in range(MAX_QUEUE_ITEMS_PER_FRAME):
-            try:
-                raw_data = self._data_queue.get_nowait()
-            except Empty:
-                break
-
-            if now - self.last_update < self.min_update_interval:
-                continue
-
-            arr = self._raw_to_numpy(raw_data)
-            if arr is None:
-                continue
-
-            if self._plot(arr):
-                self._update_info_labels(arr)
-                self.last_update   = now
-                self.update_count += 1
-                self._set_status("receiving")
+        if now - self.last_update < self.min_update_interval:
+            return True     # newest data stays in the mailbox for a later frame
+        # No does_item_exist() probe here: the window is only deleted by
+        # close(), and a user close goes through _on_dpg_close, so is_open
+        # already tracks its liveness without an FFI call per frame.
+
+        # Lock-free take: most frames have nothing new and return here
+        # without a DPG round-trip.
+        raw_data = self._mailbox.pop_latest()
+        if raw_data is None:
+            return True
+
+        arr = self._raw_to_numpy(raw_data)
+        if arr is not None and self._plot(arr):
+            self._update_info_labels(arr)
+            self.last_update   = now
+            self.update_count += 1
+            self._set_status("receiving")
 
         return True
 
@@ -248,9 +250,21 @@ class InProcessMonitor:
     # Data conversion
     # ------------------------------------------------------------------
 
-    def _raw_to_numpy(self, inner_payload: dict) -> np.ndarray | None:
+    def _as_float32(self, data: np.ndarray) -> np.ndarray:
+        """Cast *data* to float32, reusing ``_scratch`` for large frames."""
+        if data.dtype == np.float32 or data.size * 4 < MONITOR_SCRATCH_MIN_BYTES:
+            return data.astype(np.float32, copy=False)
+        scratch = self._scratch
+        if scratch is None or scratch.shape != data.shape:
+            scratch = self._scratch = np.empty(data.shape, dtype=np.float32)
+        np.copyto(scratch, data, casting="unsafe")
+        return scratch
+
+    def _raw_to_numpy(self, inner_payload: dict) -> np.ndarray | float | None:
         """Convert the inner payload dict to a float32 numpy array.
 
+        Plain scalar payloads are returned as a Python ``float``.
+
         In probe-based mode the ``data`` field is already a CPU numpy array,
         so conversion is a cheap astype call.  In legacy (socket.io) mode
         ``data`` may be a list, which is handled identically to before.
@@ -264,13 +278,19 @@ class InProcessMonitor:
 
         try:
             if data_type in ("1d_array", "2d_array", "scalar", "nd_array") or data_type is None:
+                # Scalar fast path: plotted via plot_history(float), so skip
+                # building a one-element ndarray for every telemetry sample
+                if isinstance(data_value, (int, float)) and not isinstance(data_value, bool):
+                    return float(data_value)
+                if isinstance(data_value, list) and len(data_value) == 1 and not shape:
+                    if isinstance(data_value[0], (int, float)):
+                        return float(data_value[0])
+
                 if isinstance(data_value, np.ndarray):
                     # Probe-based path — already a CPU array, cheap cast
-                    arr = data_value.astype(np.float32, copy=False)
-                elif isinstance(data_value, list):
-                    arr = np.array(data_value, dtype=np.float32)
+                    arr = self._as_float32(data_value)
                 else:
-                    arr = np.array([float(data_value)], dtype=np.float32)
+                    arr = decode_float32(data_value, inner_payload.get("dtype"))
 
                 if shape is not None and data_type != "scalar":
                     try:
@@ -314,6 +334,8 @@ class InProcessMonitor:
             )
 
         p    = self._plotter
+        if isinstance(arr, float):
+            return p.plot_history(arr)
         ndim = arr.ndim
         size = arr.size
 
@@ -354,39 +376,19 @@ class InProcessMonitor:
     # Status / info helpers
     # ------------------------------------------------------------------
 
-    _STATUS_COLORS = {
-        "receiving":  [0, 200, 255],
-        "subscribed": [100, 255, 100],
-        "error":      [255, 80, 80],
-    }
-
     def _set_status(self, status: str) -> None:
-        tag = f"ipm_status_{self.monitor_id}"
-        if dpg.does_item_exist(tag):
-            color = self._STATUS_COLORS.get(status, [200, 200, 200])
-            dpg.set_value(tag, f"Status:  {status.capitalize()}")
-            dpg.configure_item(tag, color=color)
+        # Called for every plotted frame; only touch DPG when the status changes
+        if status == self._shown_status:
+            return
+        if dpg.does_item_exist(self._status_tag):
+            text, color = status_display(status)
+            dpg.set_value(self._status_tag, text)
+            dpg.configure_item(self._status_tag, color=color)
+            self._shown_status = status
 
     def _update_info_labels(self, arr: np.ndarray) -> None:
-        dtype_str = (
-            f"ndarray ({arr.dtype})"
-            if isinstance(arr, np.ndarray)
-            else type(arr).__name__
-        )
-        shape_str = str(arr.shape) if hasattr(arr, "shape") else "scalar"
-        range_str = (
-            f"[{arr.min():.4g}, {arr.max():.4g}]"
-            if isinstance(arr, np.ndarray)
-            and arr.size > 0
-            and np.issubdtype(arr.dtype, np.number)
-            else "N/A"
-        )
-        ts = time.strftime("%H:%M:%S")
-        for tag, text in (
-            (self._type_tag, f"Type:    {dtype_str}"),
-            (self._shp_tag,  f"Shape:   {shape_str}"),
-            (self._rng_tag,  f"Range:   {range_str}"),
-            (self._time_tag, f"Updated: {ts}  (#{self.update_count})"),
-        ):
-            if dpg.does_item_exist(tag):
-                dpg.set_value(tag, text)
\ No newline at end of file
+        # Single text widget; only reached while is_open, i.e. the window exists
+        dpg.set_value(
+            self._info_tag,
+            format_data_info(arr, self.update_count, self._plotter.known_range(arr)),
+        )
\ No newline at end of file
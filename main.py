@@ -3,7 +3,8 @@ import json
 import os
 import pathlib
 import yaml
-from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 
 import render_scale
 from constants import DEFAULT_AUTO_SIMUL_PARAMS, DEFAULT_RENDER_SIZE
@@ -24,16 +25,11 @@ _SETTINGS_PATH = pathlib.Path.home() / ".specula_studio_settings.json"
 
 # ── YAML helpers ──────────────────────────────────────────────────────────
 
-def ordered_load(stream, Loader=yaml.SafeLoader, object_pairs_hook=OrderedDict):
-    class OrderedLoader(Loader):
-        pass
-    def construct_mapping(loader, node):
-        loader.flatten_mapping(node)
-        return object_pairs_hook(loader.construct_pairs(node))
-    OrderedLoader.add_constructor(
-        yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
-        construct_mapping)
-    return yaml.load(stream, OrderedLoader)
+# libyaml-backed loader when PyYAML was built with it, pure-Python otherwise
+try:
+    _SafeLoader = yaml.CSafeLoader
+except AttributeError:
+    _SafeLoader = yaml.SafeLoader
 
 
 # ── Main editor class ────────────────────────────────────────────────────────
@@ -217,15 +213,37 @@ class SpeculaEditor:
 
     # ── Template loading ──────────────────────────────────────────────────────
 
+    @staticmethod
+    def _load_template_file(path):
+        with open(path, 'r') as f:
+            return yaml.load(f, Loader=_SafeLoader)
+
     def load_templates(self, folder):
-        templates = OrderedDict()
+        templates = {}
         if os.path.exists(folder):
-            for file in os.listdir(folder):
-                if file.endswith(".yml"):
-                    with open(os.path.join(folder, file), 'r') as f:
-                        data = ordered_load(f)
-                        if data:
-                            templates.update(data)
+            paths = [os.path.join(folder, file)
+                     for file in os.listdir(folder) if file.endswith(".yml")]
+            # Files are read/parsed on a small thread pool; map() keeps the
+            # listdir order so later files still override earlier ones.
+            with ThreadPoolExecutor(max_workers=min(8, len(paths) or 1)) as pool:
+                for data in pool.map(self._load_template_file, paths):
+                    if data:
+                        templates.update(data)
+        # Pre-build each template's default values once, so GraphManager.add_node
+        # can seed a new node with a single dict copy. The inputs/outputs/
+        # parameters containers are frozen here because every node of the
+        # type shares them (see GraphManager.add_node).
+        for template in templates.values():
+            if isinstance(template, dict):
+                params = template.get("parameters") or {}
+                template["_defaults"] = {
+                    p: m["default"]
+                    for p, m in params.items()
+                    if isinstance(m, dict) and "default" in m
+                }
+                template["parameters"] = MappingProxyType(dict(params))
+                template["inputs"] = MappingProxyType(dict(template.get("inputs") or {}))
+                template["outputs"] = tuple(template.get("outputs") or ())
         return templates
 
     # ── Input handlers ───────────────────────────────────────────────────────
@@ -234,7 +252,6 @@ class SpeculaEditor:
         """Register handlers without the automatic Delete key handler."""
         with dpg.handler_registry():
             dpg.add_mouse_click_handler(callback=self.nm.on_click_editor)
-            dpg.add_key_press_handler(key=dpg.mvKey_D, callback=self.nm.delete_selected_link)
             dpg.add_mouse_double_click_handler(callback=self.nm._on_canvas_double_click)
             dpg.add_mouse_move_handler(callback=self.nm._on_mouse_move)
     
@@ -343,8 +360,7 @@ class SpeculaEditor:
     def _on_delete_confirm(self):
         dpg.hide_item("delete_confirmation_dialog")
         if self.pending_deletion_type == "nodes":
-            for node_uuid in self.pending_deletion_items:
-                self.nm.delete_node(node_uuid)
+            self.nm.delete_nodes(self.pending_deletion_items)
         elif self.pending_deletion_type == "link":
             for link_id in self.pending_deletion_items:
                 self.nm.delink_callback(None, link_id)
@@ -511,10 +527,7 @@ class SpeculaEditor:
                 simul_params_uuid = uuid
                 break
         if not simul_params_uuid:
-            for uuid, node_data in self.nm.graph.nodes.items():
-                if node_data.get("type") == "SimulParams":
-                    simul_params_uuid = uuid
-                    break
+            simul_params_uuid = next(iter(self.nm.graph.nodes_of_type("SimulParams")), None)
         if not simul_params_uuid:
             print("[AUTOSIMULPARAMS] No SimulParams node found, skipping auto-connection")
             return
@@ -544,9 +557,27 @@ class SpeculaEditor:
         self._multi_add_queue.clear()
         dpg.hide_item("add_multiple_dialog")
 
+    # Editor shortcuts: key → method name on SpeculaEditor
+    _KEY_DISPATCH = {
+        dpg.mvKey_Delete: "_on_delete_requested",
+        dpg.mvKey_D:      "_on_delete_link_shortcut",
+    }
+
     def _on_key_press(self, sender, app_data):
-        if app_data == dpg.mvKey_Delete:
-            self._on_delete_requested()
+        action = self._KEY_DISPATCH.get(app_data)
+        if action is None or self._text_entry_focused():
+            return
+        getattr(self, action)()
+
+    def _text_entry_focused(self) -> bool:
+        """True while the user is typing into a property-panel input widget."""
+        try:
+            return self.nm.property_panel.text_entry_active()
+        except SystemError:
+            return False
+
+    def _on_delete_link_shortcut(self):
+        self.nm.delete_selected_link(None, None)
 
     # ── Preferences Dialog ────────────────────────────────────────────────────
 
@@ -969,9 +1000,7 @@ class SpeculaEditor:
             print("Please enter a simulation name before creating a new simulation.")
             return
         self.nm.clear_all()
-        self.nm.graph.nodes.clear()
-        self.nm.graph.connections.clear()
-        self.nm.graph.connection_properties.clear()
+        self.nm.graph.clear()
         self.current_simulation_name = name
         self.current_simulation_path = None
         print(f"[SIMULATION] Created new simulation: {name}")
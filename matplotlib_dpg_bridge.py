@@ -38,7 +38,8 @@ from __future__ import annotations
 
 import threading
 import time
-import queue
+import traceback
+from collections import deque
 from typing import Dict
 
 import numpy as np
@@ -70,8 +71,9 @@ class MatplotlibDPGBridge:
     # CPython dict writes are GIL-atomic — no explicit lock needed.
     _pending: Dict[int, tuple] = {}
 
-    # Control commands (close_all only)
-    _ctrl_queue: queue.Queue = queue.Queue()
+    # Control commands (close_all only).  deque.append / popleft are atomic
+    # under the GIL, so tick() can poll it every frame without taking a lock.
+    _ctrl_queue: deque = deque()
 
     # DPG window/texture bookkeeping: fig_num → dict
     _figure_windows: Dict[int, dict] = {}
@@ -211,7 +213,7 @@ class MatplotlibDPGBridge:
         # carry the new generation and will NOT be discarded.
         cls._close_generation += 1
         cls._pending.clear()
-        cls._ctrl_queue.put("close_all")
+        cls._ctrl_queue.append("close_all")
         try:
             import matplotlib.pyplot as plt
             plt.close('all')
@@ -232,11 +234,8 @@ class MatplotlibDPGBridge:
            than _close_generation (i.e. captured before the last close_all).
         """
         # ── 1. Process control commands ───────────────────────────────────────
-        while True:
-            try:
-                cmd = cls._ctrl_queue.get_nowait()
-            except queue.Empty:
-                break
+        while cls._ctrl_queue:
+            cmd = cls._ctrl_queue.popleft()
             if cmd == "close_all":
                 cls._dpg_destroy_all()
 
@@ -252,7 +251,6 @@ class MatplotlibDPGBridge:
                 try:
                     cls._dpg_show_figure(fig_num, title, w, h, flat)
                 except Exception as exc:
-                    import traceback
                     print(f"[MPL-DPG] tick error (fig {fig_num}): {exc}")
                     traceback.print_exc()
 
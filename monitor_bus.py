@@ -25,11 +25,15 @@ class MonitorBus:
     Subscribers register a callable keyed on the fully-qualified server output
     name (e.g. ``"my_wfs.out_slopes"``).  Publishers call ``push()`` to
     deliver a raw-data payload to all registered subscribers.
+
+    The subscriber map is copy-on-write: (un)subscribing builds a new dict of
+    tuples under ``_lock`` and rebinds it in one store, so ``push()`` — called
+    for every frame — reads a consistent snapshot without locking or copying.
     """
 
     def __init__(self) -> None:
-        # output_name -> list[callable]
-        self._subscribers: dict[str, list] = {}
+        # output_name -> tuple[callable, ...]; never mutated in place
+        self._subscribers: dict[str, tuple] = {}
         self._lock = threading.Lock()
 
     # ------------------------------------------------------------------
@@ -45,22 +49,28 @@ class MonitorBus:
         callback    : callable(raw_data) – called on the publisher thread.
         """
         with self._lock:
-            self._subscribers.setdefault(output_name, []).append(callback)
+            subs = self._subscribers
+            self._subscribers = {**subs, output_name: (*subs.get(output_name, ()), callback)}
 
     def unsubscribe(self, output_name: str, callback) -> None:
         """Remove *callback* from subscribers for *output_name* (no-op if absent)."""
         with self._lock:
-            subs = self._subscribers.get(output_name)
-            if subs:
-                try:
-                    subs.remove(callback)
-                except ValueError:
-                    pass
+            subs = self._subscribers.get(output_name, ())
+            if callback not in subs:
+                return
+            i = subs.index(callback)
+            remaining = subs[:i] + subs[i + 1:]
+            new = dict(self._subscribers)
+            if remaining:
+                new[output_name] = remaining
+            else:
+                del new[output_name]
+            self._subscribers = new
 
     def clear(self) -> None:
         """Remove all subscriptions (called on simulation stop)."""
         with self._lock:
-            self._subscribers.clear()
+            self._subscribers = {}
 
     # ------------------------------------------------------------------
     # Data delivery
@@ -72,9 +82,7 @@ class MonitorBus:
         Called from the Socket.IO background thread; callbacks must be
         thread-safe (queue a payload, never touch DPG directly).
         """
-        with self._lock:
-            callbacks = list(self._subscribers.get(output_name, []))
-        for cb in callbacks:
+        for cb in self._subscribers.get(output_name, ()):
             try:
                 cb(data)
             except Exception as exc:
@@ -86,10 +94,8 @@ class MonitorBus:
 
     def subscriber_count(self, output_name: str) -> int:
         """Return the number of subscribers for *output_name*."""
-        with self._lock:
-            return len(self._subscribers.get(output_name, []))
+        return len(self._subscribers.get(output_name, ()))
 
     def all_subscribed_outputs(self) -> list[str]:
         """Return a list of output names that have at least one subscriber."""
-        with self._lock:
-            return [k for k, v in self._subscribers.items() if v]
+        return list(self._subscribers)
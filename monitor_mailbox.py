@@ -0,0 +1,51 @@
+"""
+monitor_mailbox.py
+==================
+Lock-free single-producer / single-consumer hand-off used to pass monitor
+payloads from a background thread (simulation or Socket.IO) to the DPG main
+thread.
+
+Monitors only ever display the most recent frame, so instead of a FIFO each
+monitor owns a one-slot *mailbox*: the producer overwrites the slot, the
+consumer takes whatever is newest.  Memory is one payload per monitor no
+matter how far the GUI falls behind, and stale frames are dropped by the
+producer rather than drained by the consumer.
+
+Under the GIL a single attribute store is atomic.  The slot holds a
+``(sequence, item)`` tuple written in one store by the producer; the consumer
+only writes ``_taken`` (the last sequence it consumed), so no lock is needed
+for exactly one producer and one consumer.
+"""
+
+from __future__ import annotations
+
+
+class Mailbox:
+    """Latest-value slot: ``push`` overwrites, ``pop_latest`` takes the newest."""
+
+    __slots__ = ("_slot", "_taken")
+
+    def __init__(self) -> None:
+        self._slot: tuple = (0, None)   # (sequence, item) — producer-owned
+        self._taken: int = 0            # last sequence consumed — consumer-owned
+
+    def push(self, item) -> bool:
+        """Store *item* (producer thread).
+
+        Returns ``False`` if an unconsumed item was overwritten.
+        """
+        seq = self._slot[0]
+        self._slot = (seq + 1, item)
+        return seq == self._taken
+
+    def pop_latest(self, default=None):
+        """Return the newest unconsumed item, or *default* (consumer thread)."""
+        seq, item = self._slot
+        if seq == self._taken:
+            return default
+        self._taken = seq
+        return item
+
+    def clear(self) -> None:
+        """Discard the pending item, if any (consumer thread)."""
+        self._taken = self._slot[0]
@@ -13,8 +13,8 @@ In-process monitors (new)
     called, ``open_monitor()`` creates an ``InProcessMonitor`` (a DPG window
     inside the main editor viewport) that receives data via the bus instead of
     a dedicated Socket.IO connection.
-    In-process monitors are updated on the DPG main thread through a recurring
-    frame callback set up by ``start_periodic_tasks()``.
+    In-process monitors are updated on the DPG main thread: the editor's
+    render loop calls ``_inprocess_tick_direct()`` once per frame.
 
     In direct probe mode (InProcessBackend with monitor_bus), MonitorManager
     also manages MonitorProbeObj lifecycle:
@@ -40,8 +40,6 @@ import threading
 import time
 import traceback
 
-import dearpygui.dearpygui as dpg
-
 from inprocess_monitor import InProcessMonitor
 
 # Prefix used by SocketIOClient.get_server_output_name() fallback paths
@@ -93,8 +91,16 @@ class MonitorManager:
         self.active_monitors: dict = {}
         self._lock = threading.Lock()
 
+        # node_uuid -> {monitor_id: output_name} for both monitor kinds, so
+        # per-node/output queries look only at that node's few monitors.
+        # Mutated under self._lock (the reaper thread prunes subprocess ones).
+        self._monitors_by_node: dict[str, dict[str, str]] = {}
+
         # in-process monitors: monitor_id -> InProcessMonitor
         self._inprocess_monitors: dict[str, InProcessMonitor] = {}
+        # server_output_name -> {monitor_id: None}, kept in step with
+        # _inprocess_monitors so "who watches this output" is one lookup
+        self._inprocess_by_output: dict[str, dict] = {}
 
         # Monitors requested before the display-server URL was known
         self._pending_monitors: list = []   # list of (sender, app_data, user_data)
@@ -193,42 +199,67 @@ class MonitorManager:
     def is_monitor_open(self, node_uuid: str, output_name: str) -> bool:
         """Return True if any monitor (subprocess or in-process) is open for
         the given node/output combination."""
-        with self._lock:
-            for info in self.active_monitors.values():
-                if (
-                    info.get("node_uuid") == node_uuid
-                    and info.get("output_name") == output_name
-                    and info["process"].poll() is None
-                ):
-                    return True
-        for monitor in self._inprocess_monitors.values():
-            if (
-                monitor.node_uuid == node_uuid
-                and monitor.output_name == output_name
-                and monitor.is_open
-            ):
-                return True
-        return False
+        return self.find_monitor_id(node_uuid, output_name) is not None
+
+    def open_outputs_for(self, node_uuid: str) -> frozenset:
+        """Return the output names of *node_uuid* that currently have an open monitor."""
+        return frozenset(self.open_monitors_for(node_uuid))
+
+    def open_monitors_for(self, node_uuid: str) -> dict:
+        """Return ``{output_name: monitor_id}`` of the open monitors of *node_uuid*.
+
+        One snapshot and one liveness check per monitor, for callers that
+        need the state of every output of a node (e.g. the property panel).
+        """
+        found: dict = {}
+        for mid, output in self._node_monitors(node_uuid):
+            if output not in found and self._monitor_alive(mid):
+                found[output] = mid
+        return found
 
     def find_monitor_id(self, node_uuid: str, output_name: str) -> str | None:
         """Return the monitor_id of the first open monitor for node/output, or None."""
-        with self._lock:
-            for mid, info in self.active_monitors.items():
-                if (
-                    info.get("node_uuid") == node_uuid
-                    and info.get("output_name") == output_name
-                    and info["process"].poll() is None
-                ):
-                    return mid
-        for mid, monitor in self._inprocess_monitors.items():
-            if (
-                monitor.node_uuid == node_uuid
-                and monitor.output_name == output_name
-                and monitor.is_open
-            ):
+        for mid, output in self._node_monitors(node_uuid):
+            if output == output_name and self._monitor_alive(mid):
                 return mid
         return None
 
+    def _node_monitors(self, node_uuid: str) -> list:
+        """Snapshot of ``(monitor_id, output_name)`` pairs registered for *node_uuid*."""
+        with self._lock:
+            return list(self._monitors_by_node.get(node_uuid, {}).items())
+
+    def _monitor_alive(self, monitor_id: str) -> bool:
+        info = self.active_monitors.get(monitor_id)
+        if info is not None:
+            return info["process"].poll() is None
+        monitor = self._inprocess_monitors.get(monitor_id)
+        return monitor is not None and monitor.is_open
+
+    def _index_node_monitor(self, monitor_id: str, node_uuid: str, output_name: str) -> None:
+        with self._lock:
+            self._monitors_by_node.setdefault(node_uuid, {})[monitor_id] = output_name
+
+    def _unindex_node_monitor(self, monitor_id: str, node_uuid: str) -> None:
+        with self._lock:
+            self._unindex_node_monitor_locked(monitor_id, node_uuid)
+
+    def _unindex_node_monitor_locked(self, monitor_id: str, node_uuid: str) -> None:
+        # Caller holds self._lock
+        monitors = self._monitors_by_node.get(node_uuid)
+        if monitors is not None:
+            monitors.pop(monitor_id, None)
+            if not monitors:
+                del self._monitors_by_node[node_uuid]
+
+    def _pop_subprocess_monitor(self, monitor_id: str) -> dict | None:
+        """Remove a subprocess monitor's entry and index; return its info dict."""
+        with self._lock:
+            info = self.active_monitors.pop(monitor_id, None)
+            if info is not None:
+                self._unindex_node_monitor_locked(monitor_id, info["node_uuid"])
+        return info
+
     # =========================================================================
     # Display-server URL notification
     # =========================================================================
@@ -263,8 +294,7 @@ class MonitorManager:
                     None, None,
                     (info["node_uuid"], info["output_name"]),
                 )
-                with self._lock:
-                    self.active_monitors.pop(mid, None)
+                self._pop_subprocess_monitor(mid)
 
         # --- Flush pending monitors -------------------------------------------
         self._flush_pending_monitors()
@@ -348,18 +378,18 @@ class MonitorManager:
             return
 
         # Prevent duplicate subprocess windows for the same output
-        with self._lock:
-            for info in list(self.active_monitors.values()):
-                if (
-                    info["node_uuid"]   == node_uuid
-                    and info["output_name"] == output_name
-                    and info["process"].poll() is None
-                ):
-                    self._log(
-                        f"Monitor already open for {node_name}.{output_name} "
-                        f"(pid {info['process'].pid})"
-                    )
-                    return
+        for mid, output in self._node_monitors(node_uuid):
+            info = self.active_monitors.get(mid)
+            if (
+                info is not None
+                and output == output_name
+                and info["process"].poll() is None
+            ):
+                self._log(
+                    f"Monitor already open for {node_name}.{output_name} "
+                    f"(pid {info['process'].pid})"
+                )
+                return
 
         script = os.path.join(
             os.path.dirname(os.path.abspath(__file__)), "monitor_window.py"
@@ -372,6 +402,8 @@ class MonitorManager:
             "--server-url-file",     self._server_url_file,
             "--server-url",          server_url,
         ]
+        if self.debug:
+            cmd.append("--debug")
 
         self._log(
             f"Spawning monitor: {node_name}.{output_name} → "
@@ -397,6 +429,7 @@ class MonitorManager:
                 "server_url":         server_url,
                 "started_at":         time.time(),
             }
+        self._index_node_monitor(monitor_id, node_uuid, output_name)
 
         self._log(
             f"Monitor {monitor_id} started (pid {process.pid}) for "
@@ -423,12 +456,9 @@ class MonitorManager:
         In legacy Socket.IO mode the sio_client is subscribed instead.
         """
         # Prevent duplicates
-        for monitor in self._inprocess_monitors.values():
-            if (
-                monitor.node_uuid == node_uuid
-                and monitor.output_name == output_name
-                and monitor.is_open
-            ):
+        for mid, output in self._node_monitors(node_uuid):
+            monitor = self._inprocess_monitors.get(mid)
+            if monitor is not None and output == output_name and monitor.is_open:
                 self._log(f"In-process monitor already open for {node_name}.{output_name}")
                 monitor.focus()
                 return
@@ -444,6 +474,8 @@ class MonitorManager:
         )
         monitor.open()
         self._inprocess_monitors[monitor_id] = monitor
+        self._index_inprocess(monitor_id, server_output_name)
+        self._index_node_monitor(monitor_id, node_uuid, output_name)
 
         if _is_direct_backend(self._backend):
             # ── Direct probe mode ─────────────────────────────────────────────
@@ -481,8 +513,7 @@ class MonitorManager:
     def close_monitor(self, monitor_id: str, from_window_close: bool = False):
         """Terminate a monitor — subprocess or in-process."""
         # Try subprocess monitors first
-        with self._lock:
-            info = self.active_monitors.pop(monitor_id, None)
+        info = self._pop_subprocess_monitor(monitor_id)
         if info is not None:
             proc = info["process"]
             if proc.poll() is None:
@@ -500,6 +531,8 @@ class MonitorManager:
         monitor = self._inprocess_monitors.pop(monitor_id, None)
         if monitor is not None:
             self._log(f"Closing in-process monitor {monitor_id}")
+            self._unindex_inprocess(monitor_id, monitor.server_output_name)
+            self._unindex_node_monitor(monitor_id, monitor.node_uuid)
 
             if _is_direct_backend(self._backend):
                 # ── Direct probe mode: disable the probe ──────────────────────
@@ -511,11 +544,7 @@ class MonitorManager:
                     )
             else:
                 # ── Legacy Socket.IO mode: unsubscribe when last watcher ──────
-                still_watching = any(
-                    m.server_output_name == monitor.server_output_name
-                    for m in self._inprocess_monitors.values()
-                )
-                if not still_watching:
+                if monitor.server_output_name not in self._inprocess_by_output:
                     try:
                         self.sio_client.unsubscribe(monitor.server_output_name)
                         self._log(
@@ -534,10 +563,6 @@ class MonitorManager:
         attached for the remapped output name.  In Socket.IO mode the
         subscription is updated as before.
         """
-        output_to_monitor_ids: dict[str, list[str]] = {}
-        for mid, monitor in self._inprocess_monitors.items():
-            output_to_monitor_ids.setdefault(monitor.server_output_name, []).append(mid)
-
         for mid, monitor in list(self._inprocess_monitors.items()):
             try:
                 new_output = self.sio_client.get_server_output_name(
@@ -555,6 +580,8 @@ class MonitorManager:
             changed = monitor.retarget_server_output(new_output)
             if not changed:
                 continue
+            self._unindex_inprocess(mid, old_output)
+            self._index_inprocess(mid, new_output)
 
             if _is_direct_backend(self._backend):
                 # ── Direct probe mode ─────────────────────────────────────────
@@ -583,10 +610,7 @@ class MonitorManager:
                         f"for monitor {mid}: {e}"
                     )
 
-                old_watchers = output_to_monitor_ids.get(old_output, [])
-                if mid in old_watchers:
-                    old_watchers.remove(mid)
-                if not old_watchers:
+                if old_output not in self._inprocess_by_output:
                     try:
                         self.sio_client.unsubscribe(old_output)
                     except Exception as e:
@@ -597,6 +621,16 @@ class MonitorManager:
 
             self._log(f"Retargeted in-process monitor {mid}: {old_output} -> {new_output}")
 
+    def _index_inprocess(self, monitor_id: str, server_output_name: str) -> None:
+        self._inprocess_by_output.setdefault(server_output_name, {})[monitor_id] = None
+
+    def _unindex_inprocess(self, monitor_id: str, server_output_name: str) -> None:
+        watchers = self._inprocess_by_output.get(server_output_name)
+        if watchers is not None:
+            watchers.pop(monitor_id, None)
+            if not watchers:
+                del self._inprocess_by_output[server_output_name]
+
     @staticmethod
     def _force_kill_after(proc: subprocess.Popen, timeout: float):
         deadline = time.time() + timeout
@@ -617,19 +651,22 @@ class MonitorManager:
         while not self._reaper_stop.is_set():
             time.sleep(2.0)
             try:
-                dead = []
+                # Find and unregister every exited monitor under a single
+                # lock acquisition; logging happens after release.
                 with self._lock:
-                    for mid, info in self.active_monitors.items():
-                        if info["process"].poll() is not None:
-                            dead.append(mid)
-                for mid in dead:
-                    with self._lock:
-                        info = self.active_monitors.pop(mid, None)
-                    if info:
-                        self._log(
-                            f"Reaped exited monitor {mid} "
-                            f"(rc={info['process'].returncode})"
-                        )
+                    dead = [
+                        (mid, info)
+                        for mid, info in self.active_monitors.items()
+                        if info["process"].poll() is not None
+                    ]
+                    for mid, info in dead:
+                        del self.active_monitors[mid]
+                        self._unindex_node_monitor_locked(mid, info["node_uuid"])
+                for mid, info in dead:
+                    self._log(
+                        f"Reaped exited monitor {mid} "
+                        f"(rc={info['process'].returncode})"
+                    )
             except Exception as e:
                 self._log(f"Reaper error: {e}")
 
@@ -639,16 +676,8 @@ class MonitorManager:
 
     def _find_and_close_monitor(self, monitor_info):
         node_uuid, output_name = monitor_info
-        with self._lock:
-            candidates = [
-                mid for mid, info in self.active_monitors.items()
-                if info["node_uuid"] == node_uuid and info["output_name"] == output_name
-            ]
-        for mid in candidates:
-            self.close_monitor(mid)
-        # In-process monitors
-        for mid, monitor in list(self._inprocess_monitors.items()):
-            if monitor.node_uuid == node_uuid and monitor.output_name == output_name:
+        for mid, output in self._node_monitors(node_uuid):
+            if output == output_name:
                 self.close_monitor(mid)
 
     def after_dpg_init(self):
@@ -660,40 +689,30 @@ class MonitorManager:
     def start_periodic_tasks(self):
         """No-op — in-process monitor ticking is now done from the main render loop."""
         self._log("start_periodic_tasks called (ticking via main render loop)")
-        #print(f"[TICK-DBG] start_periodic_tasks called, monitor_bus={self._monitor_bus}")  # TEMP
-        #if self._monitor_bus is not None:
-        #    self._schedule_inprocess_tick()
 
     # ------------------------------------------------------------------
     # Recurring in-process monitor tick
     # ------------------------------------------------------------------
 
-    def _schedule_inprocess_tick(self) -> None:
-        """Schedule the next per-frame tick one frame from now."""
-        try:
-            next_frame = dpg.get_frame_count() + 1
-            dpg.set_frame_callback(next_frame, self._inprocess_tick)
-        except Exception as exc:
-            # Log instead of silently swallowing — a silent exception here
-            # kills the entire tick chain permanently.
-            self._log(f"_schedule_inprocess_tick error (chain broken!): {exc}")
-
     def _inprocess_tick_direct(self) -> None:
         """Tick called directly from the main render loop (no rescheduling needed)."""
         if not self._inprocess_monitors:
             return
         dead = []
-        for mid, monitor in list(self._inprocess_monitors.items()):
+        # render_frame() never mutates the dict, so no per-frame copy is needed
+        for mid, monitor in self._inprocess_monitors.items():
             try:
                 still_alive = monitor.render_frame()
             except Exception as exc:
                 self._log(f"In-process monitor tick error ({mid}): {exc}")
-                import traceback; traceback.print_exc()
+                traceback.print_exc()
                 still_alive = False
             if not still_alive:
                 dead.append(mid)
         for mid in dead:
-            self._inprocess_monitors.pop(mid, None)
+            # Full teardown: a user-closed window must also release its probe
+            # (or Socket.IO subscription), not just leave the registry.
+            self.close_monitor(mid, from_window_close=True)
             self._log(f"In-process monitor {mid} closed (window was destroyed)")
 
 
@@ -12,7 +12,6 @@ import sys
 import threading
 import time
 import traceback
-from queue import Empty, Queue
 
 import numpy as np
 import socketio as sio_module
@@ -22,11 +21,8 @@ _HERE = os.path.dirname(os.path.abspath(__file__))
 if _HERE not in sys.path:
     sys.path.insert(0, _HERE)
 
-from dpg_plotting import DPGPlotter
-from constants import (    
-    MAX_QUEUE_ITEMS_PER_FRAME,
-    MONITOR_QUEUE_SIZE,
-)
+from dpg_plotting import DPGPlotter, EMPTY_DATA_INFO, decode_float32, format_data_info, status_display
+from monitor_mailbox import Mailbox
 FONT_SIZE = 18
 
 try:
@@ -48,7 +44,7 @@ class StandaloneMonitor:
 
     The DPG render loop runs on the main thread.
     The Socket.IO client runs its own background thread.
-    Data arriving on the sio thread is placed in *data_queue* and consumed on
+    Data arriving on the sio thread is placed in a one-slot mailbox and consumed on
     the main thread, so DPG is never touched from a worker thread.
     """
 class StandaloneMonitor:
@@ -57,10 +53,7 @@ class StandaloneMonitor:
     _TAG_STATUS    = "status_text"
     _TAG_PLOT_CONTAINER = "plot_container"
     _TAG_PHOLDER   = "placeholder_text"
-    _TAG_INFO_TYPE = "info_type"
-    _TAG_INFO_SHP  = "info_shape"
-    _TAG_INFO_RNG  = "info_range"
-    _TAG_INFO_TIME = "info_time"
+    _TAG_INFO      = "info_text"
     _TAG_URL_TXT   = "url_text"
 
     def __init__(
@@ -70,15 +63,17 @@ class StandaloneMonitor:
         server_output_name: str,
         node_name: str,
         output_name: str,
+        debug: bool = False,
     ):
         self.server_url          = server_url
         self.server_url_file     = server_url_file
         self.server_output_name  = server_output_name
         self.node_name           = node_name
         self.output_name         = output_name
+        self.debug               = debug
 
-        # Thread-safe data queue (sio thread → main thread)
-        self.data_queue: Queue = Queue(maxsize=MONITOR_QUEUE_SIZE)
+        # Latest-frame mailbox (sio thread → main thread)
+        self._mailbox: Mailbox = Mailbox()
 
         # Socket.IO state
         self.sio       = None
@@ -105,6 +100,7 @@ class StandaloneMonitor:
         self._pending_status: str | None = None
         self._pending_url: str | None    = None
         self._status_lock = threading.Lock()
+        self._shown_status: str | None = None   # last status written to the label
 
         # Stop flag for the connection loop
         self._stop_flag = threading.Event()
@@ -114,6 +110,14 @@ class StandaloneMonitor:
         self.last_mouse_y = 0
         self.mouse_down = False
 
+    # =========================================================================
+    # Logging
+    # =========================================================================
+
+    def _log(self, msg: str):
+        if self.debug:
+            print(f"[MONITOR] {msg}")
+
     # =========================================================================
     # URL resolution
     # =========================================================================
@@ -184,7 +188,7 @@ class StandaloneMonitor:
         @client.event
         def data_update(data):
             """
-            Called on the sio background thread — only enqueue, never touch DPG.
+            Called on the sio background thread — only fill the mailbox, never touch DPG.
             
             Server sends:
             {
@@ -203,17 +207,12 @@ class StandaloneMonitor:
             if name != self.server_output_name:
                 return
             if payload is None:
-                print(f"[MONITOR] data_update: missing payload for {name}")
+                self._log(f"data_update: missing payload for {name}")
                 return
 
-            if self.data_queue.full():
-                try:
-                    self.data_queue.get_nowait()
-                except Empty:
-                    pass
-            
-            # Queue the complete payload (contains type, data, shape, etc.)
-            self.data_queue.put({"payload": payload, "timestamp": time.time()})
+            # Hand over the complete payload (contains type, data, shape, etc.);
+            # an unplotted older frame is simply replaced.
+            self._mailbox.push({"payload": payload, "timestamp": time.time()})
 
         @client.event
         def done(data):
@@ -378,11 +377,7 @@ class StandaloneMonitor:
             dpg.add_separator()
 
             # Info section - Data statistics
-            with dpg.group(horizontal=False):
-                dpg.add_text("Type:    —", color=[200, 200, 200], tag=self._TAG_INFO_TYPE)
-                dpg.add_text("Shape:   —", color=[200, 200, 200], tag=self._TAG_INFO_SHP)
-                dpg.add_text("Range:   —", color=[200, 200, 200], tag=self._TAG_INFO_RNG)
-                dpg.add_text("Updated: never", color=[200, 200, 200], tag=self._TAG_INFO_TIME)
+            dpg.add_text(EMPTY_DATA_INFO, color=[200, 200, 200], tag=self._TAG_INFO)
 
         # Setup input handlers
         with dpg.handler_registry():
@@ -433,12 +428,14 @@ class StandaloneMonitor:
 
     def _raw_to_numpy(self, payload: dict):
         """
-        Convert the payload dict to a float32 numpy array.
+        Convert the payload dict to a float32 numpy array (or a Python
+        ``float`` for plain scalar payloads).
 
         Expected payload structure:
             {
                 "type":  "1d_array" | "2d_array" | "scalar" | "nd_array" | "multi_data",
-                "data":  <list or nested list>,
+                "data":  <list, nested list, or raw little-endian bytes>,
+                "dtype": <numpy dtype name of raw bytes>  (optional, default float32)
                 "shape": <list of ints>   (optional)
             }
         """
@@ -447,22 +444,29 @@ class StandaloneMonitor:
         shape      = payload.get("shape")
 
         if data_value is None:
-            # Use a more descriptive message
-            msg = "Key missing" if "data" not in payload else "Value is null"
-            print(f"[MONITOR] _raw_to_numpy: {msg} for 'data', keys={list(payload.keys())}")
+            if self.debug:
+                msg = "Key missing" if "data" not in payload else "Value is null"
+                self._log(f"_raw_to_numpy: {msg} for 'data', keys={list(payload)}")
             return None
-        
+
         if data_type is None:
-            print(f"[MONITOR] _raw_to_numpy: no 'type' key in payload, keys={list(payload.keys())}")
+            if self.debug:
+                self._log(f"_raw_to_numpy: no 'type' key in payload, keys={list(payload)}")
 
         try:
             if data_type in ("1d_array", "2d_array", "scalar", "nd_array") or data_type is None:
-                if isinstance(data_value, list):
-                    arr = np.array(data_value, dtype=np.float32)
-                elif isinstance(data_value, np.ndarray):
+                # Scalar fast path: plotted via plot_history(float), so skip
+                # building a one-element ndarray for every telemetry sample
+                if isinstance(data_value, (int, float)) and not isinstance(data_value, bool):
+                    return float(data_value)
+                if isinstance(data_value, list) and len(data_value) == 1 and not shape:
+                    if isinstance(data_value[0], (int, float)):
+                        return float(data_value[0])
+
+                if isinstance(data_value, np.ndarray):
                     arr = data_value.astype(np.float32)
                 else:
-                    arr = np.array([float(data_value)], dtype=np.float32)
+                    arr = decode_float32(data_value, payload.get("dtype"))
 
                 if shape is not None and data_type != "scalar":
                     try:
@@ -490,7 +494,8 @@ class StandaloneMonitor:
             print(f"[MONITOR] Data conversion error: {e}")
             traceback.print_exc()
 
-        print(f"[MONITOR] _raw_to_numpy: unhandled type '{data_type}'")
+        if self.debug:
+            self._log(f"_raw_to_numpy: unhandled type '{data_type}'")
         return None
 
     def _plot(self, arr: np.ndarray) -> bool:
@@ -508,6 +513,8 @@ class StandaloneMonitor:
             self.dpg_plotter.set_vector_mode('history' if "History" in mode_val else 'snapshot')
 
         p    = self.dpg_plotter
+        if isinstance(arr, float):
+            return p.plot_history(arr)
         ndim = arr.ndim
         size = arr.size
 
@@ -544,50 +551,19 @@ class StandaloneMonitor:
         return False
 
     def _update_info_labels(self, arr: np.ndarray):
-        dtype_str = (
-            f"ndarray ({arr.dtype})" if isinstance(arr, np.ndarray) else type(arr).__name__
+        # One text widget, created in _build_ui before the render loop starts
+        dpg.set_value(
+            self._TAG_INFO,
+            format_data_info(arr, self.update_count, self.dpg_plotter.known_range(arr)),
         )
-        shape_str = str(arr.shape) if hasattr(arr, "shape") else "scalar"
-        if (
-            isinstance(arr, np.ndarray)
-            and arr.size > 0
-            and np.issubdtype(arr.dtype, np.number)
-        ):
-            range_str = f"[{arr.min():.4g}, {arr.max():.4g}]"
-        else:
-            range_str = "N/A"
-        ts = time.strftime("%H:%M:%S")
-        for tag, text in (
-            (self._TAG_INFO_TYPE, f"Type:    {dtype_str}"),
-            (self._TAG_INFO_SHP,  f"Shape:   {shape_str}"),
-            (self._TAG_INFO_RNG,  f"Range:   {range_str}"),
-            (self._TAG_INFO_TIME, f"Updated: {ts}  (#{self.update_count})"),
-        ):
-            if dpg.does_item_exist(tag):
-                dpg.set_value(tag, text)
 
     # =========================================================================
     # Per-frame work (main thread)
     # =========================================================================
 
-    _STATUS_COLORS = {
-        "connected":    [0, 255, 0],
-        "subscribed":   [100, 255, 100],
-        "receiving":    [0, 200, 255],
-        "disconnected": [255, 80, 80],
-        "error":        [255, 80, 80],
-        "retrying":     [255, 180, 0],
-    }
-    _STATUS_LABELS = {
-        "connected":    "+ Connected",
-        "subscribed":   "> Subscribed",
-        "receiving":    "<> Receiving",
-        "disconnected": "- Disconnected",
-        "error":        "! Error",
-        "retrying":     "~ Retrying …",
-    }
-
     def _set_status(self, status: str):
+        if status == self._shown_status and self._pending_status is None:
+            return   # e.g. "receiving" on every plotted frame
         with self._status_lock:
             self._pending_status = status
 
@@ -598,36 +574,32 @@ class StandaloneMonitor:
             self._pending_status = None
             self._pending_url    = None
 
-        if status and dpg.does_item_exist(self._TAG_STATUS):
-            label = self._STATUS_LABELS.get(status, status.capitalize())
-            color = self._STATUS_COLORS.get(status, [200, 200, 200])
-            dpg.set_value(self._TAG_STATUS, f"Status:  {label}")
+        if status and status != self._shown_status and dpg.does_item_exist(self._TAG_STATUS):
+            text, color = status_display(status)
+            dpg.set_value(self._TAG_STATUS, text)
             dpg.configure_item(self._TAG_STATUS, color=color)
+            self._shown_status = status
 
         if new_url and dpg.does_item_exist(self._TAG_URL_TXT):
             dpg.set_value(self._TAG_URL_TXT, f"Server:  {new_url}")
 
-    def _drain_queue(self):
+    def _drain_mailbox(self):
+        # Only the newest frame is plotted; older frames were overwritten.
         now = time.time()
-        for _ in range(MAX_QUEUE_ITEMS_PER_FRAME):
-            try:
-                item = self.data_queue.get_nowait()
-            except Empty:
-                break
+        if now - self.last_update < self.min_update_interval:
+            return
 
-            if now - self.last_update < self.min_update_interval:
-                continue
+        item = self._mailbox.pop_latest()
+        if item is None:
+            return
 
-            # Extract payload from queue item
-            arr = self._raw_to_numpy(item["payload"])
-            if arr is None:
-                continue
-
-            if self._plot(arr):
-                self._update_info_labels(arr)
-                self.last_update  = now
-                self.update_count += 1
-                self._set_status("receiving")
+        # Extract payload from the mailbox item
+        arr = self._raw_to_numpy(item["payload"])
+        if arr is not None and self._plot(arr):
+            self._update_info_labels(arr)
+            self.last_update  = now
+            self.update_count += 1
+            self._set_status("receiving")
 
     # =========================================================================
     # Main entry point
@@ -643,7 +615,7 @@ class StandaloneMonitor:
         while dpg.is_dearpygui_running():
             self._apply_pending_status()
             self._update_responsive_layout()
-            self._drain_queue()
+            self._drain_mailbox()
             dpg.render_dearpygui_frame()
 
         # Cleanup
@@ -677,6 +649,10 @@ def main():
     )
     parser.add_argument("--node-name",   required=True)
     parser.add_argument("--output-name", required=True)
+    parser.add_argument(
+        "--debug", action="store_true",
+        help="Print per-frame payload diagnostics",
+    )
     args = parser.parse_args()
 
     monitor = StandaloneMonitor(
@@ -685,6 +661,7 @@ def main():
         server_output_name = args.server_output_name,
         node_name          = args.node_name,
         output_name        = args.output_name,
+        debug              = args.debug,
     )
     monitor.run()
 
@@ -14,18 +14,24 @@ Three sub-components handle specialized responsibilities:
   - PropertyPanel    (property_panel.py)   – property inspector UI
 """
 
+import re
+import sys
 import time
 import uuid
+from itertools import chain
 import dearpygui.dearpygui as dpg
+import numpy as np
 
 from dpg_utils import (
     apply_link_style,
+    get_link_theme,
     create_data_node_theme,
     create_proc_node_theme,
     create_data_node_theme_incomplete,
     create_proc_node_theme_incomplete,
+    schedule_frame_callback,
 )
-from constants import SOCKETIO_SERVER
+from constants import SOCKETIO_SERVER, PANEL_REFRESH_DELAY_FRAMES
 from constants import (
     DATA_SHAPE_EMPTY,
     DATA_SHAPE_FILLED,
@@ -35,12 +41,24 @@ from constants import (
     REF_SHAPE_FILLED,
 )
 import render_scale
-from node_registry import NodeRegistry
+from graph_manager import filename_key
+from node_registry import NodeRegistry, is_ref_input_name
 from socketio_client import SocketIOClient
 from monitor_bus import MonitorBus
 from monitor_manager import MonitorManager
 from property_panel import PropertyPanel
 
+# Resting colour per NodeRegistry.link_kinds entry ("normal" links keep the
+# default theme and are not listed)
+_LINK_KIND_COLORS = {
+    "ref":      (200, 200, 200, 60),
+    "feedback": (255, 0, 0, 255),
+}
+
+# Template outputs with a "{...}" format field are unexpanded placeholders
+# rather than real pins.
+_BRACE_PLACEHOLDER_RE = re.compile(r"[{}]")
+
 class NodeManager:
     """
     Orchestrates the DPG node editor and its supporting sub-components.
@@ -71,6 +89,7 @@ class NodeManager:
         self.input_attr_registry = self.registry.input_attr_registry
         self.output_attr_registry = self.registry.output_attr_registry
         self.link_registry = self.registry.link_registry
+        self.link_pins = self.registry.link_pins
 
         # ===== 2. SOCKET.IO CLIENT =====
         self.sio_client = SocketIOClient(
@@ -115,6 +134,14 @@ class NodeManager:
         self._selected_link_id = None
         self.class_name_counters = {}
         self.node_item_registry = {}
+        # Panel refresh after a click is deferred a few frames; every new click
+        # pushes the deadline back so a burst of clicks (drag-select) only
+        # evaluates the selection once.
+        self._panel_refresh_frame = 0
+        # Numeric DPG ids of the editor and property panel, resolved once in
+        # after_dpg_init() so hot handlers skip the string-alias lookup.
+        self._editor_id = "specula_editor"
+        self._panel_id = "property_panel"
 
         # ===== 7. THEMES =====
         self.data_theme = None
@@ -130,15 +157,38 @@ class NodeManager:
         _MOUSE_MOVE_INTERVAL: float = 0.05   # seconds (50 ms → ≤20 checks/s)
         self._MOUSE_MOVE_INTERVAL = _MOUSE_MOVE_INTERVAL
 
+        # ===== 9. LINK HOVER INDEX =====
+        # Padded screen-space bounding boxes of all links, (N, 4) as
+        # x0, y0, x1, y1.  Hover/click handlers test the mouse against this
+        # array and only call dpg.is_item_hovered() on the few links whose box
+        # contains it.  Rebuilt when links change or after _LINK_BBOX_TTL
+        # seconds (nodes may have been dragged).
+        self._link_bbox_ids: list = []
+        self._link_bbox_arr = None
+        self._link_bbox_time: float = 0.0
+        self._LINK_BBOX_TTL: float = 0.25
+        self._hovered_link_id = None
+
+        # Per-frame input snapshot shared by the click / double-click / move
+        # handlers, so each DPG query runs at most once per rendered frame.
+        # See _frame_input().
+        self._input_snapshot: dict = {"frame": -1}
+
         self.editor = None
 
     # ==========================================================================
     # LOGGING
     # ==========================================================================
 
-    def _log(self, message: str):
-        """Log message if debug enabled."""
+    def _log(self, message: str, *args):
+        """Log message if debug enabled.
+
+        Extra *args* are %-formatted into *message* only when debug is on, so
+        hot callbacks pay nothing for their diagnostics otherwise.
+        """
         if self.debug:
+            if args:
+                message = message % args
             print(f"[NODE_MANAGER] {message}")
 
     # ==========================================================================
@@ -174,8 +224,8 @@ class NodeManager:
     # ==========================================================================
 
     def update_property_panel(self, node_uuid: str, panel_tag: str):
-        """Delegate to PropertyPanel."""
-        self.property_panel.update_node_panel(node_uuid, panel_tag)
+        """Delegate to PropertyPanel; the form is rebuilt only if it is stale."""
+        self.property_panel.show_node_panel(node_uuid, panel_tag)
 
     def update_connection_panel(self, link_id, panel_tag: str):
         """Delegate to PropertyPanel."""
@@ -204,8 +254,11 @@ class NodeManager:
     def after_dpg_init(self):
         """Initialize after DPG is ready."""
         self._log("DPG initialised, setting up periodic tasks")
-        current_frame = dpg.get_frame_count()
-        dpg.set_frame_callback(current_frame + 100, self.monitors.start_periodic_tasks)
+        for attr, tag in (("_editor_id", "specula_editor"), ("_panel_id", "property_panel")):
+            if dpg.does_alias_exist(tag):
+                setattr(self, attr, dpg.get_alias_id(tag))
+        # start_periodic_tasks() is called by the app's run() before the render
+        # loop, so no delayed frame callback is needed here.
         self.monitors.after_dpg_init()
 
     def start_periodic_tasks(self):
@@ -265,10 +318,10 @@ class NodeManager:
 
     def is_node_complete(self, node_uuid: str) -> bool:
         """Check if all REQUIRED reference parameters are connected."""
-        if node_uuid not in self.graph.nodes:
+        node_data = self.graph.nodes.get(node_uuid)
+        if node_data is None:
             return True
 
-        node_data = self.graph.nodes[node_uuid]
         template = self.all_templates.get(node_data.get("type", ""), {})
         template_params = template.get("parameters", {})
         current_values = node_data.get("values", {})
@@ -357,9 +410,8 @@ class NodeManager:
 
     def _generate_unique_name(self, class_name: str) -> str:
         """Generate unique node instance name."""
-        self.class_name_counters.setdefault(class_name, 0)
-        counter = self.class_name_counters[class_name]
-        self.class_name_counters[class_name] += 1
+        counter = self.class_name_counters.get(class_name, 0)
+        self.class_name_counters[class_name] = counter + 1
         return f"a{class_name}{counter}"
 
     def create_node(self, node_type, pos=None, existing_uuid=None, name_override=None):
@@ -376,6 +428,10 @@ class NodeManager:
             name_override if name_override 
             else self._generate_unique_name(node_type)
         )
+        # Names double as *_ref / source_dict_ref / layer_list values, so
+        # interning makes those comparisons identity checks.
+        if isinstance(node_name, str):
+            node_name = sys.intern(node_name)
         node_data["name"] = node_name
         final_pos = pos if pos else [100, 100]
 
@@ -393,6 +449,8 @@ class NodeManager:
                 dpg.add_text(f"Class: {node_type}", color=[130, 130, 130])
                 dpg.add_spacer(width=header_spacer_w)
 
+            add_input_attr = self.registry.add_input_attr
+
             # Reference parameter inputs
             for param_name, param_meta in template.get("parameters", {}).items():
                 if isinstance(param_meta, dict) and param_meta.get("kind") == "reference":
@@ -401,11 +459,11 @@ class NodeManager:
                         attribute_type=dpg.mvNode_Attr_Input, shape=REF_SHAPE_EMPTY
                     ) as attr_id:
                         dpg.add_text(display_name, color=[150, 255, 150])
-                        self.input_attr_registry[attr_id] = (node_uuid, display_name)
+                        add_input_attr(attr_id, node_uuid, display_name, is_ref=True)
 
             # Standard inputs (non-reference)
             for in_attr, meta in node_data.get("inputs", {}).items():
-                if in_attr.endswith("_ref") or in_attr == "layer_list":
+                if is_ref_input_name(in_attr):
                     continue
 
                 kind = meta.get("kind", "single")
@@ -416,7 +474,7 @@ class NodeManager:
                 ) as attr_id:
                     label = f"{in_attr} [*]" if kind == "variadic" else in_attr
                     dpg.add_text(label, color=[255, 255, 255])
-                    self.input_attr_registry[attr_id] = (node_uuid, in_attr)
+                    add_input_attr(attr_id, node_uuid, in_attr, is_ref=False)
 
             # Outputs
             self._create_node_outputs(dpg_id, node_uuid, node_type, node_data)
@@ -436,63 +494,72 @@ class NodeManager:
         """Create output pins for a node."""
         output_spacer_w = render_scale.node_output_spacer_width()
 
-        if node_type == "AtmoPropagation":
-            all_outputs = list(node_data.get("outputs", []))
-            if "outputs_extra" in node_data:
-                all_outputs.extend(node_data["outputs_extra"])
-
-            for out in all_outputs:
-                out_name = self._extract_output_name(out)
-                if not out_name or '{' in out_name or '}' in out_name:
-                    continue
-                if out_name.startswith("out_' + ") and out_name.endswith(" + '_ef'"):
-                    continue
-
-                display_label = out_name.replace(":", " [") + "]" if ":" in out_name else out_name
-                with dpg.node_attribute(
-                    attribute_type=dpg.mvNode_Attr_Output, shape=DATA_SHAPE_EMPTY
-                ) as attr_id:
-                    with dpg.group(horizontal=True):
-                        dpg.add_spacer(width=output_spacer_w)
-                        dpg.add_text(display_label)
-                    self.output_attr_registry[attr_id] = (node_uuid, out_name)
-
-        elif node_type == "SimulParams":
-            with dpg.node_attribute(
-                attribute_type=dpg.mvNode_Attr_Output, shape=REF_SHAPE_EMPTY
-            ) as attr_id:
-                with dpg.group(horizontal=True):
-                    dpg.add_spacer(width=output_spacer_w)
-                    dpg.add_text("ref", color=[150, 150, 150])
-                self.output_attr_registry[attr_id] = (node_uuid, "ref")
-
+        if node_type == "SimulParams":
+            self._add_output_pin(
+                node_uuid, "ref", shape=REF_SHAPE_EMPTY, color=[150, 150, 150],
+                spacer_w=output_spacer_w,
+            )
         else:
-            all_outputs = list(node_data.get("outputs", []))
-            if "outputs_extra" in node_data:
-                all_outputs.extend(node_data["outputs_extra"])
-
-            for out in all_outputs:
+            is_atmo = node_type == "AtmoPropagation"
+            for out in chain(node_data.get("outputs", ()), node_data.get("outputs_extra", ())):
                 out_name = self._extract_output_name(out)
-                if not out_name or '{' in out_name or '}' in out_name:
+                if not out_name or _BRACE_PLACEHOLDER_RE.search(out_name):
+                    continue
+                # AtmoPropagation's "out_' + name + '_ef'" expression; its real
+                # outputs are added dynamically
+                if is_atmo and out_name.startswith("out_' + ") and out_name.endswith(" + '_ef'"):
                     continue
-
                 display_label = out_name.replace(":", " [") + "]" if ":" in out_name else out_name
-                with dpg.node_attribute(
-                    attribute_type=dpg.mvNode_Attr_Output, shape=DATA_SHAPE_EMPTY
-                ) as attr_id:
-                    with dpg.group(horizontal=True):
-                        dpg.add_spacer(width=output_spacer_w)
-                        dpg.add_text(display_label)
-                    self.output_attr_registry[attr_id] = (node_uuid, out_name)
+                self._add_output_pin(
+                    node_uuid, out_name, display_label, spacer_w=output_spacer_w
+                )
 
         if node_type in ("Source", "Pupilstop"):
-            with dpg.node_attribute(
-                attribute_type=dpg.mvNode_Attr_Output, shape=REF_SHAPE_EMPTY
-            ) as attr_id:
-                with dpg.group(horizontal=True):
-                    dpg.add_spacer(width=output_spacer_w)
-                    dpg.add_text("ref", color=[100, 200, 255])
-                self.output_attr_registry[attr_id] = (node_uuid, "ref")
+            self._add_output_pin(
+                node_uuid, "ref", shape=REF_SHAPE_EMPTY, color=[100, 200, 255],
+                spacer_w=output_spacer_w,
+            )
+
+    def _add_output_pin(self, node_uuid, name, label=None, shape=DATA_SHAPE_EMPTY,
+                        color=None, parent=0, spacer_w=None):
+        """
+        Create one right-aligned output pin and register it.
+
+        The label is pushed right with the text item's own ``indent`` rather
+        than a horizontal group + spacer, so each pin costs one DPG widget
+        instead of three.
+
+        Parameters
+        ----------
+        node_uuid : str
+            Owning node.
+        name : str
+            Output name registered in NodeRegistry.
+        label : str, optional
+            Displayed text; defaults to *name*.
+        shape : int
+            DPG pin shape.
+        color : list, optional
+            Text colour; the theme default when omitted.
+        parent : int
+            Node item to attach to; 0 uses the current DPG container.
+        spacer_w : int, optional
+            Label indent; read from render_scale when omitted.
+
+        Returns
+        -------
+        int
+            The DPG attribute id.
+        """
+        if spacer_w is None:
+            spacer_w = render_scale.node_output_spacer_width()
+        text_kwargs = {} if color is None else {"color": color}
+        with dpg.node_attribute(
+            attribute_type=dpg.mvNode_Attr_Output, shape=shape, parent=parent
+        ) as attr_id:
+            dpg.add_text(name if label is None else label, indent=spacer_w, **text_kwargs)
+            self.registry.add_output_attr(attr_id, node_uuid, name)
+        return attr_id
 
     def _extract_output_name(self, output):
         """Extract output name from new format (dict) or old format (string)."""
@@ -509,37 +576,29 @@ class NodeManager:
             attribute_type=dpg.mvNode_Attr_Input, parent=dpg_id, shape=REF_SHAPE_EMPTY
         ) as attr_id:
             dpg.add_text("source_dict_ref", color=[150, 255, 150])
-            self.input_attr_registry[attr_id] = (node_uuid, "source_dict_ref")
-            self._log(f"Added source_dict_ref input to AtmoPropagation node {node_uuid}")
+            self.registry.add_input_attr(attr_id, node_uuid, "source_dict_ref")
+            self._log("Added source_dict_ref input to AtmoPropagation node %s", node_uuid)
 
     def _add_dynamic_atmo_output(self, node_uuid: str, source_name: str):
         """Add dynamic output to AtmoPropagation node."""
         dpg_id = self.uuid_to_dpg.get(node_uuid)
-        if not dpg_id or not dpg.does_item_exist(dpg_id):
-            return
-
         node_data = self.graph.nodes.get(node_uuid, {})
-        if not node_data:
+        if not dpg_id or not node_data:
             return
 
         new_output = f"out_{source_name}_ef"
-        node_data.setdefault("outputs_extra", [])
+        # {output name: None} — insertion-ordered set, O(1) membership
+        outputs_extra = node_data.setdefault("outputs_extra", {})
 
-        if new_output in node_data["outputs_extra"]:
+        # Repeat links are the common case; only probe DPG for a new pin
+        if new_output in outputs_extra or not dpg.does_item_exist(dpg_id):
             return
 
-        node_data["outputs_extra"].append(new_output)
+        outputs_extra[new_output] = None
         self._refresh_node_theme(node_uuid)
 
-        output_spacer_w = render_scale.node_output_spacer_width()
-        with dpg.node_attribute(
-            attribute_type=dpg.mvNode_Attr_Output, shape=DATA_SHAPE_EMPTY, parent=dpg_id
-        ) as attr_id:
-            with dpg.group(horizontal=True):
-                dpg.add_spacer(width=output_spacer_w)
-                dpg.add_text(new_output, color=[100, 255, 255])
-            self.output_attr_registry[attr_id] = (node_uuid, new_output)
-            self._log(f"Created dynamic output '{new_output}'")
+        self._add_output_pin(node_uuid, new_output, color=[100, 255, 255], parent=dpg_id)
+        self._log("Created dynamic output '%s'", new_output)
 
     # ==========================================================================
     # RENDER SCALE REBUILD
@@ -581,12 +640,12 @@ class NodeManager:
 
         # ── 3. Tear down DPG items and clear registries ────────────────────────
         self.node_item_registry.clear()
-        self.registry.clear()                                   # clears all 5 dicts
+        self.registry.clear()                                   # clears all registries
+        self._link_bbox_arr = None
         dpg.delete_item("specula_editor", children_only=True)   # removes all DPG nodes/links
 
         # Also clear graph-level connection state so manual_link can re-add cleanly
-        self.graph.connections.clear()
-        self.graph.connection_properties.clear()
+        self.graph.clear_connections()
 
         # Clear UI selection state
         self._last_selected_uuid = None
@@ -638,42 +697,49 @@ class NodeManager:
             return
 
         if not self._can_connect_to_input(in_node_uuid, in_name):
-            self._log(f"Connection rejected: input '{in_name}' on node {in_node_uuid} is single and already connected")
+            self._log(
+                "Connection rejected: input '%s' on node %s is single and already connected",
+                in_name, in_node_uuid,
+            )
             return
 
         is_feedback = ":-" in str(out_name)
         connection_props = {"delay": -1 if ":-1" in str(out_name) else 0}
 
         link_id = dpg.add_node_link(out_attr_id, in_attr_id, parent=sender)
-        self.link_registry[link_id] = (out_node_uuid, out_name, in_node_uuid, in_name)
+        self.registry.add_link(
+            link_id, (out_node_uuid, out_name, in_node_uuid, in_name), (out_attr_id, in_attr_id)
+        )
+        self._link_bbox_arr = None
         self.graph.add_connection(
             out_node_uuid, out_name, in_node_uuid, in_name, connection_props
         )
 
-        dst_node = self.graph.nodes.get(in_node_uuid, {})
-        src_node = self.graph.nodes.get(out_node_uuid, {})
+        nodes = self.graph.nodes
+        dst_node = nodes.get(in_node_uuid, {})
+        src_node = nodes.get(out_node_uuid, {})
 
         if not dst_node or not src_node:
             return
 
-        dst_node.setdefault("values", {})
+        values = dst_node.setdefault("values", {})
         src_name = src_node.get("name", out_node_uuid)
-        is_ref_connection = in_name.endswith("_ref") or in_name == "layer_list"
+        is_ref_connection = self.registry.is_ref_input(in_attr_id)
 
         if is_ref_connection:
             if in_name == "source_dict_ref":
-                dst_node["values"].setdefault(in_name, [])
-                if src_name not in dst_node["values"][in_name]:
-                    dst_node["values"][in_name].append(src_name)
+                names = values.setdefault(in_name, [])
+                if src_name not in names:
+                    names.append(src_name)
                 if dst_node.get("type") == "AtmoPropagation":
                     self._add_dynamic_atmo_output(in_node_uuid, src_name)
             elif in_name == "layer_list":
-                dst_node["values"].setdefault(in_name, [])
-                if src_name not in dst_node["values"][in_name]:
-                    dst_node["values"][in_name].append(src_name)
+                names = values.setdefault(in_name, [])
+                if src_name not in names:
+                    names.append(src_name)
             else:
-                dst_node["values"][in_name] = src_name
-                self._log(f"Set reference parameter {in_name} = {src_name}")
+                values[in_name] = src_name
+                self._log("Set reference parameter %s = %s", in_name, src_name)
 
         if is_feedback:
             apply_link_style(link_id, color=[255, 0, 0, 255])
@@ -705,11 +771,9 @@ class NodeManager:
         if input_kind == "variadic":
             return True
 
-        for src_u, src_a, dst_u, dst_a in self.graph.connections:
-            if dst_u == node_uuid and dst_a == input_name:
-                return False
-
-        return True
+        return not any(
+            dst_a == input_name for _, _, _, dst_a in self.graph.connections_to(node_uuid)
+        )
     
     def _update_input_pin_shape(self, node_uuid: str, input_name: str):
         """Update the pin shape of an input based on whether it has connections."""
@@ -717,23 +781,17 @@ class NodeManager:
         if not node_data:
             return
 
-        is_ref = input_name.endswith("_ref") or input_name == "layer_list"
+        attr_id = self.registry.input_pin(node_uuid, input_name)
+        if attr_id is None:
+            return
+
+        is_ref = self.registry.is_ref_input(attr_id)
         node_inputs = node_data.get("inputs", {})
         input_meta = node_inputs.get(input_name, {})
         input_kind = input_meta.get("kind", "single")
 
-        attr_id = None
-        for aid, (uid, name) in self.input_attr_registry.items():
-            if uid == node_uuid and name == input_name:
-                attr_id = aid
-                break
-
-        if attr_id is None:
-            return
-
         has_connection = any(
-            dst_u == node_uuid and dst_a == input_name
-            for _, _, dst_u, dst_a in self.graph.connections
+            dst_a == input_name for _, _, _, dst_a in self.graph.connections_to(node_uuid)
         )
 
         if is_ref:
@@ -751,18 +809,12 @@ class NodeManager:
         """Update the pin shape of an output based on whether it has connections."""
         is_ref = output_name == "ref"
 
-        attr_id = None
-        for aid, (uid, name) in self.output_attr_registry.items():
-            if uid == node_uuid and name == output_name:
-                attr_id = aid
-                break
-
+        attr_id = self.registry.output_pin(node_uuid, output_name)
         if attr_id is None:
             return
 
         has_connection = any(
-            src_u == node_uuid and src_a == output_name
-            for src_u, src_a, _, _ in self.graph.connections
+            src_a == output_name for _, src_a, _, _ in self.graph.connections_from(node_uuid)
         )
 
         if is_ref:
@@ -780,11 +832,13 @@ class NodeManager:
         if link_id not in self.link_registry:
             return
 
-        src_uuid, src_attr, dst_uuid, dst_attr = self.link_registry.pop(link_id)
+        src_uuid, src_attr, dst_uuid, dst_attr = self.registry.pop_link(link_id)
+        self._link_bbox_arr = None
         self.graph.remove_connection(src_uuid, src_attr, dst_uuid, dst_attr)
 
-        dst_node = self.graph.nodes.get(dst_uuid, {})
-        src_node = self.graph.nodes.get(src_uuid, {})
+        nodes = self.graph.nodes
+        dst_node = nodes.get(dst_uuid, {})
+        src_node = nodes.get(src_uuid, {})
 
         if not dst_node or not src_node:
             if dpg.does_item_exist(link_id):
@@ -803,20 +857,14 @@ class NodeManager:
 
             if dst_node.get("type") == "AtmoPropagation":
                 dynamic_output = f"out_{src_name}_ef"
+                outputs_extra = dst_node.get("outputs_extra", {})
                 if src_name not in values.get("source_dict_ref", []):
-                    if dynamic_output in dst_node.get("outputs_extra", []):
-                        dst_node["outputs_extra"].remove(dynamic_output)
-
-                        attr_to_remove = next(
-                            (
-                                aid
-                                for aid, (uid, name) in self.output_attr_registry.items()
-                                if uid == dst_uuid and name == dynamic_output
-                            ),
-                            None,
-                        )
+                    if dynamic_output in outputs_extra:
+                        del outputs_extra[dynamic_output]
+
+                        attr_to_remove = self.registry.output_pin(dst_uuid, dynamic_output)
                         if attr_to_remove:
-                            del self.output_attr_registry[attr_to_remove]
+                            self.registry.remove_attr(attr_to_remove)
                             if dpg.does_item_exist(attr_to_remove):
                                 dpg.delete_item(attr_to_remove)
 
@@ -830,7 +878,7 @@ class NodeManager:
         elif dst_attr.endswith("_ref"):
             if values.get(dst_attr) == src_name:
                 values.pop(dst_attr, None)
-                self._log(f"Cleared {dst_attr}")
+                self._log("Cleared %s", dst_attr)
 
         if self._last_selected_uuid == dst_uuid:
             self.update_property_panel(dst_uuid, "property_panel")
@@ -851,15 +899,8 @@ class NodeManager:
         is_feedback = delay == -1
         base_src_attr = src_attr
 
-        src_id = next(
-            (
-                d for d, (u, n) in self.output_attr_registry.items()
-                if u == src_uuid and n == base_src_attr
-            ),
-            None,
-        )
-
-        output_spacer_w = render_scale.node_output_spacer_width()
+        # O(1) (uuid, name) -> pin lookups; pins are created on demand below
+        src_id = self.registry.output_pin(src_uuid, base_src_attr)
 
         if src_id is None:
             parent = self.uuid_to_dpg.get(src_uuid)
@@ -871,53 +912,44 @@ class NodeManager:
                     else ([150, 150, 150] if is_ref_link else [255, 255, 255])
                 )
 
-                with dpg.node_attribute(
-                    attribute_type=dpg.mvNode_Attr_Output, parent=parent, shape=shape
-                ) as new_id:
-                    with dpg.group(horizontal=True):
-                        dpg.add_spacer(width=output_spacer_w)
-                        text = f"{base_src_attr}:-1" if is_feedback else base_src_attr
-                        dpg.add_text(text, color=color)
-                    self.output_attr_registry[new_id] = (src_uuid, base_src_attr)
-                    src_id = new_id
-
-        if dst_attr.endswith("_ref") or dst_attr == "layer_list":
+                src_id = self._add_output_pin(
+                    src_uuid, base_src_attr,
+                    f"{base_src_attr}:-1" if is_feedback else base_src_attr,
+                    shape=shape, color=color, parent=parent,
+                )
+
+        dst_is_ref = is_ref_input_name(dst_attr)
+        if dst_is_ref:
             dst_node = self.graph.nodes.get(dst_uuid)
             src_node = self.graph.nodes.get(src_uuid)
             if dst_node and src_node:
-                dst_node.setdefault("values", {})
-                dst_node["values"][dst_attr] = src_node.get("name", src_uuid)
-
-        dst_id = next(
-            (
-                d for d, (u, n) in self.input_attr_registry.items()
-                if u == dst_uuid and n == dst_attr
-            ),
-            None,
-        )
+                dst_node.setdefault("values", {})[dst_attr] = src_node.get("name", src_uuid)
+
+        dst_id = self.registry.input_pin(dst_uuid, dst_attr)
 
         if dst_id is None:
             parent = self.uuid_to_dpg.get(dst_uuid)
             if parent:
-                is_ref = dst_attr.endswith("_ref") or dst_attr == "layer_list"
-                pin_shape = REF_SHAPE_EMPTY if is_ref else DATA_SHAPE_EMPTY
+                pin_shape = REF_SHAPE_EMPTY if dst_is_ref else DATA_SHAPE_EMPTY
 
                 with dpg.node_attribute(
                     attribute_type=dpg.mvNode_Attr_Input, parent=parent, shape=pin_shape
                 ) as new_id:
                     dpg.add_text(dst_attr, color=[150, 255, 150])
-                    self.input_attr_registry[new_id] = (dst_uuid, dst_attr)
+                    self.registry.add_input_attr(new_id, dst_uuid, dst_attr, is_ref=dst_is_ref)
                     dst_id = new_id
 
         if src_id and dst_id:
             link_id = dpg.add_node_link(src_id, dst_id, parent="specula_editor")
+            self.registry.add_link(
+                link_id, (src_uuid, base_src_attr, dst_uuid, dst_attr), (src_id, dst_id)
+            )
 
             if is_feedback:
                 apply_link_style(link_id, color=[255, 0, 0, 255])
-            elif dst_attr.endswith("_ref") or "params" in dst_attr.lower():
+            elif self.registry.link_kinds[link_id] == "ref":
                 apply_link_style(link_id, color=[200, 200, 200, 60])
-
-            self.link_registry[link_id] = (src_uuid, base_src_attr, dst_uuid, dst_attr)
+            self._link_bbox_arr = None
             self.graph.add_connection(
                 src_uuid, base_src_attr, dst_uuid, dst_attr, {"delay": delay}
             )
@@ -930,31 +962,24 @@ class NodeManager:
             return True
 
         self._log(
-            f"Failed manual link: {src_uuid}.{src_attr} -> {dst_uuid}.{dst_attr}"
+            "Failed manual link: %s.%s -> %s.%s", src_uuid, src_attr, dst_uuid, dst_attr
         )
         return False
 
     def manual_link_with_filename(self, src_uuid, src_attr, dst_uuid, dst_attr, filename):
         """Create link with filename for DataStore connections."""
         self.manual_link(src_uuid, src_attr, dst_uuid, dst_attr)
-        
-        if 'filename_map' not in self.graph.nodes[dst_uuid]:
-            self.graph.nodes[dst_uuid]['filename_map'] = {}
-        
-        conn_key = f"{src_uuid}.{src_attr}"
-        self.graph.nodes[dst_uuid]['filename_map'][conn_key] = filename
+
+        node = self.graph.nodes.get(dst_uuid)
+        if node is None:
+            return
+        node.setdefault('filename_map', {})[filename_key(src_uuid, src_attr)] = filename
 
     # ==========================================================================
     # EVENT HANDLERS (KEYBOARD, MOUSE)
     # ==========================================================================
-
-    def setup_handlers(self):
-        """Register input event handlers."""
-        with dpg.handler_registry():
-            dpg.add_mouse_click_handler(callback=self.on_click_editor)
-            dpg.add_key_press_handler(key=dpg.mvKey_D, callback=self.delete_selected_link)
-            dpg.add_mouse_double_click_handler(callback=self._on_canvas_double_click)
-            dpg.add_mouse_move_handler(callback=self._on_mouse_move)
+    # Registered by SpeculaEditor (main.py): mouse handlers in its editor
+    # setup, keys through its _KEY_DISPATCH table.
 
     def _on_link_click(self, sender, app_data, link_id):
         """Select a link and show its properties in the panel."""
@@ -982,18 +1007,31 @@ class NodeManager:
     def on_click_editor(self, sender, app_data):
         """Handle editor click - select node or link.
 
-        Link hover detection is O(n_links): keep it out of the mouse-move
-        handler (which fires at frame rate) and only run it on actual clicks.
+        Link hit-testing goes through the bounding-box index (see
+        ``_hovered_link``), so only links near the mouse are queried; the
+        editor-hover and hovered-link results are shared per frame via
+        ``_frame_input``.
         """
-        for link_id in self.link_registry:
-            if dpg.is_item_hovered(link_id):
+        if dpg.is_item_hovered(self._panel_id):
+            return  # clicks inside the inspector never change the selection
+
+        snap = self._frame_input()
+        if snap["editor_hovered"]:
+            link_id = self._frame_hovered_link(snap)
+            if link_id is not None:
                 self._on_link_click(sender, app_data, link_id)
                 return
-
-        if dpg.is_item_hovered("specula_editor"):
             if not self.get_selected_nodes():
                 self._clear_link_selection()
 
+        self._panel_refresh_frame = dpg.get_frame_count() + PANEL_REFRESH_DELAY_FRAMES
+        schedule_frame_callback(self._panel_refresh_frame, self._apply_selection_change)
+
+    def _apply_selection_change(self, sender=None, app_data=None):
+        """Show/hide the property panel for the current node selection (debounced)."""
+        if dpg.get_frame_count() < self._panel_refresh_frame:
+            return   # superseded by a later click
+
         selected = self.get_selected_nodes()
 
         if len(selected) == 1:
@@ -1031,8 +1069,8 @@ class NodeManager:
             # Resize editor to fill remaining space
             dpg.configure_item("specula_editor_parent", width=-(property_width + 5))
             
-            # Update content
-            self.update_property_panel(node_uuid, "property_panel")
+            # Update content (reuses the cached form when nothing changed)
+            self.property_panel.show_node_panel(node_uuid, "property_panel")
             
             self._log(f"Property panel shown for {node_uuid} (width: {property_width}px)")
         except Exception as e:
@@ -1045,7 +1083,7 @@ class NodeManager:
         
         try:
             dpg.configure_item("property_panel", width=0, show=False)
-            dpg.delete_item("property_panel", children_only=True)
+            self.property_panel.hide_forms()
             dpg.configure_item("specula_editor_parent", width=-1)            
         except Exception as e:
             self._log(f"Error hiding property panel: {e}")
@@ -1111,14 +1149,12 @@ class NodeManager:
         if not dpg.does_item_exist(link_id):
             return
 
-        if link_id in self.link_registry:
-            src_uuid, src_attr, dst_uuid, dst_attr = self.link_registry[link_id]
-            if dst_attr.endswith("_ref") or "params" in dst_attr.lower():
-                apply_link_style(link_id, color=[200, 200, 200, 60])
-            elif ":-" in str(src_attr):
-                apply_link_style(link_id, color=[255, 0, 0, 255])
-            else:
-                dpg.configure_item(link_id)
+        color = _LINK_KIND_COLORS.get(self.registry.link_kinds.get(link_id))
+        if color is not None:
+            link_theme = get_link_theme(color)
+            # The shared theme is normally still bound; only rebind if not
+            if dpg.get_item_theme(link_id) != link_theme:
+                dpg.bind_item_theme(link_id, link_theme)
 
     def _clear_link_selection(self):
         """Deselect any selected link."""
@@ -1128,13 +1164,13 @@ class NodeManager:
 
     def _on_canvas_double_click(self, sender, app_data):
         """Handle double-click on canvas."""
-        if not dpg.is_item_hovered("specula_editor"):
+        snap = self._frame_input()
+        if not snap["editor_hovered"]:
             return
 
-        for link_id in self.link_registry:
-            if dpg.is_item_hovered(link_id):
-                self._on_link_click(sender, app_data, link_id)
-                break
+        link_id = self._frame_hovered_link(snap)
+        if link_id is not None:
+            self._on_link_click(sender, app_data, link_id)
 
     def delete_selected_link(self, sender, app_data):
         """Delete selected link."""
@@ -1150,73 +1186,154 @@ class NodeManager:
 
         Throttled to at most once every ``_MOUSE_MOVE_INTERVAL`` seconds
         (default 50 ms) to avoid saturating the DPG dispatch queue with
-        O(n_links) ``dpg.is_item_hovered()`` calls at every rendered frame.
+        ``dpg.is_item_hovered()`` calls at every rendered frame.
         """
         now = time.monotonic()
         if now - self._last_mouse_move_time < self._MOUSE_MOVE_INTERVAL:
             return
         self._last_mouse_move_time = now
 
-        if not dpg.is_item_hovered("specula_editor"):
+        snap = self._frame_input()
+        if not snap["editor_hovered"]:
             return
 
-        for link_id in self.link_registry:
+        # Only the link that stops being hovered needs its style restored
+        hovered = self._frame_hovered_link(snap)
+        previous = self._hovered_link_id
+        if hovered != previous:
+            if (
+                previous is not None
+                and previous != self._selected_link_id
+                and previous in self.link_registry
+            ):
+                self._reset_link_style(previous)
+            self._hovered_link_id = hovered
+
+    def _frame_input(self) -> dict:
+        """Return this frame's input snapshot, querying DPG on the first call.
+
+        Keys: ``frame``, ``editor_hovered``, ``mouse_pos`` and, once computed by
+        ``_frame_hovered_link``, ``hovered_link_id``.
+        """
+        frame = dpg.get_frame_count()
+        snap = self._input_snapshot
+        if snap["frame"] != frame:
+            snap = self._input_snapshot = {
+                "frame": frame,
+                "editor_hovered": dpg.is_item_hovered(self._editor_id),
+                "mouse_pos": dpg.get_mouse_pos(local=False),
+            }
+        return snap
+
+    def _frame_hovered_link(self, snap: dict):
+        """Hovered link id for *snap*, computed once per frame."""
+        if "hovered_link_id" not in snap:
+            snap["hovered_link_id"] = self._hovered_link(snap["mouse_pos"])
+        link_id = snap["hovered_link_id"]
+        # The link may have been deleted earlier in this frame
+        return link_id if link_id in self.link_registry else None
+
+    def _rebuild_link_bboxes(self):
+        """Recompute the padded screen-space bounding box of every link."""
+        ids, boxes = [], []
+        for link_id, (out_pin, in_pin) in self.link_pins.items():
+            try:
+                out_state = dpg.get_item_state(out_pin)
+                in_state = dpg.get_item_state(in_pin)
+                (ax0, ay0), (ax1, ay1) = out_state["rect_min"], out_state["rect_max"]
+                (bx0, by0), (bx1, by1) = in_state["rect_min"], in_state["rect_max"]
+            except Exception:
+                continue
+            ids.append(link_id)
+            boxes.append((min(ax0, bx0), min(ay0, by0), max(ax1, bx1), max(ay1, by1)))
+
+        arr = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        # Bezier links bulge horizontally past their pins
+        arr += np.array([-40.0, -10.0, 40.0, 10.0], dtype=np.float32)
+        self._link_bbox_ids = ids
+        self._link_bbox_arr = arr
+        self._link_bbox_time = time.monotonic()
+
+    def _hovered_link(self, mouse_pos=None):
+        """Return the id of the link under the mouse, or None."""
+        if not self.link_pins:
+            return None
+        if (
+            self._link_bbox_arr is None
+            or time.monotonic() - self._link_bbox_time > self._LINK_BBOX_TTL
+        ):
+            self._rebuild_link_bboxes()
+
+        arr = self._link_bbox_arr
+        mx, my = mouse_pos if mouse_pos is not None else dpg.get_mouse_pos(local=False)
+        hits = np.flatnonzero(
+            (mx >= arr[:, 0]) & (mx <= arr[:, 2]) & (my >= arr[:, 1]) & (my <= arr[:, 3])
+        )
+        for i in hits:
+            link_id = self._link_bbox_ids[i]
             if dpg.is_item_hovered(link_id):
-                if link_id != self._selected_link_id:
-                    dpg.configure_item(link_id)
-                break
-            else:
-                if link_id != self._selected_link_id:
-                    self._reset_link_style(link_id)
+                return link_id
+        return None
 
     def delete_selection(self, *_):
         """Delete all selected nodes."""
-        for node_uuid in self.get_selected_nodes():
-            self.delete_node(node_uuid)
+        self.delete_nodes(self.get_selected_nodes())
 
     def delete_node(self, node_uuid: str):
         """Delete node and all associated links."""
-        if node_uuid not in self.uuid_to_dpg:
-            return
+        self.delete_nodes((node_uuid,))
 
-        dpg_id = self.uuid_to_dpg[node_uuid]
+    def delete_nodes(self, node_uuids):
+        """Delete several nodes and every link touching them in one pass.
 
-        links_to_remove = [
-            lid for lid, (s, _, d, _) in list(self.link_registry.items())
-            if s == node_uuid or d == node_uuid
-        ]
+        Links between two deleted nodes are collected once, and the link
+        hit-test cache is invalidated once for the whole batch.  DPG drops a
+        link together with the node owning either of its pins, so only links
+        whose other end survives are deleted explicitly.
+        """
+        uuids = {u: None for u in node_uuids if u in self.uuid_to_dpg}
+        if not uuids:
+            return
 
-        for link_id in links_to_remove:
-            if dpg.does_item_exist(link_id):
-                dpg.delete_item(link_id)
-            conn_data = self.link_registry.pop(link_id)
+        link_ids = {}
+        for node_uuid in uuids:
+            link_ids.update(dict.fromkeys(self.registry.links_of_node(node_uuid)))
+        for link_id in link_ids:
+            conn_data = self.registry.pop_link(link_id)
+            if not (conn_data[0] in uuids and conn_data[2] in uuids):
+                try:
+                    dpg.delete_item(link_id)
+                except SystemError:
+                    pass  # already gone on the DPG side
             self.graph.remove_connection(*conn_data)
-
-        for attr in [k for k, v in self.input_attr_registry.items() if v[0] == node_uuid]:
-            del self.input_attr_registry[attr]
-        for attr in [k for k, v in self.output_attr_registry.items() if v[0] == node_uuid]:
-            del self.output_attr_registry[attr]
-
-        if dpg.does_item_exist(dpg_id):
-            dpg.delete_item(dpg_id)
-
-        del self.dpg_to_uuid[dpg_id]
-        del self.uuid_to_dpg[node_uuid]
-
-        if node_uuid in self.graph.nodes:
+        self._link_bbox_arr = None
+
+        for node_uuid in uuids:
+            dpg_id = self.uuid_to_dpg.pop(node_uuid)
+            self.dpg_to_uuid.pop(dpg_id, None)
+            self.node_item_registry.pop(node_uuid, None)
+            # Pins are children of the node item; deleting it removes them in DPG
+            self.registry.pop_node_attrs(node_uuid)
+            try:
+                dpg.delete_item(dpg_id)
+            except SystemError:
+                pass
             self.graph.remove_node(node_uuid)
+            self.property_panel.forget_node(node_uuid)
 
-        self._log(f"Deleted node: {node_uuid}")
+        self._log(f"Deleted {len(uuids)} node(s): {', '.join(uuids)}")
 
     def clear_all(self):
         """Clear entire graph."""
         self.node_item_registry.clear()
         self.registry.clear()
+        self._link_bbox_arr = None
+        self.property_panel.clear_cache()
         dpg.delete_item("specula_editor", children_only=True)
 
     def get_selected_nodes(self) -> list:
         """Get UUIDs of currently selected nodes."""
-        selected_dpg_ids = dpg.get_selected_nodes("specula_editor")
+        selected_dpg_ids = dpg.get_selected_nodes(self._editor_id)
         return [
             self.dpg_to_uuid[d_id]
             for d_id in selected_dpg_ids
@@ -1226,7 +1343,9 @@ class NodeManager:
     def update_node_value(self, sender, app_data, user_data):
         """Update node parameter value."""
         node_uuid, param_name = user_data
-        self.graph.nodes[node_uuid]["values"][param_name] = app_data
+        node = self.graph.nodes.get(node_uuid)
+        if node is not None:
+            node.setdefault("values", {})[param_name] = app_data
 
     def get_connection_for_yaml(self, src_uuid, src_attr, dst_uuid, dst_attr) -> str:
         """Format connection for YAML export."""
@@ -1253,25 +1372,19 @@ class NodeManager:
             attribute_type=dpg.mvNode_Attr_Input, parent=parent, shape=REF_SHAPE_EMPTY
         ) as attr_id:
             dpg.add_text("source_dict_ref", color=[150, 255, 150])
-            self.input_attr_registry[attr_id] = (node_uuid, "source_dict_ref")
+            self.registry.add_input_attr(attr_id, node_uuid, "source_dict_ref")
 
-        with dpg.node_attribute(
-            attribute_type=dpg.mvNode_Attr_Output, parent=parent
-        ) as attr_id:
-            with dpg.group(horizontal=True):
-                dpg.add_spacer(width=output_spacer_w)
-                dpg.add_text("output", color=[255, 200, 100])
-            self.output_attr_registry[attr_id] = (node_uuid, "output")
+        self._add_output_pin(
+            node_uuid, "output", shape=DATA_MULTIPLE_SHAPE_FILLED, color=[255, 200, 100],
+            parent=parent, spacer_w=output_spacer_w,
+        )
 
     def add_data_output(self, node_uuid: str):
         """Add data output pin."""
         parent = self.uuid_to_dpg[node_uuid]
         output_spacer_w = render_scale.node_output_spacer_width()
 
-        with dpg.node_attribute(
-            attribute_type=dpg.mvNode_Attr_Output, parent=parent
-        ) as attr_id:
-            with dpg.group(horizontal=True):
-                dpg.add_spacer(width=output_spacer_w)
-                dpg.add_text("Output: ref")
-            self.output_attr_registry[attr_id] = (node_uuid, "ref")
+        self._add_output_pin(
+            node_uuid, "ref", "Output: ref", shape=DATA_MULTIPLE_SHAPE_FILLED,
+            parent=parent, spacer_w=output_spacer_w,
+        )
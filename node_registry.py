@@ -1,6 +1,20 @@
 from dataclasses import dataclass, field
 
 
+def link_kind(src_attr: str, dst_attr: str) -> str:
+    """Classify a link for styling: ``"ref"``, ``"feedback"`` or ``"normal"``."""
+    if dst_attr.endswith("_ref") or "params" in dst_attr.lower():
+        return "ref"
+    if ":-" in str(src_attr):
+        return "feedback"
+    return "normal"
+
+
+def is_ref_input_name(name: str) -> bool:
+    """True for input pins that carry a node reference rather than data."""
+    return name.endswith("_ref") or name == "layer_list"
+
+
 @dataclass
 class NodeRegistry:
     """
@@ -26,10 +40,143 @@ class NodeRegistry:
     # DPG link id  ->  (src_uuid, src_attr, dst_uuid, dst_attr)
     link_registry: dict = field(default_factory=dict)
 
+    # DPG link id  ->  (output attribute id, input attribute id)
+    link_pins: dict = field(default_factory=dict)
+
+    # DPG link id  ->  link_kind() of the link, computed once in add_link
+    link_kinds: dict = field(default_factory=dict)
+
+    # Inverse indexes of link_registry, maintained by add_link / pop_link:
+    # (src_uuid, src_attr, dst_uuid, dst_attr)  ->  DPG link id
+    conn_to_link: dict = field(default_factory=dict)
+    # uuid string  ->  {DPG link id: None} for links touching that node
+    node_links: dict = field(default_factory=dict)
+
+    # uuid string  ->  {DPG attribute id: None} for that node's input and
+    # output pins, maintained by add_input_attr / add_output_attr
+    node_attrs: dict = field(default_factory=dict)
+
+    # (uuid, attribute_name)  ->  DPG attribute id of the first pin registered
+    # under that name; inverse of input_attr_registry / output_attr_registry
+    input_pins: dict = field(default_factory=dict)
+    output_pins: dict = field(default_factory=dict)
+
+    # DPG attribute id  ->  None for input pins that take a reference,
+    # decided once at registration instead of re-parsing the name per event
+    ref_input_attrs: dict = field(default_factory=dict)
+
+    def add_input_attr(self, attr_id, node_uuid: str, name: str, is_ref=None):
+        """Register input pin *attr_id* of *node_uuid* named *name*.
+
+        *is_ref* comes from the template when the caller knows it; otherwise
+        it is derived from the pin name with is_ref_input_name().
+        """
+        self.input_attr_registry[attr_id] = (node_uuid, name)
+        if is_ref is None:
+            is_ref = is_ref_input_name(name)
+        if is_ref:
+            self.ref_input_attrs[attr_id] = None
+        self.input_pins.setdefault((node_uuid, name), attr_id)
+        self.node_attrs.setdefault(node_uuid, {})[attr_id] = None
+
+    def add_output_attr(self, attr_id, node_uuid: str, name: str):
+        """Register output pin *attr_id* of *node_uuid* named *name*."""
+        self.output_attr_registry[attr_id] = (node_uuid, name)
+        self.output_pins.setdefault((node_uuid, name), attr_id)
+        self.node_attrs.setdefault(node_uuid, {})[attr_id] = None
+
+    def input_pin(self, node_uuid: str, name: str):
+        """Return the DPG id of input pin *name* on *node_uuid*, or None."""
+        return self.input_pins.get((node_uuid, name))
+
+    def output_pin(self, node_uuid: str, name: str):
+        """Return the DPG id of output pin *name* on *node_uuid*, or None."""
+        return self.output_pins.get((node_uuid, name))
+
+    def is_ref_input(self, attr_id) -> bool:
+        """True if *attr_id* is a reference input pin."""
+        return attr_id in self.ref_input_attrs
+
+    def remove_attr(self, attr_id):
+        """Unregister a single input or output pin (no-op if unknown)."""
+        registry, pins = self.input_attr_registry, self.input_pins
+        entry = registry.pop(attr_id, None)
+        self.ref_input_attrs.pop(attr_id, None)
+        if entry is None:
+            registry, pins = self.output_attr_registry, self.output_pins
+            entry = registry.pop(attr_id, None)
+        if entry is None:
+            return
+        node_uuid = entry[0]
+        attrs = self.node_attrs.get(node_uuid)
+        if attrs is not None:
+            attrs.pop(attr_id, None)
+            if not attrs:
+                del self.node_attrs[node_uuid]
+        if pins.get(entry) == attr_id:
+            del pins[entry]
+            # Fall back to another pin of the same name, if the node has one
+            for other in attrs or ():
+                if registry.get(other) == entry:
+                    pins[entry] = other
+                    break
+
+    def pop_node_attrs(self, node_uuid: str) -> list:
+        """Unregister every pin of *node_uuid* and return their attribute ids."""
+        attr_ids = list(self.node_attrs.pop(node_uuid, ()))
+        for attr_id in attr_ids:
+            entry = self.input_attr_registry.pop(attr_id, None)
+            if entry is not None:
+                self.input_pins.pop(entry, None)
+                self.ref_input_attrs.pop(attr_id, None)
+                continue
+            entry = self.output_attr_registry.pop(attr_id, None)
+            if entry is not None:
+                self.output_pins.pop(entry, None)
+        return attr_ids
+
+    def add_link(self, link_id, conn: tuple, pins: tuple):
+        """Register *link_id* for connection *conn* drawn between *pins*."""
+        self.link_registry[link_id] = conn
+        self.link_pins[link_id] = pins
+        self.link_kinds[link_id] = link_kind(conn[1], conn[3])
+        self.conn_to_link[conn] = link_id
+        self.node_links.setdefault(conn[0], {})[link_id] = None
+        self.node_links.setdefault(conn[2], {})[link_id] = None
+
+    def pop_link(self, link_id):
+        """Unregister *link_id* and return its connection tuple (None if unknown)."""
+        conn = self.link_registry.pop(link_id, None)
+        if conn is None:
+            return None
+        self.link_pins.pop(link_id, None)
+        self.link_kinds.pop(link_id, None)
+        if self.conn_to_link.get(conn) == link_id:
+            del self.conn_to_link[conn]
+        for node_uuid in (conn[0], conn[2]):
+            links = self.node_links.get(node_uuid)
+            if links is not None:
+                links.pop(link_id, None)
+                if not links:
+                    del self.node_links[node_uuid]
+        return conn
+
+    def links_of_node(self, node_uuid: str) -> list:
+        """Return the ids of all links whose source or destination is *node_uuid*."""
+        return list(self.node_links.get(node_uuid, ()))
+
     def clear(self):
-        """Clear all five registries (called by NodeManager.clear_all)."""
+        """Clear all registries (called by NodeManager.clear_all)."""
         self.dpg_to_uuid.clear()
         self.uuid_to_dpg.clear()
         self.input_attr_registry.clear()
         self.output_attr_registry.clear()
         self.link_registry.clear()
+        self.link_pins.clear()
+        self.link_kinds.clear()
+        self.conn_to_link.clear()
+        self.node_links.clear()
+        self.node_attrs.clear()
+        self.input_pins.clear()
+        self.output_pins.clear()
+        self.ref_input_attrs.clear()
@@ -13,16 +13,59 @@ Responsibilities
 
 import ast
 import os
+import re
+import sys
+from collections import OrderedDict
+from types import MappingProxyType
 
 import numpy as np
 import dearpygui.dearpygui as dpg
 
+from constants import MAX_CACHED_PANELS
 from dpg_utils import apply_link_style
-
-
-# Colour constants (kept local to avoid polluting the global namespace)
-_DEFAULT_PARAM_COLOR = [110, 110, 110]
-_MODIFIED_PARAM_COLOR = [240, 240, 240]
+from graph_manager import filename_key
+from node_registry import is_ref_input_name
+
+
+# Colour constants (kept local to avoid polluting the global namespace).
+# Tuples, shared by every widget, so a form rebuild allocates no colour lists.
+_DEFAULT_PARAM_COLOR = (110, 110, 110)
+_MODIFIED_PARAM_COLOR = (240, 240, 240)
+_MISSING_COLOR = (255, 100, 100)       # unset REQUIRED parameter, feedback delay
+_TITLE_COLOR = (100, 200, 255)         # panel titles
+_SECTION_COLOR = (200, 150, 255)       # connection section headers
+_SUBSECTION_COLOR = (255, 200, 100)    # data / reference / output groups
+_ACCENT_COLOR = (255, 150, 100)        # monitor header, feedback note
+_WHITE = (255, 255, 255)
+_LABEL_COLOR = (200, 200, 200)         # row labels
+_MUTED_COLOR = (150, 150, 150)         # hints and inactive states
+_NAME_COLOR = (150, 255, 150)          # node / attribute names
+_REF_COLOR = (100, 255, 100)           # connected references
+_REF_PARAM_COLOR = (255, 200, 150)     # unconnected reference parameters
+_DATA_OBJECT_COLOR = (150, 200, 255)   # data-object parameters
+_DATA_VALUE_COLOR = (200, 200, 150)
+_CONN_TYPE_COLOR = (200, 200, 255)
+_ACTIVE_COLOR = (0, 255, 0)
+
+# Substrings that mark a type hint as a Specula data-object class
+_DATA_TYPE_KEYWORDS = ("Matrix", "Vector", "Atmosphere", "Telescope", "Detector", "Field")
+_DATA_TYPE_KEYWORDS_RE = re.compile("|".join(_DATA_TYPE_KEYWORDS))
+
+# Template type hint (and its aliases) -> scalar widget used to edit it;
+# any other hint falls through to the list / text widgets
+_SCALAR_WIDGETS = MappingProxyType({
+    "bool": "bool", "boolean": "bool",
+    "int": "int", "integer": "int",
+    "float": "float", "double": "float", "number": "float",
+})
+
+# Widgets that consume typed keys (see PropertyPanel.text_entry_active)
+_TEXT_ENTRY_TYPES = frozenset({
+    "mvAppItemType::mvInputText",
+    "mvAppItemType::mvInputInt",
+    "mvAppItemType::mvInputFloat",
+    "mvAppItemType::mvInputDouble",
+})
 
 
 class PropertyPanel:
@@ -54,17 +97,205 @@ class PropertyPanel:
         self._delink_callback = delink_callback
         self._refresh_node_theme = refresh_node_theme
 
+        # Per-node form cache: node_uuid -> (group id, signature).  Each node
+        # form lives in its own group inside the panel and is only shown or
+        # hidden on selection change; it is rebuilt when its signature changes.
+        self._node_forms: OrderedDict = OrderedDict()
+        # The one cached form currently visible (None if none), so a
+        # selection change hides a single group instead of all of them
+        self._shown_form = None
+        self._conn_form = None
+        # Nodes whose form is stale for reasons _form_signature cannot see
+        # (e.g. values replaced by a file load); rebuilt on next show
+        self._dirty_forms: set = set()
+
+        # node_type -> per-parameter render plan (see _param_plan); the
+        # classification depends only on the template, so it is shared by
+        # every node of the same class.
+        self._param_plans: dict = {}
+        # node_type -> (sorted tuple, frozenset) of the template's output names
+        self._template_outputs: dict = {}
+
+        # type hint -> is_data_class_type() result; hints come from a fixed
+        # set of templates, so the cache stays small
+        self._data_type_cache: dict = {}
+
+        # node_uuid -> {param_name: (label id, default, is_required)} for plain
+        # value rows, so an edit recolours its label in place instead of the
+        # form being rebuilt
+        self._param_labels: dict = {}
+
     # ------------------------------------------------------------------
     # Public entry points
     # ------------------------------------------------------------------
 
+    def show_node_panel(self, node_uuid: str, panel_tag: str):
+        """Show the inspector for *node_uuid*, reusing its cached form when still valid."""
+        if not dpg.is_item_shown(panel_tag):
+            # Nothing to draw into: defer the rebuild until the panel is shown
+            # again (NodeManager._show_property_panel calls back in here).
+            self._dirty_forms.add(node_uuid)
+            return
+        cached = self._node_forms.get(node_uuid)
+        if (
+            cached
+            and node_uuid not in self._dirty_forms
+            and dpg.does_item_exist(cached[0])
+            and cached[1] == self._form_signature(node_uuid)
+        ):
+            if cached[0] == self._shown_form:
+                return
+            self.hide_forms()
+            dpg.show_item(cached[0])
+            self._shown_form = cached[0]
+            self._node_forms.move_to_end(node_uuid)
+            return
+        self.update_node_panel(node_uuid, panel_tag)
+
     def update_node_panel(self, node_uuid: str, panel_tag: str):
         """Render the full property inspector for *node_uuid* into *panel_tag*."""
-        dpg.delete_item(panel_tag, children_only=True)
+        self.forget_node(node_uuid)
+        self.hide_forms()
 
         if node_uuid not in self.graph.nodes:
             return
 
+        form = dpg.add_group(parent=panel_tag)
+        self._shown_form = form
+        self._node_forms[node_uuid] = (form, self._form_signature(node_uuid))
+        while len(self._node_forms) > MAX_CACHED_PANELS:
+            old_uuid, (old_form, _) = self._node_forms.popitem(last=False)
+            self._param_labels.pop(old_uuid, None)
+            if dpg.does_item_exist(old_form):
+                dpg.delete_item(old_form)
+
+        self._render_node_form(node_uuid, form)
+
+    def hide_forms(self):
+        """Hide the visible node form and drop the connection form."""
+        form = self._shown_form
+        self._shown_form = None
+        if form is not None and dpg.does_item_exist(form):
+            dpg.hide_item(form)
+        if self._conn_form is not None and dpg.does_item_exist(self._conn_form):
+            dpg.delete_item(self._conn_form)
+        self._conn_form = None
+
+    def text_entry_active(self) -> bool:
+        """True while an input widget of the visible node or connection form is being edited.
+
+        DPG's get_focused_item() reports the focused window, not the widget
+        inside it, so the forms are walked for an *active* input instead.
+        """
+        stack = [f for f in (self._shown_form, self._conn_form) if f is not None]
+        while stack:
+            item = stack.pop()
+            if not dpg.does_item_exist(item):
+                continue
+            if dpg.get_item_type(item) in _TEXT_ENTRY_TYPES:
+                if dpg.is_item_active(item):
+                    return True
+                continue
+            stack.extend(dpg.get_item_children(item, slot=1) or ())
+        return False
+
+    def mark_dirty(self, node_uuid: str):
+        """Force the next show of *node_uuid* to rebuild its form."""
+        self._dirty_forms.add(node_uuid)
+
+    def forget_node(self, node_uuid: str):
+        """Delete the cached form of *node_uuid* (e.g. when the node is removed)."""
+        cached = self._node_forms.pop(node_uuid, None)
+        self._param_labels.pop(node_uuid, None)
+        self._dirty_forms.discard(node_uuid)
+        if cached:
+            if cached[0] == self._shown_form:
+                self._shown_form = None
+            if dpg.does_item_exist(cached[0]):
+                dpg.delete_item(cached[0])
+
+    def clear_cache(self):
+        """Delete all cached forms."""
+        for node_uuid in list(self._node_forms):
+            self.forget_node(node_uuid)
+        self.hide_forms()
+
+    def _form_signature(self, node_uuid: str):
+        """Everything a node form shows that can change without the panel being told."""
+        nodes = self.graph.nodes
+        node_data = nodes.get(node_uuid, {})
+        links = tuple(self.graph.connections_to(node_uuid)) + tuple(
+            self.graph.connections_from(node_uuid)
+        )
+        peer_names = tuple(
+            nodes.get(u, {}).get("name") for conn in links for u in (conn[0], conn[2])
+        )
+        return (
+            node_data.get("name"),
+            links,
+            peer_names,
+            self.monitors.open_outputs_for(node_uuid),
+        )
+
+    def _param_plan(self, node_type: str, template_params: dict) -> tuple:
+        """Return the cached per-parameter rendering decisions for *node_type*.
+
+        Each entry is ``(param_name, is_ref_param, is_required, type_hint,
+        default_val, ref_keys, param_kind, is_data_type, label)``; *label* is
+        the row's ``"name:"`` text, formatted once here instead of per rebuild.
+        """
+        plan = self._param_plans.get(node_type)
+        if plan is not None:
+            return plan
+
+        entries = []
+        for param_name, meta in template_params.items():
+            is_ref_param = False
+            if isinstance(meta, dict):
+                if meta.get("kind") == "reference":
+                    is_ref_param = True
+                elif "type" in meta and self.is_data_class_type(meta["type"]):
+                    is_ref_param = True
+            elif isinstance(meta, str):
+                if self.is_data_class_type(meta):
+                    is_ref_param = True
+                elif "ref" in meta.lower() or "reference" in meta.lower():
+                    is_ref_param = True
+
+            is_dict = isinstance(meta, dict)
+            default_val = meta.get("default") if is_dict else None
+            is_required = is_dict and (
+                default_val == "REQUIRED" or bool(meta.get("required", False))
+            )
+            type_hint = (meta.get("type", "str") if is_dict else "str") or "str"
+            param_kind = meta.get("kind", "value") if is_dict else "value"
+            ref_keys = (
+                f"{param_name}_ref",
+                param_name,
+                f"{param_name}Ref",
+                f"{param_name}ref",
+            )
+            entries.append((
+                param_name, is_ref_param, is_required, type_hint, default_val, ref_keys,
+                param_kind, self.is_data_class_type(type_hint),
+                f"{ref_keys[0] if is_ref_param else param_name}:",
+            ))
+
+        plan = self._param_plans[node_type] = tuple(entries)
+        return plan
+
+    def _sorted_template_outputs(self, node_type: str, template: dict) -> tuple:
+        """Return ``(sorted names, name set)`` of *node_type*'s template outputs."""
+        cached = self._template_outputs.get(node_type)
+        if cached is None:
+            names = frozenset(
+                out for out in template.get("outputs", ()) if isinstance(out, str)
+            )
+            cached = self._template_outputs[node_type] = (tuple(sorted(names)), names)
+        return cached
+
+    def _render_node_form(self, node_uuid: str, panel_tag):
+        """Populate *panel_tag* with the inspector widgets for *node_uuid*."""
         node_data = self.graph.nodes[node_uuid]
         node_type = node_data["type"]
         node_name = node_data.get("name", node_type)
@@ -75,48 +306,31 @@ class PropertyPanel:
         suffixes = node_data.get("suffixes", set())
 
         # --- 1. Editable name field ------------------------------------------
-        dpg.add_text("Node Configuration", color=[100, 200, 255], parent=panel_tag)
+        dpg.add_text("Node Configuration", color=_TITLE_COLOR, parent=panel_tag)
         with dpg.group(horizontal=True, parent=panel_tag):
-            dpg.add_text("Instance Name:", color=[255, 255, 255])
+            dpg.add_text("Instance Name:", color=_WHITE)
             dpg.add_input_text(
                 default_value=node_name,
                 width=150,
                 callback=self._update_node_name,
                 user_data=node_uuid,
             )
-        dpg.add_text(f"Class: {node_type}", color=[150, 150, 150], parent=panel_tag)
+        dpg.add_text(f"Class: {node_type}", color=_MUTED_COLOR, parent=panel_tag)
         dpg.add_separator(parent=panel_tag)
 
-        rendered_params: set = set()
-
         # --- 2. Parameters section -------------------------------------------
         if template_params:
             dpg.add_spacer(height=10, parent=panel_tag)
-            dpg.add_text("Parameters", color=[100, 255, 100], parent=panel_tag)
+            dpg.add_text("Parameters", color=_REF_COLOR, parent=panel_tag)
             dpg.add_separator(parent=panel_tag)
 
-            for param_name, meta in template_params.items():
-                is_ref_param = False
-                if isinstance(meta, dict):
-                    if meta.get("kind") == "reference":
-                        is_ref_param = True
-                    elif "type" in meta and self.is_data_class_type(meta["type"]):
-                        is_ref_param = True
-                elif isinstance(meta, str):
-                    if self.is_data_class_type(meta):
-                        is_ref_param = True
-                    elif "ref" in meta.lower() or "reference" in meta.lower():
-                        is_ref_param = True
-
+            for (
+                param_name, is_ref_param, is_required, type_hint, default_val, ref_keys,
+                param_kind, is_data_type, label,
+            ) in self._param_plan(node_type, template_params):
                 if is_ref_param:
-                    possible_keys = [
-                        f"{param_name}_ref",
-                        param_name,
-                        f"{param_name}Ref",
-                        f"{param_name}ref",
-                    ]
                     connected_value = None
-                    for key in possible_keys:
+                    for key in ref_keys:
                         if key in current_values:
                             connected_value = current_values[key]
                             break
@@ -124,8 +338,8 @@ class PropertyPanel:
                     display_name = f"{param_name}_ref"
                     if connected_value:
                         with dpg.group(horizontal=True, parent=panel_tag):
-                            dpg.add_text(f"{display_name}:", color=[150, 255, 150])
-                            dpg.add_text(f"{connected_value}", color=[100, 255, 100])
+                            dpg.add_text(label, color=_NAME_COLOR)
+                            dpg.add_text(f"{connected_value}", color=_REF_COLOR)
                             dpg.add_button(
                                 label="X",
                                 callback=self._disconnect_reference,
@@ -133,66 +347,47 @@ class PropertyPanel:
                                 width=20,
                                 height=20,
                             )
+                    elif is_required:
+                        with dpg.group(horizontal=True, parent=panel_tag):
+                            dpg.add_text(label, color=_REF_PARAM_COLOR)
+                            dpg.add_text(
+                                "REQUIRED (connect via link)",
+                                color=_MISSING_COLOR,
+                            )
                     else:
-                        is_required = False
-                        if isinstance(meta, dict):
-                            if (
-                                meta.get("default") == "REQUIRED"
-                                or meta.get("required", False)
-                            ):
-                                is_required = True
-                        if is_required:
-                            with dpg.group(horizontal=True, parent=panel_tag):
-                                dpg.add_text(
-                                    f"{display_name}:", color=[255, 200, 150]
-                                )
-                                dpg.add_text(
-                                    "REQUIRED (connect via link)",
-                                    color=[255, 100, 100],
-                                )
-                        else:
-                            with dpg.group(horizontal=True, parent=panel_tag):
-                                dpg.add_text(
-                                    f"{display_name}:", color=[200, 200, 200]
-                                )
-                                dpg.add_text("(optional)", color=[150, 150, 150])
+                        with dpg.group(horizontal=True, parent=panel_tag):
+                            dpg.add_text(label, color=_LABEL_COLOR)
+                            dpg.add_text("(optional)", color=_MUTED_COLOR)
 
-                    rendered_params.add(param_name)
                     continue
 
                 # Regular (non-reference) parameter ----------------------------
                 val = current_values.get(param_name)
                 if val is None and param_name in suffixes:
                     val = current_values.get(f"{param_name}_object")
-                default_val = meta.get("default") if isinstance(meta, dict) else None
                 if val is None and default_val == "REQUIRED":
                     val = ""
-                type_hint = (
-                    meta.get("type", "str") if isinstance(meta, dict) else "str"
-                )
-                if type_hint is None:
-                    type_hint = "str"
-                default_val = meta.get("default") if isinstance(meta, dict) else None
 
                 self._render_single_widget(
-                    panel_tag, node_uuid, param_name, val, type_hint, default_val
+                    panel_tag, node_uuid, param_name, val, type_hint, default_val,
+                    param_kind, is_data_type, label,
                 )
-                rendered_params.add(param_name)
 
         # --- 3. Data object parameters (non-reference) -----------------------
+        # Every template parameter was rendered above; only the extra suffix
+        # keys not in the template remain (rare, sorted for a stable layout).
         data_object_params = []
-        for param_name in suffixes:
-            if param_name not in rendered_params:
-                val = current_values.get(param_name) or current_values.get(
-                    f"{param_name}_object"
-                )
-                if val is not None:
-                    data_object_params.append((param_name, val))
+        for param_name in sorted(set(suffixes).difference(template_params)):
+            val = current_values.get(param_name) or current_values.get(
+                f"{param_name}_object"
+            )
+            if val is not None:
+                data_object_params.append((param_name, val))
 
         if data_object_params:
             dpg.add_spacer(height=10, parent=panel_tag)
             dpg.add_text(
-                "Data Object Parameters", color=[150, 200, 255], parent=panel_tag
+                "Data Object Parameters", color=_DATA_OBJECT_COLOR, parent=panel_tag
             )
             dpg.add_separator(parent=panel_tag)
             for param_name, val in data_object_params:
@@ -206,7 +401,7 @@ class PropertyPanel:
 
                 if is_data_class:
                     with dpg.group(horizontal=True, parent=panel_tag):
-                        dpg.add_text(f"{param_name}:", color=[150, 200, 255])
+                        dpg.add_text(f"{param_name}:", color=_DATA_OBJECT_COLOR)
                         input_tag = f"{node_uuid}_{param_name}_object"
                         # Attach a stable tag so the file dialog can set the widget value
                         dpg.add_input_text(
@@ -225,155 +420,152 @@ class PropertyPanel:
                         )
                 else:
                     with dpg.group(horizontal=True, parent=panel_tag):
-                        dpg.add_text(f"{param_name}:", color=[200, 200, 200])
-                        dpg.add_text(str(val), color=[200, 200, 150])
-                    rendered_params.add(param_name)
+                        dpg.add_text(f"{param_name}:", color=_LABEL_COLOR)
+                        dpg.add_text(str(val), color=_DATA_VALUE_COLOR)
 
         # --- 4. Connections section ------------------------------------------
-        incoming, outgoing = self.get_connections_for_node(node_uuid)
-        regular_inputs = [
-            c
-            for c in incoming
-            if not (
-                c["dst_attr"].endswith("_ref") or c["dst_attr"] == "layer_list"
+        # Split straight off the adjacency index into (src_uuid, src_attr,
+        # dst_attr, src_name) rows.  Whether an input takes a reference was
+        # decided from the template when its pin was registered, so the
+        # registry flag is reused instead of re-deriving it from the name.
+        nodes = self.graph.nodes
+        registry = self.registry
+        regular_inputs = []
+        reference_inputs = []
+        for src_u, src_attr, _, dst_attr in self.graph.connections_to(node_uuid):
+            pin = registry.input_pin(node_uuid, dst_attr)
+            is_ref = (
+                registry.is_ref_input(pin) if pin is not None
+                else is_ref_input_name(dst_attr)
             )
-        ]
-        reference_inputs = [
-            c
-            for c in incoming
-            if c["dst_attr"].endswith("_ref") or c["dst_attr"] == "layer_list"
+            (reference_inputs if is_ref else regular_inputs).append(
+                (src_u, src_attr, dst_attr, nodes[src_u].get("name", "unknown"))
+            )
+        outgoing = [
+            (src_attr, dst_attr, nodes[dst_u].get("name", "unknown"))
+            for _, src_attr, dst_u, dst_attr in self.graph.connections_from(node_uuid)
         ]
 
         if regular_inputs:
             dpg.add_spacer(height=10, parent=panel_tag)
-            dpg.add_text("Input Connections", color=[200, 150, 255], parent=panel_tag)
+            dpg.add_text("Input Connections", color=_SECTION_COLOR, parent=panel_tag)
             dpg.add_separator(parent=panel_tag)
-            dpg.add_text("Data Inputs:", color=[255, 200, 100], parent=panel_tag)
-            for conn in regular_inputs:
-                src_name = conn["src_name"]
-                src_attr = conn["src_attr"]
-                dst_attr = conn["dst_attr"]
+            dpg.add_text("Data Inputs:", color=_SUBSECTION_COLOR, parent=panel_tag)
+            for src_u, src_attr, dst_attr, src_name in regular_inputs:
                 if dst_attr == "input_list":
                     filename = self.get_connection_filename(
-                        node_uuid, conn["src_node"], src_attr
+                        node_uuid, src_u, src_attr
                     )
                     with dpg.group(horizontal=True, parent=panel_tag):
-                        dpg.add_text(f"  + {dst_attr}: ", color=[200, 200, 200])
+                        dpg.add_text(f"  + {dst_attr}: ", color=_LABEL_COLOR)
                         dpg.add_text(
                             f"{filename}-{src_name}.{src_attr}",
-                            color=[150, 255, 150],
+                            color=_NAME_COLOR,
                         )
                     with dpg.group(horizontal=True, parent=panel_tag):
-                        dpg.add_text("    Filename: ", color=[200, 200, 200])
+                        dpg.add_text("    Filename: ", color=_LABEL_COLOR)
                         dpg.add_input_text(
                             default_value=filename,
                             width=100,
                             callback=self._update_connection_filename,
-                            user_data=(node_uuid, conn["src_node"], src_attr),
+                            user_data=(node_uuid, src_u, src_attr),
                         )
                 else:
                     with dpg.group(horizontal=True, parent=panel_tag):
-                        dpg.add_text(f"  + {dst_attr}: ", color=[200, 200, 200])
+                        dpg.add_text(f"  + {dst_attr}: ", color=_LABEL_COLOR)
                         dpg.add_text(
-                            f"{src_name}.{src_attr}", color=[150, 255, 150]
+                            f"{src_name}.{src_attr}", color=_NAME_COLOR
                         )
 
         if reference_inputs:
             if not regular_inputs:
                 dpg.add_spacer(height=10, parent=panel_tag)
                 dpg.add_text(
-                    "Connections", color=[200, 150, 255], parent=panel_tag
+                    "Connections", color=_SECTION_COLOR, parent=panel_tag
                 )
                 dpg.add_separator(parent=panel_tag)
             dpg.add_text(
-                "Reference Connections:", color=[255, 200, 100], parent=panel_tag
+                "Reference Connections:", color=_SUBSECTION_COLOR, parent=panel_tag
             )
-            for conn in reference_inputs:
-                src_name = conn["src_name"]
-                src_attr = conn["src_attr"]
-                dst_attr = conn["dst_attr"]
+            for _, src_attr, dst_attr, src_name in reference_inputs:
                 with dpg.group(horizontal=True, parent=panel_tag):
-                    dpg.add_text(f"  + {dst_attr}: ", color=[200, 200, 200])
+                    dpg.add_text(f"  + {dst_attr}: ", color=_LABEL_COLOR)
                     if src_attr == "ref":
-                        dpg.add_text(f"{src_name}", color=[100, 255, 100])
+                        dpg.add_text(f"{src_name}", color=_REF_COLOR)
                     else:
                         dpg.add_text(
-                            f"{src_name}.{src_attr}", color=[100, 255, 100]
+                            f"{src_name}.{src_attr}", color=_REF_COLOR
                         )
 
         if outgoing:
             if not regular_inputs and not reference_inputs:
                 dpg.add_spacer(height=10, parent=panel_tag)
                 dpg.add_text(
-                    "Connections", color=[200, 150, 255], parent=panel_tag
+                    "Connections", color=_SECTION_COLOR, parent=panel_tag
                 )
                 dpg.add_separator(parent=panel_tag)
-            dpg.add_text("Outputs:", color=[255, 200, 100], parent=panel_tag)
-            for conn in outgoing:
-                dst_name = conn["dst_name"]
-                src_attr = conn["src_attr"]
-                dst_attr = conn["dst_attr"]
+            dpg.add_text("Outputs:", color=_SUBSECTION_COLOR, parent=panel_tag)
+            for src_attr, dst_attr, dst_name in outgoing:
                 with dpg.group(horizontal=True, parent=panel_tag):
-                    dpg.add_text(f"  + {src_attr} -> ", color=[200, 200, 200])
+                    dpg.add_text(f"  + {src_attr} -> ", color=_LABEL_COLOR)
                     dpg.add_text(
-                        f"{dst_name}.{dst_attr}", color=[150, 255, 150]
+                        f"{dst_name}.{dst_attr}", color=_NAME_COLOR
                     )
 
-        if not incoming and not outgoing:
+        if not regular_inputs and not reference_inputs and not outgoing:
             dpg.add_spacer(height=10, parent=panel_tag)
-            dpg.add_text("Connections", color=[200, 150, 255], parent=panel_tag)
+            dpg.add_text("Connections", color=_SECTION_COLOR, parent=panel_tag)
             dpg.add_separator(parent=panel_tag)
-            dpg.add_text("No connections", color=[150, 150, 150], parent=panel_tag)
+            dpg.add_text("No connections", color=_MUTED_COLOR, parent=panel_tag)
 
         dpg.add_spacer(height=10, parent=panel_tag)
 
         # --- 5. Output monitors section --------------------------------------
-        all_outputs: list = []
-        for out in template.get("outputs", []):
-            if isinstance(out, str) and out not in all_outputs:
-                all_outputs.append(out)
-        for out in node_data.get("outputs_extra", []):
-            if isinstance(out, str) and out not in all_outputs:
-                all_outputs.append(out)
-        for attr_id, (uid, name) in self.registry.output_attr_registry.items():
-            if uid == node_uuid and name not in all_outputs:
-                all_outputs.append(name)
+        # Usually every output (dynamic pins included) is a template output,
+        # so the sorted tuple cached per node type is reused as is.
+        all_outputs, template_outputs = self._sorted_template_outputs(node_type, template)
+        extra_outputs = {
+            out for out in node_data.get("outputs_extra", ())
+            if isinstance(out, str) and out not in template_outputs
+        }
+        output_attrs = self.registry.output_attr_registry
+        for attr_id in self.registry.node_attrs.get(node_uuid, ()):
+            entry = output_attrs.get(attr_id)
+            if entry is not None and entry[1] not in template_outputs:
+                extra_outputs.add(entry[1])
+        if extra_outputs:
+            all_outputs = sorted(template_outputs.union(extra_outputs))
 
         if all_outputs:
             dpg.add_spacer(height=10, parent=panel_tag)
-            dpg.add_text("Output Monitors", color=[255, 150, 100], parent=panel_tag)
+            dpg.add_text("Output Monitors", color=_ACCENT_COLOR, parent=panel_tag)
             dpg.add_separator(parent=panel_tag)
 
-            for output_name in sorted(all_outputs):
-                # Use the MonitorManager helpers so both subprocess and
-                # in-process monitors are reflected correctly.
-                is_open = self.monitors.is_monitor_open(node_uuid, output_name)
+            # One MonitorManager snapshot (subprocess and in-process
+            # monitors alike) instead of two lookups per output.
+            open_monitors = self.monitors.open_monitors_for(node_uuid)
+
+            for output_name in all_outputs:
+                monitor_id = open_monitors.get(output_name)
 
                 with dpg.group(horizontal=True, parent=panel_tag):
-                    dpg.add_text(f"  + {output_name}: ", color=[200, 200, 200])
-                    if not is_open:
+                    dpg.add_text(f"  + {output_name}: ", color=_LABEL_COLOR)
+                    if monitor_id is None:
                         dpg.add_button(
                             label="Open Monitor",
                             callback=self.monitors.open_monitor,
                             user_data=(node_uuid, output_name),
                             width=120,
                         )
-                        dpg.add_text("- Inactive", color=[150, 150, 150])
+                        dpg.add_text("- Inactive", color=_MUTED_COLOR)
                     else:
-                        monitor_id = self.monitors.find_monitor_id(node_uuid, output_name)
-                        if monitor_id:
-                            def _close_wrapper(sender, app_data, user_data):
-                                self.monitors.close_monitor(
-                                    user_data, from_window_close=False
-                                )
-
-                            dpg.add_button(
-                                label="Close Monitor",
-                                callback=_close_wrapper,
-                                user_data=monitor_id,
-                                width=120,
-                            )
-                            dpg.add_text("+ Active", color=[0, 255, 0])
+                        dpg.add_button(
+                            label="Close Monitor",
+                            callback=self._close_monitor_callback,
+                            user_data=monitor_id,
+                            width=120,
+                        )
+                        dpg.add_text("+ Active", color=_ACTIVE_COLOR)
 
             dpg.add_spacer(height=5, parent=panel_tag)
 
@@ -381,12 +573,18 @@ class PropertyPanel:
 
     def update_connection_panel(self, link_id, panel_tag: str):
         """Render connection properties (delay, type) for *link_id*."""
-        dpg.delete_item(panel_tag, children_only=True)
+        self.hide_forms()
 
         if link_id not in self.registry.link_registry:
             print(f"[PANEL] Link {link_id} not in registry")
             return
 
+        self._conn_form = dpg.add_group(parent=panel_tag)
+        self._render_connection_form(link_id, self._conn_form)
+
+    def _render_connection_form(self, link_id, panel_tag):
+        """Populate *panel_tag* with the connection widgets for *link_id*."""
+
         src_uuid, src_attr, dst_uuid, dst_attr = self.registry.link_registry[link_id]
         src_node = self.graph.nodes.get(src_uuid, {})
         dst_node = self.graph.nodes.get(dst_uuid, {})
@@ -399,31 +597,31 @@ class PropertyPanel:
         current_delay = conn_props.get("delay", 0)
 
         dpg.add_text(
-            "Connection Properties", color=[100, 200, 255], parent=panel_tag
+            "Connection Properties", color=_TITLE_COLOR, parent=panel_tag
         )
         dpg.add_separator(parent=panel_tag)
 
-        dpg.add_text("Source (Output):", color=[255, 255, 255], parent=panel_tag)
+        dpg.add_text("Source (Output):", color=_WHITE, parent=panel_tag)
         with dpg.group(horizontal=True, parent=panel_tag):
-            dpg.add_text("Node:", color=[200, 200, 200])
-            dpg.add_text(f"{src_name}", color=[150, 255, 150])
+            dpg.add_text("Node:", color=_LABEL_COLOR)
+            dpg.add_text(f"{src_name}", color=_NAME_COLOR)
         with dpg.group(horizontal=True, parent=panel_tag):
-            dpg.add_text("Attribute:", color=[200, 200, 200])
-            dpg.add_text(src_attr, color=[150, 255, 150])
+            dpg.add_text("Attribute:", color=_LABEL_COLOR)
+            dpg.add_text(src_attr, color=_NAME_COLOR)
 
         dpg.add_spacer(height=10, parent=panel_tag)
 
-        dpg.add_text("Destination (Input):", color=[255, 255, 255], parent=panel_tag)
+        dpg.add_text("Destination (Input):", color=_WHITE, parent=panel_tag)
         with dpg.group(horizontal=True, parent=panel_tag):
-            dpg.add_text("Node:", color=[200, 200, 200])
-            dpg.add_text(f"{dst_name}", color=[150, 255, 150])
+            dpg.add_text("Node:", color=_LABEL_COLOR)
+            dpg.add_text(f"{dst_name}", color=_NAME_COLOR)
         with dpg.group(horizontal=True, parent=panel_tag):
-            dpg.add_text("Attribute:", color=[200, 200, 200])
-            dpg.add_text(dst_attr, color=[150, 255, 150])
+            dpg.add_text("Attribute:", color=_LABEL_COLOR)
+            dpg.add_text(dst_attr, color=_NAME_COLOR)
 
         dpg.add_separator(parent=panel_tag)
         dpg.add_spacer(height=10, parent=panel_tag)
-        dpg.add_text("Delay/Index:", color=[255, 200, 100], parent=panel_tag)
+        dpg.add_text("Delay/Index:", color=_SUBSECTION_COLOR, parent=panel_tag)
 
         def update_delay_callback(sender, app_data, user_data):
             conn_data = user_data
@@ -452,25 +650,25 @@ class PropertyPanel:
         )
         dpg.add_text(
             "0 = normal connection, -1 = feedback (previous timestep)",
-            color=[150, 150, 150],
+            color=_MUTED_COLOR,
             parent=panel_tag,
         )
         dpg.add_spacer(height=10, parent=panel_tag)
 
         conn_type = "Feedback" if current_delay == -1 else "Normal"
-        dpg.add_text(f"Type: {conn_type}", color=[200, 200, 255], parent=panel_tag)
+        dpg.add_text(f"Type: {conn_type}", color=_CONN_TYPE_COLOR, parent=panel_tag)
         if conn_type == "Feedback":
             dpg.add_text(
                 "This connection uses data from previous timestep",
-                color=[255, 150, 100],
+                color=_ACCENT_COLOR,
                 parent=panel_tag,
             )
 
         dpg.add_spacer(height=10, parent=panel_tag)
         dpg.add_separator(parent=panel_tag)
         with dpg.group(horizontal=True, parent=panel_tag):
-            dpg.add_text("Link ID:", color=[150, 150, 150])
-            dpg.add_text(link_id, color=[200, 200, 200])
+            dpg.add_text("Link ID:", color=_MUTED_COLOR)
+            dpg.add_text(link_id, color=_LABEL_COLOR)
 
     # ------------------------------------------------------------------
     # Widget callbacks (all private)
@@ -480,15 +678,14 @@ class PropertyPanel:
         """Update instance name in graph and refresh DPG node label."""
         node_uuid = user_data
         new_name = app_data
-        if node_uuid in self.graph.nodes:
-            self.graph.nodes[node_uuid]["name"] = new_name
-            dpg_id = self.registry.uuid_to_dpg.get(node_uuid)
-            if dpg_id:
-                dpg.set_item_label(
-                    dpg_id,
-                    f"{new_name} ({self.graph.nodes[node_uuid]['type']})",
-                )
-            print(f"Renamed node {node_uuid} to '{new_name}'")
+        node = self.graph.nodes.get(node_uuid)
+        if node is None:
+            return
+        node["name"] = sys.intern(new_name)
+        dpg_id = self.registry.uuid_to_dpg.get(node_uuid)
+        if dpg_id:
+            dpg.set_item_label(dpg_id, f"{new_name} ({node['type']})")
+        print(f"Renamed node {node_uuid} to '{new_name}'")
 
     def _parse_value(self, value):
         """Helper to convert GUI string input to proper Python types."""
@@ -507,9 +704,27 @@ class PropertyPanel:
     def _update_param(self, sender, app_data, user_data):
         """Generic parameter update callback for simple types."""
         node_uuid, param_name, target_type = user_data
-        node_data = self.graph.nodes[node_uuid]
+        node_data = self.graph.nodes.get(node_uuid)
+        if node_data is None:
+            return
         values_dict = node_data.setdefault("values", {})
 
+        # Typed widgets (checkbox, input_int) already deliver a Python value;
+        # store it without the string round trip through the parser below.
+        if isinstance(app_data, (bool, int, float, list)):
+            if target_type in ("bool", "boolean"):
+                final_val = bool(app_data)
+            elif target_type in ("int", "integer") and not isinstance(app_data, list):
+                final_val = int(app_data)
+            elif target_type in ("float", "double", "number") and not isinstance(app_data, list):
+                final_val = float(app_data)
+            else:
+                final_val = app_data
+            values_dict[param_name] = final_val
+            self._patch_param_label(node_uuid, param_name, final_val)
+            self._refresh_node_theme(node_uuid)
+            return
+
         try:
             # 1. Clean input
             raw_input = app_data.strip() if isinstance(app_data, str) else str(app_data)
@@ -528,13 +743,12 @@ class PropertyPanel:
                 try:
                     # Replace bare 'inf' tokens with '.inf' for YAML compatibility,
                     # then use ast.literal_eval as a safe fallback.
-                    import re as _re
                     # Replace standalone inf/-inf tokens (not part of another word)
-                    yaml_ready = _re.sub(
+                    yaml_ready = re.sub(
                         r'(?<![.\w])-?inf(?![\w])',
                         lambda m: str(np.inf) if not m.group().startswith('-') else str(-np.inf),
                         raw_input,
-                        flags=_re.IGNORECASE,
+                        flags=re.IGNORECASE,
                     )
                     final_val = ast.literal_eval(yaml_ready)
                 except Exception:
@@ -552,6 +766,7 @@ class PropertyPanel:
 
             # Update and refresh
             values_dict[param_name] = final_val
+            self._patch_param_label(node_uuid, param_name, final_val)
             self._refresh_node_theme(node_uuid)
 
         except Exception as e:
@@ -560,17 +775,17 @@ class PropertyPanel:
     def _update_data_object_param(self, sender, app_data, user_data):
         """Update a data-object parameter value."""
         node_uuid, param_name = user_data
-        if node_uuid in self.graph.nodes:
-            node_data = self.graph.nodes[node_uuid]
-            # Ensure suffixes exists and mark this param as a data-object suffix
-            node_data.setdefault("suffixes", set())
-            node_data["suffixes"].add(param_name)
-
-            node_data.setdefault("values", {})
-            node_data["values"][param_name] = app_data
-            node_data["values"][f"{param_name}_object"] = app_data
-            print(f"Updated data object parameter {param_name} = {app_data}")
-            self._refresh_node_theme(node_uuid)
+        node_data = self.graph.nodes.get(node_uuid)
+        if node_data is None:
+            return
+        # Ensure suffixes exists and mark this param as a data-object suffix
+        node_data.setdefault("suffixes", set()).add(param_name)
+
+        values = node_data.setdefault("values", {})
+        values[param_name] = app_data
+        values[f"{param_name}_object"] = app_data
+        print(f"Updated data object parameter {param_name} = {app_data}")
+        self._refresh_node_theme(node_uuid)
 
     def _find_simul_params_node(self) -> str:
         """
@@ -578,11 +793,11 @@ class PropertyPanel:
         
         Returns the root_dir value, or None if no SimulParams node exists.
         """
-        for node_uuid, node_data in self.graph.nodes.items():
-            if node_data.get("type") == "SimulParams":
-                root_dir = node_data.get("values", {}).get("root_dir")
-                if root_dir:
-                    return str(root_dir)
+        nodes = self.graph.nodes
+        for node_uuid in self.graph.nodes_of_type("SimulParams"):
+            root_dir = nodes[node_uuid].get("values", {}).get("root_dir")
+            if root_dir:
+                return str(root_dir)
         return None
 
     def _browse_data_object_file(self, sender, app_data, user_data):
@@ -664,16 +879,14 @@ class PropertyPanel:
         initial_dir = None
         
         # Search for any SimulParams node in the graph
-        for node_uuid_check, node_data_check in self.graph.nodes.items():
-            node_type_check = node_data_check.get("type", "")
-            if node_type_check == "SimulParams":
-                values = node_data_check.get("values", {})
-                root_dir = values.get("root_dir")
-                if root_dir:
-                    initial_dir = os.path.join(str(root_dir), str(param_folder))
-                    print(f"[BROWSE] Found SimulParams with root_dir='{root_dir}', "
-                          f"setting initial_dir for param '{param_folder}' to: {initial_dir}")
-                    break
+        for node_uuid_check in self.graph.nodes_of_type("SimulParams"):
+            values = self.graph.nodes[node_uuid_check].get("values", {})
+            root_dir = values.get("root_dir")
+            if root_dir:
+                initial_dir = os.path.join(str(root_dir), str(param_folder))
+                print(f"[BROWSE] Found SimulParams with root_dir='{root_dir}', "
+                      f"setting initial_dir for param '{param_folder}' to: {initial_dir}")
+                break
         
         if not initial_dir:
             print(f"[BROWSE] No SimulParams with root_dir found, opening file dialog without default_path")
@@ -703,15 +916,13 @@ class PropertyPanel:
     def _disconnect_reference(self, sender, app_data, user_data):
         """Remove the link that provides a reference parameter."""
         node_uuid, param_name, connected_node_name = user_data
+        nodes = self.graph.nodes
         link_to_remove = None
-        for link_id, (src_uuid, src_attr, dst_uuid, dst_attr) in (
-            self.registry.link_registry.items()
-        ):
-            if dst_uuid == node_uuid and dst_attr == param_name:
-                src_node = self.graph.nodes.get(src_uuid, {})
-                if src_node.get("name", "") == connected_node_name:
-                    link_to_remove = link_id
-                    break
+        # Only links *into* this node can provide the reference
+        for conn in self.graph.connections_to(node_uuid):
+            if conn[3] == param_name and nodes.get(conn[0], {}).get("name", "") == connected_node_name:
+                link_to_remove = self.registry.conn_to_link.get(conn)
+                break
         if link_to_remove:
             self._delink_callback(None, link_to_remove)
             self._refresh_node_theme(node_uuid)
@@ -720,16 +931,7 @@ class PropertyPanel:
         self, src_uuid, src_attr, dst_uuid, dst_attr, delay: int
     ):
         """Update the visual style of a connection when its delay changes."""
-        link_id = None
-        for lid, conn_data in self.registry.link_registry.items():
-            if (
-                conn_data[0] == src_uuid
-                and conn_data[1] == src_attr
-                and conn_data[2] == dst_uuid
-                and conn_data[3] == dst_attr
-            ):
-                link_id = lid
-                break
+        link_id = self.registry.conn_to_link.get((src_uuid, src_attr, dst_uuid, dst_attr))
 
         if not link_id or not dpg.does_item_exist(link_id):
             return
@@ -738,18 +940,14 @@ class PropertyPanel:
             apply_link_style(link_id, color=[255, 0, 0, 255])
             self._update_feedback_attribute(src_uuid, src_attr, delay)
         elif delay == 0:
-            if dst_attr.endswith("_ref") or "params" in dst_attr.lower():
+            if self.registry.link_kinds.get(link_id) == "ref":
                 apply_link_style(link_id, color=[200, 200, 200, 60])
             else:
                 dpg.configure_item(link_id, color=[255, 255, 255, 255])
 
     def _update_feedback_attribute(self, node_uuid, attr_name, delay: int):
         """Update the text on a feedback output pin."""
-        attr_id = None
-        for aid, (uid, name) in self.registry.output_attr_registry.items():
-            if uid == node_uuid and name == attr_name:
-                attr_id = aid
-                break
+        attr_id = self.registry.output_pin(node_uuid, attr_name)
         if not attr_id or not dpg.does_item_exist(attr_id):
             return
         children = dpg.get_item_children(attr_id, slot=1)
@@ -758,12 +956,16 @@ class PropertyPanel:
                 current_text = dpg.get_value(child)
                 if delay == -1 and ":-1" not in current_text:
                     dpg.set_value(child, f"{attr_name}:-1")
-                    dpg.configure_item(child, color=[255, 100, 100])
+                    dpg.configure_item(child, color=_MISSING_COLOR)
                 elif delay == 0 and ":-1" in current_text:
                     dpg.set_value(child, attr_name.replace(":-1", ""))
-                    dpg.configure_item(child, color=[255, 255, 255])
+                    dpg.configure_item(child, color=_WHITE)
                 break
 
+    def _close_monitor_callback(self, sender, app_data, user_data):
+        """Callback: close the monitor whose id is *user_data*."""
+        self.monitors.close_monitor(user_data, from_window_close=False)
+
     def _update_connection_filename(self, sender, app_data, user_data):
         """Callback: save a new filename for a DataStore connection."""
         node_uuid, src_uuid, src_attr = user_data
@@ -788,46 +990,65 @@ class PropertyPanel:
             pass
         return str(val)
 
+    @staticmethod
+    def _value_label_color(val, default_val, is_required):
+        """Label colour of a plain value row: missing, default or modified."""
+        if is_required and (val is None or val in ("", "REQUIRED")):
+            return _MISSING_COLOR
+        try:
+            if default_val is not None and val == default_val:
+                return _DEFAULT_PARAM_COLOR
+        except Exception:
+            pass
+        return _MODIFIED_PARAM_COLOR
+
+    def _patch_param_label(self, node_uuid, param_name, val):
+        """Recolour the label of an edited value row in its cached form."""
+        entry = self._param_labels.get(node_uuid, {}).get(param_name)
+        if entry is None:
+            return
+        label_id, default_val, is_required = entry
+        if dpg.does_item_exist(label_id):
+            dpg.configure_item(
+                label_id, color=self._value_label_color(val, default_val, is_required)
+            )
+
     def _render_single_widget(
-        self, parent, node_uuid, param_name, val, type_hint, default_val=None
+        self, parent, node_uuid, param_name, val, type_hint, default_val,
+        param_kind, is_data_type, label,
     ):
-        """Render one parameter row in the property panel."""
-
-        def _values_equal(a, b):
-            try:
-                return a == b
-            except Exception:
-                return False
+        """Render one parameter row in the property panel.
 
+        *type_hint*, *default_val*, *param_kind*, *is_data_type* and *label*
+        come precomputed from the node type's _param_plan entry.
+        """
         node_data = self.graph.nodes.get(node_uuid, {})
-        template = self.all_templates.get(node_data.get("type", ""), {})
-        param_meta = template.get("parameters", {}).get(param_name, {})
-        param_kind = param_meta.get("kind", "value") if isinstance(param_meta, dict) else "value"
 
         if param_kind == "reference" and val is not None:
             with dpg.group(horizontal=True, parent=parent):
-                dpg.add_text(f"{param_name}:", color=[150, 255, 150])
-                dpg.add_text(f": {val}", color=[100, 255, 100])
+                dpg.add_text(label, color=_NAME_COLOR)
+                dpg.add_text(f": {val}", color=_REF_COLOR)
             return
 
         is_data_object = (
             param_kind == "object"
             or param_name in node_data.get("suffixes", set())
-            or self.is_data_class_type(type_hint)
+            or is_data_type
         )
         is_required = default_val == "REQUIRED"
         has_value = val is not None and val not in ("", "REQUIRED")
 
+        is_value_row = False
         if is_required and not has_value:
-            label_color = [255, 100, 100]
+            label_color = _MISSING_COLOR
+            is_value_row = not is_data_object and param_kind != "reference"
         elif is_data_object:
-            label_color = [150, 200, 255]
+            label_color = _DATA_OBJECT_COLOR
         elif param_kind == "reference":
-            label_color = [255, 200, 150]
-        elif default_val is not None and _values_equal(val, default_val):
-            label_color = _DEFAULT_PARAM_COLOR
+            label_color = _REF_PARAM_COLOR
         else:
-            label_color = _MODIFIED_PARAM_COLOR
+            is_value_row = True
+            label_color = self._value_label_color(val, default_val, is_required)
 
         user_data = (node_uuid, param_name, type_hint)
 
@@ -841,9 +1062,14 @@ class PropertyPanel:
         input_tag = f"{node_uuid}_{param_name}_object"
 
         with dpg.group(horizontal=True, parent=parent):
-            dpg.add_text(f"{param_name}:", color=label_color)
+            label_id = dpg.add_text(label, color=label_color)
+            if is_value_row:
+                self._param_labels.setdefault(node_uuid, {})[param_name] = (
+                    label_id, default_val, is_required
+                )
 
-            if type_hint in ("bool", "boolean"):
+            widget = _SCALAR_WIDGETS.get(type_hint)
+            if widget == "bool":
                 bool_val = False
                 if val is not None:
                     bool_val = bool(val)
@@ -852,7 +1078,7 @@ class PropertyPanel:
                     callback=self._update_param,
                     user_data=user_data,
                 )
-            elif type_hint in ("int", "integer"):
+            elif widget == "int":
                 try:
                     int_val = int(val) if val is not None else 0
                 except (ValueError, TypeError):
@@ -864,7 +1090,7 @@ class PropertyPanel:
                     callback=self._update_param,
                     user_data=user_data,
                 )
-            elif type_hint in ("float", "double", "number"):
+            elif widget == "float":
                 # Use an input_text widget so that the user can type either a
                 # number or the special strings "inf" / "-inf".  The value is
                 # displayed as "inf"/"-inf" when the stored value is np.inf.
@@ -925,54 +1151,61 @@ class PropertyPanel:
         """Return True if *type_name* looks like a Specula data-object type."""
         if not type_name or type_name == "Any":
             return False
-        if hasattr(self, "_data_obj_templates") and type_name in self._data_obj_templates:
-            return True
-        data_keywords = [
-            "Matrix", "Vector", "Atmosphere", "Telescope", "Detector", "Field"
-        ]
-        return any(k in type_name for k in data_keywords)
+        if not isinstance(type_name, str):
+            return any(k in type_name for k in _DATA_TYPE_KEYWORDS)
+        result = self._data_type_cache.get(type_name)
+        if result is None:
+            result = (
+                type_name in getattr(self, "_data_obj_templates", ())
+                or _DATA_TYPE_KEYWORDS_RE.search(type_name) is not None
+            )
+            self._data_type_cache[type_name] = result
+        return result
 
     def get_connections_for_node(self, node_uuid: str):
-        """Return (incoming, outgoing) connection lists for *node_uuid*."""
-        incoming = []
-        outgoing = []
-        for src_u, src_at, dst_u, dst_at in self.graph.connections:
-            if dst_u == node_uuid:
-                incoming.append(
-                    {
-                        "src_node": src_u,
-                        "src_attr": src_at,
-                        "dst_attr": dst_at,
-                        "src_name": self.graph.nodes[src_u].get("name", "unknown"),
-                        "dst_name": self.graph.nodes[node_uuid].get("name", "unknown"),
-                        "type": "input",
-                    }
-                )
-            if src_u == node_uuid:
-                outgoing.append(
-                    {
-                        "dst_node": dst_u,
-                        "src_attr": src_at,
-                        "dst_attr": dst_at,
-                        "src_name": self.graph.nodes[node_uuid].get("name", "unknown"),
-                        "dst_name": self.graph.nodes[dst_u].get("name", "unknown"),
-                        "type": "output",
-                    }
-                )
+        """Return (incoming, outgoing) connection lists for *node_uuid*.
+
+        Uses GraphManager's per-node adjacency, so the cost is the node's
+        degree rather than the size of the graph.
+        """
+        nodes = self.graph.nodes
+        own_name = nodes.get(node_uuid, {}).get("name", "unknown")
+        incoming = [
+            {
+                "src_node": src_u,
+                "src_attr": src_at,
+                "dst_attr": dst_at,
+                "src_name": nodes[src_u].get("name", "unknown"),
+                "dst_name": own_name,
+                "type": "input",
+            }
+            for src_u, src_at, _, dst_at in self.graph.connections_to(node_uuid)
+        ]
+        outgoing = [
+            {
+                "dst_node": dst_u,
+                "src_attr": src_at,
+                "dst_attr": dst_at,
+                "src_name": own_name,
+                "dst_name": nodes[dst_u].get("name", "unknown"),
+                "type": "output",
+            }
+            for _, src_at, dst_u, dst_at in self.graph.connections_from(node_uuid)
+        ]
         return incoming, outgoing
 
     def update_connection_filename(
         self, node_uuid: str, src_uuid: str, src_attr: str, new_filename: str
     ):
         """Persist a filename for a DataStore connection."""
-        self.graph.nodes[node_uuid].setdefault("filename_map", {})
-        self.graph.nodes[node_uuid]["filename_map"][
-            f"{src_uuid}.{src_attr}"
-        ] = new_filename
+        node = self.graph.nodes.get(node_uuid)
+        if node is None:
+            return
+        node.setdefault("filename_map", {})[filename_key(src_uuid, src_attr)] = new_filename
 
     def get_connection_filename(
         self, node_uuid: str, src_uuid: str, src_attr: str
     ) -> str:
         """Retrieve the stored filename for a DataStore connection."""
         filename_map = self.graph.nodes.get(node_uuid, {}).get("filename_map", {})
-        return filename_map.get(f"{src_uuid}.{src_attr}", "data")
\ No newline at end of file
+        return filename_map.get(filename_key(src_uuid, src_attr), "data")
\ No newline at end of file
@@ -153,16 +153,13 @@ def _resolve_remote_hostname(hostname: str) -> str:
     str
         The resolved IP address, or the original hostname if resolution fails
     """
-    import subprocess
-    
     # If it's already an IP address (contains dots), return as-is
     if hostname.replace(".", "").replace(":", "").isalnum():
         try:
             # Try to parse as IP to validate
-            import socket as sock_module
-            sock_module.inet_aton(hostname)
+            socket.inet_aton(hostname)
             return hostname  # Valid IP address
-        except (sock_module.error, ValueError):
+        except (socket.error, ValueError):
             pass
     
     # Try to resolve via SSH
@@ -185,8 +182,7 @@ def _resolve_remote_hostname(hostname: str) -> str:
     
     # Fallback: try standard DNS resolution
     try:
-        import socket as sock_module
-        ip = sock_module.gethostbyname(hostname)
+        ip = socket.gethostbyname(hostname)
         print(f"[REMOTE] Resolved '{hostname}' (DNS) → {ip}")
         return ip
     except Exception as e:
@@ -197,6 +193,26 @@ def _resolve_remote_hostname(hostname: str) -> str:
     return hostname
 
 
+_specula_mod = None     # specula module, False if unavailable; see _specula_cp
+
+
+def _specula_cp():
+    """Return ``specula.cp`` (None without cupy), importing specula only once.
+
+    ``_extract_cpu_array`` runs for every probe trigger, so the import
+    statement is kept out of the per-step path.  ``cp`` itself is read on
+    every call because ``specula.init()`` may rebind it.
+    """
+    global _specula_mod
+    if _specula_mod is None:
+        try:
+            import specula
+            _specula_mod = specula
+        except Exception:
+            _specula_mod = False
+    return getattr(_specula_mod, "cp", None) if _specula_mod else None
+
+
 def _extract_cpu_array(out_obj) -> np.ndarray | None:
     """
     Extract a CPU float32 numpy array from a SPECULA output data object.
@@ -214,11 +230,7 @@ def _extract_cpu_array(out_obj) -> np.ndarray | None:
     from the DPG render thread without any GPU-synchronisation concerns.
     """
     # Resolve cupy lazily so the function works even when cupy is absent
-    try:
-        import specula as _sp
-        _cp = _sp.cp
-    except Exception:
-        _cp = None
+    _cp = _specula_cp()
 
     arr = None
 
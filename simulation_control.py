@@ -1,6 +1,7 @@
 import json
 import os
 import re
+import subprocess
 import threading
 import time
 
@@ -99,7 +100,6 @@ class SimulationControl:
         """Display current simulation YAML in a detached window."""
         yaml_content = self._get_current_yaml_content()
 
-        import time
         window_tag = f"yaml_display_window_{int(time.time() * 1000)}"
 
         with dpg.window(
@@ -130,7 +130,6 @@ class SimulationControl:
     def _copy_yaml_to_clipboard(self, content):
         """Copy YAML content to system clipboard."""
         try:
-            import subprocess
             if os.name == 'nt':  # Windows
                 process = subprocess.Popen(['clip'], stdin=subprocess.PIPE)
                 process.communicate(content.encode('utf-8'))
@@ -472,6 +471,9 @@ class SimulationControl:
     def _on_backend_finished(self):
         self.is_running = False
         self.process = None
+        if self._reconnect_timer is not None:
+            self._reconnect_timer.cancel()
+            self._reconnect_timer = None
         self._clear_server_url_file()
         # Clear the backend reference from MonitorManager so probe calls are
         # no-ops after the simulation has stopped.
@@ -497,8 +499,8 @@ class SimulationControl:
         if expected_url is None:
             expected_url = f"http://127.0.0.1:{_DISPLAY_SERVER_PORT}"
         
-        def _attempt(attempt_no, delay_s):
-            time.sleep(delay_s)
+        def _attempt(attempt_no):
+            self._reconnect_timer = None
             sio = self.editor.nm.sio_client
             if sio is None:
                 return
@@ -513,9 +515,19 @@ class SimulationControl:
             
             if not sio.connected and attempt_no == 1:
                 # Schedule a second attempt
-                threading.Thread(target=_attempt, args=(2, 6.0), daemon=True).start()
-
-        threading.Thread(target=_attempt, args=(1, delay), daemon=True).start()
+                _schedule(2, 6.0)
+
+        def _schedule(attempt_no, delay_s):
+            # One pending timer at most: re-scheduling replaces it instead of
+            # stacking sleeping threads.
+            if self._reconnect_timer is not None:
+                self._reconnect_timer.cancel()
+            timer = threading.Timer(delay_s, _attempt, args=(attempt_no,))
+            timer.daemon = True
+            self._reconnect_timer = timer
+            timer.start()
+
+        _schedule(1, delay)
 
     def start_sim(self, sender=None, app_data=None, run_all_mode=False):
         """Start the simulation with the current configuration."""
@@ -18,10 +18,26 @@ that this class has *no* dependency on DearPyGui, the graph model, or monitors.
 import os
 import threading
 import traceback
-
-import socketio as sio_module
-
-from constants import SOCKETIO_SERVER, MONITOR_QUEUE_SIZE
+from itertools import islice
+from types import MappingProxyType
+
+from constants import SOCKETIO_SERVER
+
+# socketio.Client() keyword arguments per platform.  Windows needs explicit
+# reconnection options; engineio's logger is off on both, since it logs every
+# packet and was doubling per-event handling cost.
+_SIO_CLIENT_KWARGS = MappingProxyType({
+    "nt": MappingProxyType({
+        "logger": True,
+        "engineio_logger": False,
+        "reconnection": True,
+        "reconnection_attempts": 5,
+        "reconnection_delay": 1,
+        "reconnection_delay_max": 5,
+        "randomization_factor": 0.5,
+    }),
+    "posix": MappingProxyType({"logger": True, "engineio_logger": False}),
+})
 
 
 class SocketIOClient:
@@ -59,7 +75,19 @@ class SocketIOClient:
         self.server_params: dict = {}        # raw params dict from server
         self.server_nodes: dict = {}         # alias for server_params
         self.uuid_to_server_name: dict = {}  # local uuid -> server node name
-        self.subscribed_outputs: set = set() # outputs we are subscribed to
+        self._server_by_class: dict = {}     # server class -> [server node names]
+        self._output_name_cache: dict = {}   # (uuid, output) -> "<server>.<output>"
+        # (server name, class, outputs) of each node in the last params event,
+        # and the value it had when uuid_to_server_name was last fully rebuilt
+        self._params_signature: tuple | None = None
+        self._mapping_signature: tuple | None = None
+        self._mapped_keys: dict = {}         # uuid -> (name, type) it was mapped from
+        # Outputs we are subscribed to.  Both forms are replaced (never mutated
+        # in place) on subscribe/unsubscribe: the sio thread reads them on
+        # every 'done' event without a lock, and engineio may encode the
+        # 'newdata' list later on its writer thread.
+        self.subscribed_outputs: frozenset = frozenset()
+        self._subscribed_list: list = []
 
         # Owner callbacks (all optional) ---------------------------------------
         self._on_connect_cb = on_connect
@@ -69,18 +97,13 @@ class SocketIOClient:
         self._on_data_update_cb = on_data_update
 
         # Build the socketio.Client --------------------------------------------
-        if os.name == "nt":  # Windows needs explicit transport options
-            self.sio = sio_module.Client(
-                logger=True,
-                engineio_logger=True,
-                reconnection=True,
-                reconnection_attempts=5,
-                reconnection_delay=1,
-                reconnection_delay_max=5,
-                randomization_factor=0.5,
-            )
-        else:
-            self.sio = sio_module.Client(logger=True, engineio_logger=False)
+        # Imported here rather than at module level: python-socketio pulls in
+        # engineio/requests/websocket, which import-only users (tools, tests)
+        # should not pay for.
+        import socketio as sio_module
+
+        kwargs = _SIO_CLIENT_KWARGS["nt" if os.name == "nt" else "posix"]
+        self.sio = sio_module.Client(**kwargs)
 
         self._setup_handlers()
         # Connect in a background thread so the GUI thread is never blocked.
@@ -124,24 +147,35 @@ class SocketIOClient:
 
         @self.sio.event
         def params(data):
-            print(f"\n[SOCKET.IO] PARAMS EVENT FIRED! ({len(data)} nodes)")
             if not data:
                 print("[SOCKET.IO] No data in params event!")
                 return
             self.server_params = data
             self.server_nodes = data
-            print("Server objects:", sorted(self.server_nodes.keys()))
-            for i, (name, info) in enumerate(list(data.items())[:3]):
-                print(
-                    f"  {i+1}. {name} ({info.get('class', 'Unknown')}): "
-                    f"{info.get('outputs', [])}"
-                )
+            signature = tuple(
+                (name, info.get("class", ""), tuple(info.get("outputs", ())))
+                for name, info in data.items()
+            )
+            if signature != self._params_signature:
+                self._params_signature = signature
+                self._server_by_class = self._index_by_class(data)
+                self._output_name_cache.clear()
+            if self.debug:
+                self._log(f"params event: {len(data)} nodes")
+                self._log(f"Server objects: {sorted(data)}")
+                for i, (name, info) in enumerate(islice(data.items(), 3)):
+                    self._log(
+                        f"  {i+1}. {name} ({info.get('class', 'Unknown')}): "
+                        f"{info.get('outputs', [])}"
+                    )
             if self._on_params_cb:
                 self._on_params_cb(data)
 
         @self.sio.event
         def data_update(data):
-            print(f"\n[SOCKET.IO] DATA_UPDATE: {data.get('name', 'unknown')}")
+            # Per-frame traffic is only formatted when debug is on
+            if self.debug:
+                self._log(f"DATA_UPDATE: {data.get('name', 'unknown')}")
             try:
                 name = data.get("name")
                 raw_data = data.get("data")
@@ -170,11 +204,13 @@ class SocketIOClient:
 
         @self.sio.event
         def speed_report(data):
-            print(f"[SOCKET.IO] Speed report: {data}")
+            if self.debug:
+                self._log(f"Speed report: {data}")
 
         @self.sio.event
         def done(data):
-            print(f"[SOCKET.IO] Done event: {data}")
+            if self.debug:
+                self._log(f"Done event: {data}")
             if self.subscribed_outputs:
                 self.request_next_frame()
 
@@ -235,8 +271,9 @@ class SocketIOClient:
             return
         if not self.subscribed_outputs:
             return
-        outputs_list = list(self.subscribed_outputs)
-        print(f"[SOCKET.IO] Emitting 'newdata' for: {outputs_list}")
+        outputs_list = self._subscribed_list
+        if self.debug:
+            self._log(f"Emitting 'newdata' for: {outputs_list}")
         try:
             self.sio.emit("newdata", outputs_list)
         except Exception as e:
@@ -244,13 +281,26 @@ class SocketIOClient:
 
     def subscribe(self, server_output_name: str):
         """Add *server_output_name* to the subscription set and request data."""
-        self.subscribed_outputs.add(server_output_name)
+        if server_output_name not in self.subscribed_outputs:
+            self.subscribed_outputs = self.subscribed_outputs | {server_output_name}
+            self._subscribed_list = [*self._subscribed_list, server_output_name]
         if self.connected:
             self.request_next_frame()
 
     def unsubscribe(self, server_output_name: str):
-        """Remove *server_output_name* from subscriptions and notify server."""
-        self.subscribed_outputs.discard(server_output_name)
+        """Remove *server_output_name* from subscriptions and notify server.
+
+        Only a real change is sent to the server: repeated unsubscribes for
+        the same output (e.g. several panels closing at once) emit nothing.
+        The emit itself is non-blocking — socketio.Client queues the packet
+        for engineio's writer thread.
+        """
+        if server_output_name not in self.subscribed_outputs:
+            return
+        self.subscribed_outputs = self.subscribed_outputs - {server_output_name}
+        self._subscribed_list = [
+            name for name in self._subscribed_list if name != server_output_name
+        ]
         if self.connected:
             try:
                 self.sio.emit("unsubscribe", {"output": server_output_name})
@@ -261,16 +311,25 @@ class SocketIOClient:
     # Node-to-server mapping helpers
     # ------------------------------------------------------------------
 
-    def bind_nodes_to_server(self, graph_nodes: dict, params: dict):
-        """
-        Auto-bind local graph nodes to server node names by class type.
-        Updates ``node_data['name']`` in-place when a unique match is found.
-        """
+    @staticmethod
+    def _index_by_class(params: dict) -> dict:
+        """Return ``{class_name: [server_name, ...]}`` in server order."""
         server_by_class: dict = {}
         for server_name, meta in params.items():
             cls = meta.get("class")
             if cls:
                 server_by_class.setdefault(cls, []).append(server_name)
+        return server_by_class
+
+    def bind_nodes_to_server(self, graph_nodes: dict, params: dict):
+        """
+        Auto-bind local graph nodes to server node names by class type.
+        Updates ``node_data['name']`` in-place when a unique match is found.
+        """
+        if params is self.server_params:
+            server_by_class = self._server_by_class
+        else:
+            server_by_class = self._index_by_class(params)
 
         for node_uuid, node_data in graph_nodes.items():
             if node_uuid in self.uuid_to_server_name:
@@ -292,26 +351,45 @@ class SocketIOClient:
 
     def update_uuid_mapping(self, graph_nodes: dict):
         """
-        Rebuild the full ``uuid_to_server_name`` mapping by matching node
+        Rebuild the ``uuid_to_server_name`` mapping by matching node
         names (and falling back to class-based matching).
+
+        When the server node set is unchanged since the last rebuild (e.g. the
+        same params re-sent after a reconnect) only nodes that are new, or
+        whose name/type changed, are re-matched.
         """
         print("[MAPPING] Updating UUID -> server name mapping")
-        self.uuid_to_server_name.clear()
+        incremental = (
+            self._params_signature is not None
+            and self._params_signature == self._mapping_signature
+        )
+        if incremental:
+            for node_uuid in [u for u in self._mapped_keys if u not in graph_nodes]:
+                del self._mapped_keys[node_uuid]
+                self.uuid_to_server_name.pop(node_uuid, None)
+        else:
+            self.uuid_to_server_name.clear()
+            self._mapped_keys.clear()
+            self._mapping_signature = self._params_signature
+        self._output_name_cache.clear()
         mapped_count = 0
         for node_uuid, node_data in graph_nodes.items():
             client_name = node_data.get("name")
             node_type = node_data.get("type", "")
             if not client_name:
                 continue
+            key = (client_name, node_type)
+            if incremental and self._mapped_keys.get(node_uuid) == key:
+                if node_uuid in self.uuid_to_server_name:
+                    mapped_count += 1
+                continue
+            self._mapped_keys[node_uuid] = key
+            self.uuid_to_server_name.pop(node_uuid, None)
             if client_name in self.server_nodes:
                 self.uuid_to_server_name[node_uuid] = client_name
                 mapped_count += 1
             else:
-                candidates = [
-                    sn
-                    for sn, si in self.server_nodes.items()
-                    if si.get("class") == node_type
-                ]
+                candidates = self._server_by_class.get(node_type, [])
                 if len(candidates) == 1:
                     self.uuid_to_server_name[node_uuid] = candidates[0]
                     mapped_count += 1
@@ -334,6 +412,11 @@ class SocketIOClient:
         if not output_name:
             raise ValueError("output_name must be provided")
 
+        key = (node_uuid, output_name)
+        cached = self._output_name_cache.get(key)
+        if cached is not None:
+            return cached
+
         server_name = self.uuid_to_server_name.get(node_uuid)
 
         if not server_name:
@@ -341,13 +424,15 @@ class SocketIOClient:
             node_name = node_data.get("name", "<unnamed>")
             node_type = node_data.get("type", "<unknown>")
 
+            # First match by name or class in server order.  This runs once
+            # per uuid (the result is stored in uuid_to_server_name), so a
+            # scan is fine here and keeps the server's ordering authoritative.
             candidates = [
-                (sn, si.get("class"))
-                for sn, si in self.server_nodes.items()
+                sn for sn, si in self.server_nodes.items()
                 if sn == node_name or si.get("class") == node_type
             ]
             if candidates:
-                server_name = candidates[0][0]
+                server_name = candidates[0]
                 self.uuid_to_server_name[node_uuid] = server_name
                 if len(candidates) > 1:
                     print(
@@ -362,5 +447,8 @@ class SocketIOClient:
             node_name = node_data.get("name", "unknown")
             server_name = f"auto_{node_name}"
             print(f"[MONITOR] Warning: Using fallback server name: {server_name}")
+            # Not cached: a later params event may provide the real mapping
+            return f"{server_name}.{output_name}"
 
-        return f"{server_name}.{output_name}"
+        result = self._output_name_cache[key] = f"{server_name}.{output_name}"
+        return result
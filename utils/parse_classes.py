@@ -1,16 +1,26 @@
 import ast
 import importlib
 import math
+import os
 import pkgutil
 import re
 import sys
 import yaml
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# libyaml-backed dumper when PyYAML was built with it, pure-Python otherwise
+try:
+    _Dumper = yaml.CDumper
+except AttributeError:
+    _Dumper = yaml.Dumper
+
+
 def represent_tuple(dumper, data):
     return dumper.represent_sequence('tag:yaml.org,2002:seq', data)
 
-yaml.add_representer(tuple, represent_tuple)
+yaml.add_representer(tuple, represent_tuple, Dumper=_Dumper)
 
 
 def _try_eval_inf(node):
@@ -64,9 +74,68 @@ def _try_eval_inf(node):
     return None
 
 
+def _unparse(node):
+    """
+    ``ast.unparse`` with a fast path for the dotted names (``int``,
+    ``BaseDataObj``, ``np.ndarray``) that make up nearly every base class,
+    annotation and ``type=`` keyword; anything else is rendered by ast.
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        parts = [node.attr]
+        value = node.value
+        while isinstance(value, ast.Attribute):
+            parts.append(value.attr)
+            value = value.value
+        if isinstance(value, ast.Name):
+            parts.append(value.id)
+            return ".".join(reversed(parts))
+    return ast.unparse(node)
+
+
+# Nodes that can hold statements: statements themselves plus the except /
+# match-case clauses that sit between a statement and its body
+_STATEMENT_CONTAINERS = (ast.stmt, ast.excepthandler, ast.match_case)
+
+
+def _walk_statements(node):
+    """
+    Yield *node* and every statement nested in it, in ``ast.walk`` order.
+
+    Like ``ast.walk`` but never descends into expressions, which cannot
+    contain statements; for ``__init__`` bodies that skips the bulk of the
+    tree.
+    """
+    todo = deque([node])
+    while todo:
+        node = todo.popleft()
+        todo.extend(
+            child for child in ast.iter_child_nodes(node)
+            if isinstance(child, _STATEMENT_CONTAINERS)
+        )
+        yield node
+
+
+# Generic container annotations whose element type may be a data object
+_LIST_TYPE_RE = re.compile(r'^(list|List)\[([^]]+)\]$')
+_DICT_TYPE_RE = re.compile(r'^(dict|Dict)\[([^]]+),([^]]+)\]$')
+
+# Root base classes (short names) that decide a class's template category
+_ROOT_BASE_CATEGORIES = {
+    "BaseProcessingObj": "processing_objects",
+    "BaseDataObj": "data_objects",
+}
+
+
 class SpeculaMetadataParser(ast.NodeVisitor):
     def __init__(self):
         self.found_classes = {}
+        # class name -> base names with the module prefix stripped, computed
+        # once per class (kept out of class_info so it is not written to YAML)
+        self.base_short_names = {}
+        # parameter type string -> kind, filled by _kind_for_type()
+        self._kind_by_type = {}
         # Variadic inputs that some classes may define
         self.variadic_input_classes = {
             "DataStore",
@@ -91,7 +160,7 @@ class SpeculaMetadataParser(ast.NodeVisitor):
         self.ref_block_list = {'target_device_idx', 'precision'}
 
     def visit_ClassDef(self, node):
-        base_names = [ast.unparse(b) for b in node.bases]
+        base_names = [_unparse(b) for b in node.bases]
 
         # Start with a neutral category; we'll determine it deterministically after inheritance resolution.
         class_info = {
@@ -110,6 +179,7 @@ class SpeculaMetadataParser(ast.NodeVisitor):
 
         # Record class for Pass 2 (Inheritance Resolution)
         self.found_classes[node.name] = class_info
+        self.base_short_names[node.name] = tuple(b.split('.')[-1] for b in base_names)
 
     def _parse_init(self, node, info):
         args = node.args.args[1:]  # Skip 'self'
@@ -120,7 +190,7 @@ class SpeculaMetadataParser(ast.NodeVisitor):
             name = arg.arg
             param_type = "Any"
             if arg.annotation:
-                param_type = ast.unparse(arg.annotation)
+                param_type = _unparse(arg.annotation)
 
             default_val = "REQUIRED"
             if i >= diff:
@@ -151,7 +221,7 @@ class SpeculaMetadataParser(ast.NodeVisitor):
             info["parameters"][name] = { "type": param_type, "default": default_val }
 
         # Handle AST-assigned inputs/outputs found within __init__ body
-        for stmt in ast.walk(node):
+        for stmt in _walk_statements(node):
             if isinstance(stmt, ast.Assign):
                 for target in stmt.targets:
                     if isinstance(target, ast.Subscript) and isinstance(target.value, ast.Attribute):
@@ -161,7 +231,7 @@ class SpeculaMetadataParser(ast.NodeVisitor):
                                 for kw in stmt.value.keywords:
                                     if kw.arg == "type":
                                         info["inputs"][key] = {
-                                            "type": ast.unparse(kw.value),
+                                            "type": _unparse(kw.value),
                                             "kind": "variadic" if (
                                                 key in self.variadic_input_names and
                                                 info.get("class_name") in self.variadic_input_classes
@@ -190,49 +260,73 @@ class SpeculaMetadataParser(ast.NodeVisitor):
         - Else if any ancestor base name is 'BaseDataObj' -> data_objects
         - Else -> other
         """
-        # First: multi-pass enrichment (existing behavior) so child parameters/inputs/outputs
-        # can inherit metadata from base classes found in the AST.
-        for _ in range(3):  # multi-pass to resolve multi-level inheritance
-            for class_name, info in list(self.found_classes.items()):
-                # Variadic default input
-                if class_name in self.variadic_input_classes:
-                    if "input_list" not in info["inputs"]:
-                        info["inputs"]["input_list"] = {"type": "Any", "kind": "variadic"}
-                    info["inputs"]["input_list"]["kind"] = "variadic"
-
-                # Enrich from bases that we discovered in AST
-                for base in info["bases"]:
-                    base_short = base.split('.')[-1]
-                    if base_short in self.found_classes:
-                        base_data = self.found_classes[base_short]
-
-                        # Enrich parameters (only fill missing fields)
-                        for p_name in list(info["parameters"].keys()):
-                            if p_name in base_data.get("parameters", {}):
-                                base_meta = base_data["parameters"][p_name]
-                                child_meta = info["parameters"][p_name]
-                                if child_meta.get("type") in [None, "Any"]:
-                                    child_meta["type"] = base_meta.get("type", "Any")
-                                if child_meta.get("default") in [None, "REQUIRED"]:
-                                    if "default" in base_meta:
-                                        child_meta["default"] = base_meta["default"]
-
-                        # Enrich inputs/outputs from base if missing
-                        for inp, meta in base_data.get("inputs", {}).items():
-                            if inp not in info["inputs"]:
-                                info["inputs"][inp] = meta.copy()
-                        for out in base_data.get("outputs", []):
-                            if out not in info["outputs"]:
-                                info["outputs"].append(out)
+        # First: enrichment so child parameters/inputs/outputs can inherit
+        # metadata from base classes found in the AST.  Fields are only ever
+        # filled in, so passes repeat until nothing changes (one or two for
+        # typical hierarchies); the pass cap only guards against cyclic bases.
+        for _ in range(len(self.found_classes) + 1):
+            if not self._enrich_from_bases_pass():
+                break
 
         # After enrichment, deterministically assign category using only base-class names
         for class_name, info in list(self.found_classes.items()):
             info["category"] = self._determine_category_from_bases(class_name)
 
-        # After category assignment, assign parameter kinds as before
+        # After category assignment, assign parameter kinds as before.  The
+        # kind depends only on the type string once categories are final, and
+        # types repeat across classes, so decisions are shared for the pass.
+        self._kind_by_type = {}
         for class_name, info in list(self.found_classes.items()):
             self._assign_parameter_kinds(info)
 
+    def _enrich_from_bases_pass(self):
+        """Run one inheritance enrichment pass; return True if anything changed."""
+        changed = False
+        found = self.found_classes
+        for class_name, info in found.items():
+            # Variadic default input
+            if class_name in self.variadic_input_classes:
+                input_list = info["inputs"].get("input_list")
+                if input_list is None:
+                    info["inputs"]["input_list"] = {"type": "Any", "kind": "variadic"}
+                    changed = True
+                elif input_list.get("kind") != "variadic":
+                    input_list["kind"] = "variadic"
+                    changed = True
+
+            # Enrich from bases that we discovered in AST
+            for base_short in self.base_short_names.get(class_name, ()):
+                base_data = found.get(base_short)
+                if base_data is None:
+                    continue
+
+                # Enrich parameters (only fill missing fields)
+                base_params = base_data.get("parameters", {})
+                for p_name, child_meta in info["parameters"].items():
+                    base_meta = base_params.get(p_name)
+                    if base_meta is None:
+                        continue
+                    if child_meta.get("type") in (None, "Any"):
+                        new_type = base_meta.get("type", "Any")
+                        if child_meta.get("type") != new_type:
+                            child_meta["type"] = new_type
+                            changed = True
+                    if child_meta.get("default") in (None, "REQUIRED") and "default" in base_meta:
+                        if child_meta.get("default") != base_meta["default"]:
+                            child_meta["default"] = base_meta["default"]
+                            changed = True
+
+                # Enrich inputs/outputs from base if missing
+                for inp, meta in base_data.get("inputs", {}).items():
+                    if inp not in info["inputs"]:
+                        info["inputs"][inp] = meta.copy()
+                        changed = True
+                for out in base_data.get("outputs", []):
+                    if out not in info["outputs"]:
+                        info["outputs"].append(out)
+                        changed = True
+        return changed
+
     def _determine_category_from_bases(self, class_name, visited=None):
         """
         Determine category ('processing_objects'|'data_objects'|'other') by walking base names.
@@ -251,17 +345,16 @@ class SpeculaMetadataParser(ast.NodeVisitor):
         if not info:
             return "other"
 
-        # Examine direct bases first
-        for base in info.get("bases", []):
-            base_short = base.split('.')[-1]  # ignore module prefix
-            if base_short == "BaseProcessingObj":
-                return "processing_objects"
-            if base_short == "BaseDataObj":
-                return "data_objects"
+        base_shorts = self.base_short_names.get(class_name, ())
+
+        # Examine direct bases first (module prefix already stripped)
+        for base_short in base_shorts:
+            category = _ROOT_BASE_CATEGORIES.get(base_short)
+            if category is not None:
+                return category
 
         # If none direct, follow bases that are themselves in found_classes
-        for base in info.get("bases", []):
-            base_short = base.split('.')[-1]
+        for base_short in base_shorts:
             if base_short in self.found_classes:
                 cat = self._determine_category_from_bases(base_short, visited)
                 if cat != "other":
@@ -284,17 +377,22 @@ class SpeculaMetadataParser(ast.NodeVisitor):
                 meta["kind"] = "value"
                 continue
 
-            if self.is_data_object_type(p_type) or self.is_generic_of_data_object(p_type) or p_type == 'dict':                
-                if p_type in self.get_as_data:
-                    meta["kind"] = "object"
-                else:
-                    meta["kind"] = "reference"
-            else:
-                meta["kind"] = "value"
+            meta["kind"] = self._kind_for_type(p_type)
 
             # Debug
             print(f"[KIND_DEBUG] {info.get('class_name', 'unknown')}.{param}: type={p_type}, kind={meta['kind']}")
 
+    def _kind_for_type(self, p_type):
+        """Return the parameter kind for type string *p_type* (memoized per pass)."""
+        kind = self._kind_by_type.get(p_type)
+        if kind is None:
+            if self.is_data_object_type(p_type) or self.is_generic_of_data_object(p_type) or p_type == 'dict':
+                kind = "object" if p_type in self.get_as_data else "reference"
+            else:
+                kind = "value"
+            self._kind_by_type[p_type] = kind
+        return kind
+
     def is_data_object_type(self, type_str):
         """Check if a type string refers to a class we deterministically classified as data object."""
         if not type_str:
@@ -314,15 +412,12 @@ class SpeculaMetadataParser(ast.NodeVisitor):
         if not type_str:
             return False
 
-        list_pattern = r'^(list|List)\[([^]]+)\]$'
-        dict_pattern = r'^(dict|Dict)\[([^]]+),([^]]+)\]$'
-
-        list_match = re.match(list_pattern, type_str)
+        list_match = _LIST_TYPE_RE.match(type_str)
         if list_match:
             inner_type = list_match.group(2).strip()
             return self.is_data_object_type(inner_type)
 
-        dict_match = re.match(dict_pattern, type_str)
+        dict_match = _DICT_TYPE_RE.match(type_str)
         if dict_match:
             value_type = dict_match.group(3).strip()
             return self.is_data_object_type(value_type)
@@ -410,20 +505,70 @@ class SpeculaMetadataParser(ast.NodeVisitor):
 
         print(f"[RUNTIME] Enriched {enriched_count} classes (inputs/outputs).")
 
+# Directories never worth descending into when collecting source files
+_SKIP_DIRS = frozenset({"__pycache__", ".git", ".venv", "venv", ".tox"})
+
+
+def _iter_py_files(root):
+    """
+    Yield the paths (as strings) of all ``*.py`` files under *root*.
+
+    Same order as ``Path.rglob("*.py")`` (a directory's files before its
+    subdirectories, symlinked directories not followed), but built on
+    ``os.scandir`` so no path object is created per entry.
+    """
+    subdirs = []
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in _SKIP_DIRS:
+                    subdirs.append(entry.path)
+            elif entry.name.endswith(".py"):
+                yield entry.path
+    for subdir in subdirs:
+        yield from _iter_py_files(subdir)
+
+
+def _parse_file(py_file):
+    """
+    Pass 1 for a single file, run in a worker process.
+
+    Returns ``(found_classes, base_short_names, error)`` from a fresh parser,
+    so results are plain picklable dicts that the caller merges in file order.
+    """
+    parser = SpeculaMetadataParser()
+    with open(py_file, "r", encoding="utf-8") as f:
+        try:
+            tree = ast.parse(f.read())
+            parser.visit(tree)
+        except Exception as e:
+            return {}, {}, str(e)
+    return parser.found_classes, parser.base_short_names, None
+
+
 def run_parser(input_folders, output_folder):
     parser = SpeculaMetadataParser()
 
-    # Pass 1: Scan files (AST)
+    # Pass 1: Scan files (AST).  ast.parse is CPU-bound and independent per
+    # file, so files are parsed in worker processes when more than one CPU
+    # is available; results are merged in the original file order.
+    py_files = []
     for folder in input_folders:
-        path = Path(folder)
-        if not path.exists(): continue
-        for py_file in path.rglob("*.py"):
-            with open(py_file, "r", encoding="utf-8") as f:
-                try:
-                    tree = ast.parse(f.read())
-                    parser.visit(tree)
-                except Exception as e:
-                    print(f"Skipping {py_file} due to error: {e}")
+        if not os.path.isdir(folder): continue
+        py_files.extend(_iter_py_files(folder))
+
+    if (os.cpu_count() or 1) > 1 and len(py_files) > 1:
+        with ProcessPoolExecutor() as ex:
+            results = list(ex.map(_parse_file, py_files, chunksize=8))
+    else:
+        results = map(_parse_file, py_files)
+
+    for py_file, (classes, base_shorts, error) in zip(py_files, results, strict=True):
+        if error is not None:
+            print(f"Skipping {py_file} due to error: {error}")
+            continue
+        parser.found_classes.update(classes)
+        parser.base_short_names.update(base_shorts)
 
     # Pass 2: Merge data and deterministically classify by inheritance
     parser.resolve_inheritance()
@@ -482,7 +627,7 @@ def run_parser(input_folders, output_folder):
             print(f"  - {param_name}: type={param_info.get('type')}, kind={param_info.get('kind')}, default={param_info.get('default')}")
 
         with open(target_dir / f"{class_name}.yml", "w", encoding="utf-8") as yf:
-            yaml.dump({class_name: data}, yf, sort_keys=False, default_flow_style=False)
+            yaml.dump({class_name: data}, yf, Dumper=_Dumper, sort_keys=False, default_flow_style=False)
         count += 1
         saved_classes.add(class_name)
 
@@ -498,7 +643,7 @@ def run_parser(input_folders, output_folder):
     merged_data = {cn: parser.found_classes[cn] for cn in saved_classes}
     merged_path = base_path / "all_templates_merged.yml"
     with open(merged_path, "w", encoding="utf-8") as yf:
-        yaml.dump(merged_data, yf, sort_keys=True, default_flow_style=False)
+        yaml.dump(merged_data, yf, Dumper=_Dumper, sort_keys=True, default_flow_style=False)
     print(f"Created merged template file: {merged_path}")
 
 